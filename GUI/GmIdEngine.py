@@ -0,0 +1,674 @@
+# Sizing engine of the Gm Id GUI
+# Syn, Cal, Chk and Opt functions working on a loaded MOS table
+# Pure numpy so that they can be used in scripts without PyQt5
+
+import numpy as np
+from scipy.linalg import solve_banded
+# import library for mos lookup
+import LupMos as lp
+# import library for profiling
+import GmIdProfile as gp
+
+# Opt Operation Point : 0-Vstar, 1-Ft, 2-Av
+OPT_VSTAR = 0
+OPT_FT = 1
+OPT_AVO = 2
+# Opt Size : 0-Gm, 1-Id, 2-Area
+SIZE_GM = 0
+SIZE_ID = 1
+SIZE_AREA = 2
+# Opt is solved in this many chunks of L by optOpMosIter
+OPT_STEPS = 10
+# Keys of the operation points of optOpMos
+OPT_OP_KEYS = ['L', 'Vgs', 'Vth', 'Vdsat', 'GmId', 'Vstar', 'Ft', 'Avo']
+# Points taken at once and front points compared at once by skyline
+SKYLINE_BLOCK = 512
+SKYLINE_GROUP = 16
+
+# Variables of the curves of gmIdCurve and biasCurves
+CURVE_VARS = ['ID', 'GMOVERID', 'FUG', 'SELF_GAIN', 'VDSAT']
+# Outputs of the curveSplines against Vstar and GmOverId, the one against Id has GmId in place of Id
+CURVE_NAMES = ['Id', 'Ft', 'Av', 'Vgs', 'Vdsat']
+# Kinds of CurveSpline
+SPLINE_CUBIC = 'cubic'
+SPLINE_PCHIP = 'pchip'
+# curveSplines kept by biasCurves, set curveCache.maxSize = 0 to turn it off
+CURVE_MEMO_SIZE = 32
+# Step of log10(Id) of the Id curve
+CURVE_ID_STEP = 0.05
+
+# Direction of the VGS search for the target of each variable
+SEARCH_FALLING = {'GMOVERID': True, 'SELF_GAIN': True, 'FUG': False}
+
+curveCache = lp.LookupCache(CURVE_MEMO_SIZE)
+
+def loadTable(matFilePath, withGmId=False):
+    '''Open the mat file as MOS table, withGmId also loads its GmIdTable for gmIdVGS'''
+    return lp.loadTable(matFilePath, withGmId=withGmId)
+
+def devWidth(mosDat):
+    '''Total width of the characterized transistor'''
+    return mosDat['W'][0][0]*mosDat['NFING'][0][0]
+
+def cornerTable(mosDats):
+    '''lp.CornerTable of the tables to look them up in one call, None if they are not on the same grid'''
+    if not all(isinstance(mosDat, lp.MosTable) for mosDat in mosDats):
+        return None
+    try:
+        return lp.CornerTable(mosDats)
+    except ValueError:
+        return None
+
+def searchVGS(mosDat, outVar, target, L, VDS, VSB):
+    '''Search VGS for the target of GMOVERID, SELF_GAIN or FUG'''
+    return lp.lookupVGS(mosDat, outVar, target, falling=SEARCH_FALLING.get(outVar), L=L, VDS=VDS, VSB=VSB)
+
+def gmIdVGS(mosDat, GmId, L, VDS, VSB):
+    '''VGS for the GmOverId as searchVGS gives, but a forward lookup if the table has a GmIdTable'''
+    gmIdTab = getattr(mosDat, 'gmIdTab', None)
+    if gmIdTab is None or not gmIdTab.inRange(GmId):
+        return searchVGS(mosDat, 'GMOVERID', GmId, L=L, VDS=VDS, VSB=VSB)
+    VGS = gmIdTab.lookupGmId(['VGS'], L, GmId, VDS, VSB)['VGS']
+    # NaN where the GmOverId is out of the column, the search gives the state there
+    offTab = np.isnan(VGS)
+    if np.ndim(VGS) == 0:
+        if offTab:
+            return searchVGS(mosDat, 'GMOVERID', GmId, L=L, VDS=VDS, VSB=VSB)
+        return float(VGS), 1
+    state = np.ones(np.shape(VGS), dtype=int)
+    if np.any(offTab):
+        VGS = np.array(VGS)
+        offArgs = [np.broadcast_to(arg, VGS.shape)[offTab] for arg in (GmId, L, VDS, VSB)]
+        VGS[offTab], state[offTab] = searchVGS(mosDat, 'GMOVERID', offArgs[0], L=offArgs[1], VDS=offArgs[2], VSB=offArgs[3])
+    return VGS, state
+
+def chkMos(mosDat, W, VGS, L, VDS, VSB):
+    '''Scale the Char of MOS to the width W'''
+    mosScale = W / devWidth(mosDat)
+    chkOp = lp.lookupMany(mosDat, ['CGG', 'FUG', 'GDS', 'SELF_GAIN', 'VT', 'VDSAT'], VDS=VDS, VSB=VSB, L=L, VGS=VGS)
+    return {
+        'Cgg' : mosScale * chkOp['CGG'],
+        'Ft' : chkOp['FUG'],
+        'Rout' : 1.0 / (mosScale * chkOp['GDS']),
+        'Av' : chkOp['SELF_GAIN'],
+        'Vth' : chkOp['VT'],
+        'Vdsat' : chkOp['VDSAT']}
+
+@gp.profiled
+def synMos(mosDat, L, VDS, VSB, GmId, Gm=None, Id=None, multi=1, fin=1):
+    '''Syn MOS for the GmOverId from either Gm or Id'''
+    if Gm is None:
+        Gm = Id * GmId
+    else:
+        Id = Gm / GmId
+    VGS, state = gmIdVGS(mosDat, GmId, L=L, VDS=VDS, VSB=VSB)
+    W = Id * devWidth(mosDat) / lp.lookupMany(mosDat, ['ID'], VDS=VDS, VSB=VSB, L=L, VGS=VGS)['ID']
+    result = {
+        'W' : W,
+        'WFin' : W / (multi * fin),
+        'VGS' : VGS,
+        'State' : state,
+        'GmId' : GmId,
+        'Gm' : Gm,
+        'Id' : Id}
+    result.update(chkMos(mosDat, W, VGS, L, VDS, VSB))
+    return result
+
+def cornerMos(cornerTab, W, VGS, L, VDS, VSB):
+    '''chkMos with Gm, Id and GmOverId of the fixed W and VGS at every corner of the CornerTable
+
+    All the corners are looked up in one call, the corners are the first axis of every result.
+    '''
+    cornerOp = cornerTab.lookupMany(['ID', 'GMOVERID', 'CGG', 'FUG', 'GDS', 'SELF_GAIN', 'VT', 'VDSAT'], L, VGS, VDS, VSB)
+    cornerW = np.array([devWidth(mosTable) for mosTable in cornerTab.mosTables])
+    mosScale = W / cornerW.reshape((-1,) + (1,) * (cornerOp['ID'].ndim - 1))
+    Id = mosScale * cornerOp['ID']
+    return {
+        'Gm' : Id * cornerOp['GMOVERID'],
+        'Id' : Id,
+        'GmId' : cornerOp['GMOVERID'],
+        'Cgg' : mosScale * cornerOp['CGG'],
+        'Ft' : cornerOp['FUG'],
+        'Rout' : 1.0 / (mosScale * cornerOp['GDS']),
+        'Av' : cornerOp['SELF_GAIN'],
+        'Vth' : cornerOp['VT'],
+        'Vdsat' : cornerOp['VDSAT']}
+
+@gp.profiled
+def worstMos(cornerTab, nomIndex, L, VDS, VSB, GmId, Gm=None, Id=None, multi=1, fin=1, resize=False):
+    '''synMos at the nominal corner, then cornerMos of its W and VGS
+
+    'Corner' has the cornerMos result, 'Min' and 'Max' the spread of each metric over the
+    corners. With resize W is scaled at the same VGS so that the Gm target is met at every
+    corner, or the Id target is not exceeded at any, the scale is under 'Resize'.
+    '''
+    synRes = synMos(cornerTab.mosTables[nomIndex], L, VDS, VSB, GmId, Gm=Gm, Id=Id, multi=multi, fin=fin)
+    cornerRes = cornerMos(cornerTab, synRes['W'], synRes['VGS'], L, VDS, VSB)
+    scale = 1.0
+    if resize:
+        # Gm, Id and Cgg scale with W at a fixed VGS
+        if Gm is not None:
+            scale = Gm / np.min(cornerRes['Gm'], axis=0)
+        else:
+            scale = Id / np.max(cornerRes['Id'], axis=0)
+        synRes['W'] = scale * synRes['W']
+        synRes['WFin'] = scale * synRes['WFin']
+        cornerRes = cornerMos(cornerTab, synRes['W'], synRes['VGS'], L, VDS, VSB)
+        synRes.update(dict((key, cornerRes[key][nomIndex]) for key in cornerRes))
+    synRes['Resize'] = scale
+    synRes['Corner'] = cornerRes
+    synRes['Min'] = dict((key, np.min(cornerRes[key], axis=0)) for key in cornerRes)
+    synRes['Max'] = dict((key, np.max(cornerRes[key], axis=0)) for key in cornerRes)
+    return synRes
+
+def calMos(mosDat, W, VGS, L, VDS, VSB):
+    '''Check the GmOverId and Id for the VGS and width'''
+    calOp = lp.lookupMany(mosDat, ['GMOVERID', 'ID'], VDS=VDS, VSB=VSB, L=L, VGS=VGS)
+    Id = calOp['ID'] * W / devWidth(mosDat)
+    result = {
+        'GmId' : calOp['GMOVERID'],
+        'Vstar' : 2.0 / calOp['GMOVERID'],
+        'Id' : Id,
+        'Gm' : Id * calOp['GMOVERID']}
+    result.update(chkMos(mosDat, W, VGS, L, VDS, VSB))
+    return result
+
+@gp.profiled
+def optOpMos(mosDat, optMode, target, listL, VDS, VSB):
+    '''Search the operation point for the Vstar, Ft or Avo target across L
+
+    Only the gate lengths with a solution are returned, L is in the unit of the table.
+    '''
+    listL = np.asarray(listL, dtype=float)
+    if optMode == OPT_VSTAR:
+        optVgs, optState = gmIdVGS(mosDat, 2.0/target, L=listL, VDS=VDS, VSB=VSB)
+    elif optMode == OPT_FT:
+        optVgs, optState = searchVGS(mosDat, 'FUG', target, L=listL, VDS=VDS, VSB=VSB)
+    elif optMode == OPT_AVO:
+        optVgs, optState = searchVGS(mosDat, 'SELF_GAIN', target, L=listL, VDS=VDS, VSB=VSB)
+    else:
+        raise ValueError('Unknown Opt mode %s' % optMode)
+    optFound = (np.asarray(optState) == 1)
+    optL = listL[optFound]
+    optVgs = np.asarray(optVgs)[optFound]
+    optOp = lp.lookupMany(mosDat, ['VT', 'VDSAT', 'GMOVERID', 'FUG', 'SELF_GAIN'], VDS=VDS, VSB=VSB, L=optL, VGS=optVgs)
+    return {
+        'L' : optL,
+        'Vgs' : optVgs,
+        'Vth' : optOp['VT'],
+        'Vdsat' : optOp['VDSAT'],
+        'GmId' : optOp['GMOVERID'],
+        'Vstar' : 2.0/optOp['GMOVERID'],
+        'Ft' : optOp['FUG'],
+        'Avo' : optOp['SELF_GAIN']}
+
+def optOpMosIter(mosDat, optMode, target, listL, VDS, VSB, steps=OPT_STEPS):
+    '''optOpMos over chunks of listL, yields the operation points of each chunk and the number of L done'''
+    listL = np.asarray(listL, dtype=float)
+    chunkSize = max(1, -(-len(listL) // steps))
+    for first in range(0, len(listL), chunkSize):
+        yield optOpMos(mosDat, optMode, target, listL[first:first + chunkSize], VDS, VSB), min(first + chunkSize, len(listL))
+
+def joinOptOp(optChunks):
+    '''The operation points of the chunks of optOpMosIter in one result'''
+    return dict((key, np.concatenate([np.empty(0)] + [optChunk[key] for optChunk in optChunks])) for key in OPT_OP_KEYS)
+
+@gp.profiled
+def optSizeMos(mosDat, optOp, sizeMode, target, VDS, VSB):
+    '''Size the MOS at the operation points of optOpMos for the Gm, Id or Area target'''
+    sizeL = optOp['L']
+    sizeOp = lp.lookupMany(mosDat, ['GM', 'ID', 'CGG', 'CDD'], VDS=VDS, VSB=VSB, L=sizeL, VGS=optOp['Vgs'])
+    mosW = devWidth(mosDat)
+    if sizeMode == SIZE_GM:
+        sizeW = target / sizeOp['GM'] * mosW
+    elif sizeMode == SIZE_ID:
+        sizeW = target / sizeOp['ID'] * mosW
+    elif sizeMode == SIZE_AREA:
+        sizeW = target / sizeL
+    else:
+        raise ValueError('Unknown Size mode %s' % sizeMode)
+    return {
+        'W' : sizeW,
+        'Id' : sizeW * sizeOp['ID'] / mosW,
+        'Cgg' : sizeW * sizeOp['CGG'] / mosW,
+        'Cdd' : sizeW * sizeOp['CDD'] / mosW}
+
+def hermiteCoef(dx, slope, y, pointSlope):
+    '''Coefficients (4, rows, n - 1, outputs) of the cubics through y with the slopes at the points'''
+    cubic = (pointSlope[:, :-1] + pointSlope[:, 1:] - 2.0 * slope) / dx
+    return np.stack((cubic / dx, (slope - pointSlope[:, :-1]) / dx - cubic, pointSlope[:, :-1], y[:, :-1]))
+
+def splineFit(x, y):
+    '''Not-a-knot cubic splines of the rows of y against the rows of x, as CubicSpline fits them
+
+    x is (rows, n) and increasing along each row, y is (rows, n, outputs) with n >= 4.
+    The rows need not share x, they are solved as the blocks of one banded system.
+    Returns the coefficients (4, rows, n - 1, outputs) of the intervals, highest power first.
+    '''
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    rows, n = x.shape
+    dx = np.diff(x, axis=-1)[..., None]
+    slope = np.diff(y, axis=1) / dx
+    # Tridiagonal system of the slopes at the points, the bands between the blocks stay 0
+    band = np.zeros((3, rows, n))
+    rhs = np.empty(y.shape)
+    band[1, :, 1:-1] = 2.0 * (dx[:, :-1, 0] + dx[:, 1:, 0])
+    band[0, :, 2:] = dx[:, :-1, 0]
+    band[2, :, :-2] = dx[:, 1:, 0]
+    rhs[:, 1:-1] = 3.0 * (dx[:, 1:] * slope[:, :-1] + dx[:, :-1] * slope[:, 1:])
+    # Not-a-knot at both ends
+    firstSpan = (x[:, 2] - x[:, 0])[:, None]
+    band[1, :, 0] = dx[:, 1, 0]
+    band[0, :, 1] = firstSpan[:, 0]
+    rhs[:, 0] = ((dx[:, 0] + 2.0 * firstSpan) * dx[:, 1] * slope[:, 0] + dx[:, 0]**2 * slope[:, 1]) / firstSpan
+    lastSpan = (x[:, -1] - x[:, -3])[:, None]
+    band[1, :, -1] = dx[:, -2, 0]
+    band[2, :, -2] = lastSpan[:, 0]
+    rhs[:, -1] = (dx[:, -1]**2 * slope[:, -2] + (2.0 * lastSpan + dx[:, -1]) * dx[:, -2] * slope[:, -1]) / lastSpan
+    pointSlope = solve_banded((1, 1), band.reshape(3, -1), rhs.reshape(rows * n, -1),
+                              overwrite_ab=True, overwrite_b=True, check_finite=False).reshape(y.shape)
+    return hermiteCoef(dx, slope, y, pointSlope)
+
+def pchipEdge(h0, h1, m0, m1):
+    '''End slope of pchipFit, the three point estimate kept monotone'''
+    edge = ((2.0 * h0 + h1) * m0 - h0 * m1) / (h0 + h1)
+    edge = np.where(np.sign(edge) != np.sign(m0), 0.0, edge)
+    return np.where((np.sign(m0) != np.sign(m1)) & (np.abs(edge) > 3.0 * np.abs(m0)), 3.0 * m0, edge)
+
+def pchipFit(x, y):
+    '''Monotone cubics of the rows of y against the rows of x, as PchipInterpolator fits them
+
+    Same shapes as splineFit with n >= 3, no system is solved.
+    '''
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    dx = np.diff(x, axis=-1)[..., None]
+    slope = np.diff(y, axis=1) / dx
+    pointSlope = np.empty(y.shape)
+    # Weighted harmonic mean of the slopes around the point, 0 at a local extremum
+    flat = (np.sign(slope[:, 1:]) != np.sign(slope[:, :-1])) | (slope[:, 1:] == 0) | (slope[:, :-1] == 0)
+    w1 = 2.0 * dx[:, 1:] + dx[:, :-1]
+    w2 = dx[:, 1:] + 2.0 * dx[:, :-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        harmonic = (w1 / slope[:, :-1] + w2 / slope[:, 1:]) / (w1 + w2)
+        pointSlope[:, 1:-1] = np.where(flat, 0.0, 1.0 / harmonic)
+    pointSlope[:, 0] = pchipEdge(dx[:, 0], dx[:, 1], slope[:, 0], slope[:, 1])
+    pointSlope[:, -1] = pchipEdge(dx[:, -1], dx[:, -2], slope[:, -1], slope[:, -2])
+    return hermiteCoef(dx, slope, y, pointSlope)
+
+def splineEval(x, coef, xNew):
+    '''Values (rows, points, outputs) of the cubics of splineFit or pchipFit at xNew, (points,) or (rows, points)
+
+    Outside x the end intervals are extended like CubicSpline does.
+    '''
+    xNew = np.broadcast_to(np.asarray(xNew, dtype=float), x.shape[:1] + np.shape(xNew)[-1:])
+    interval = np.empty(xNew.shape, dtype=int)
+    for row in range(x.shape[0]):
+        interval[row] = np.searchsorted(x[row], xNew[row], 'right') - 1
+    interval = np.clip(interval, 0, x.shape[1] - 2)
+    # Intervals of all the rows through one flat index
+    flatInd = interval + (x.shape[1] - 1) * np.arange(x.shape[0])[:, None]
+    t = (xNew - np.take(x[:, :-1], flatInd))[..., None]
+    rowCoef = np.take(coef.reshape((4, -1) + coef.shape[3:]), flatInd, axis=1)
+    return ((rowCoef[0] * t + rowCoef[1]) * t + rowCoef[2]) * t + rowCoef[3]
+
+class CurveSpline(object):
+    '''Piecewise cubics of several named outputs against the same x, the coefficients of all of them in one array
+
+    x is (n,) or (rows, n), y is a list of arrays of the shape of x in the order of names.
+    kind is SPLINE_CUBIC (CubicSpline) or SPLINE_PCHIP (PchipInterpolator). Calling it
+    evaluates all the outputs at once, as name : values of the shape of xNew with the rows in front.
+    '''
+    def __init__(self, x, y, names, kind=SPLINE_CUBIC):
+        x = np.asarray(x, dtype=float)
+        self.oneRow = (x.ndim == 1)
+        self.x = lp.readOnly(np.atleast_2d(x))
+        self.names = list(names)
+        yStack = np.stack([np.broadcast_to(yOut, x.shape) for yOut in y], axis=-1).reshape(self.x.shape + (len(self.names),))
+        if kind == SPLINE_CUBIC:
+            self.coef = lp.readOnly(splineFit(self.x, yStack))
+        elif kind == SPLINE_PCHIP:
+            self.coef = lp.readOnly(pchipFit(self.x, yStack))
+        else:
+            raise ValueError('Unknown spline kind %s' % kind)
+
+    def __call__(self, xNew):
+        values = splineEval(self.x, self.coef, xNew)
+        if self.oneRow:
+            values = values[0]
+        return dict((name, values[..., i]) for i, name in enumerate(self.names))
+
+    def row(self, row):
+        '''CurveSpline of one row'''
+        rowSpline = CurveSpline.__new__(CurveSpline)
+        rowSpline.oneRow = True
+        rowSpline.x = self.x[row:row + 1]
+        rowSpline.names = self.names
+        rowSpline.coef = self.coef[:, row:row + 1]
+        return rowSpline
+
+def curveSplines(listVGS, listOp, kind=SPLINE_CUBIC, names=CURVE_NAMES):
+    '''CurveSpline of the names of CURVE_NAMES against Vstar and GmOverId, and against log10(Id) with GmId in place of Id
+
+    listOp has the CURVE_VARS along listVGS, as (VGS points,) or (rows, VGS points).
+    '''
+    listGmOverId = listOp['GMOVERID']
+    curveY = {
+        'Id' : listOp['ID'],
+        'GmId' : listGmOverId,
+        'Ft' : listOp['FUG'],
+        'Av' : listOp['SELF_GAIN'],
+        'Vgs' : np.broadcast_to(listVGS, np.shape(listGmOverId)),
+        'Vdsat' : listOp['VDSAT']}
+    idNames = ['GmId' if name == 'Id' else name for name in names]
+    return {
+        'Vstar' : CurveSpline(2*np.reciprocal(listGmOverId), [curveY[name] for name in names], names, kind),
+        'GmId' : CurveSpline(np.flip(listGmOverId, -1), [np.flip(curveY[name], -1) for name in names], names, kind),
+        'Id' : CurveSpline(np.log10(listOp['ID']), [curveY[name] for name in idNames], idNames, kind)}
+
+@gp.profiled
+def biasCurves(mosDat, L, VDS, VSB, listVGS, kind=SPLINE_CUBIC):
+    '''The CURVE_VARS of the table along listVGS at L and the bias, and their curveSplines
+
+    Both are kept in curveCache by (table, L, VDS, VSB), so a corner or bias seen before is not fitted again.
+    '''
+    curveKey = ('bias', mosDat.tableId, lp.memoKey(L), lp.memoKey(VDS), lp.memoKey(VSB), lp.memoKey(listVGS), kind)
+    curveRes = curveCache.get(curveKey)
+    if curveRes is None:
+        # The table is pre-sliced at L, a new bias is only interpolated along VDS and VSB
+        listOp = mosDat.biasSlice(CURVE_VARS, L, listVGS).lookup(VDS, VSB)
+        curveRes = (listOp, curveSplines(listVGS, listOp, kind))
+        curveCache.put(curveKey, curveRes)
+    return curveRes
+
+def curveRows(listVGS, listOp, splines, pltVstar, pltGmId):
+    '''Curves of gmIdCurve of every row of the CURVE_VARS in listOp, (rows, VGS points), and of their curveSplines'''
+    listId = listOp['ID']
+    listGmOverId = listOp['GMOVERID']
+    listFt = listOp['FUG']
+    listAv = listOp['SELF_GAIN']
+    pltV = splines['Vstar'](pltVstar)
+    pltG = splines['GmId'](pltGmId)
+    # The Id curve takes the x range of its row
+    listIdI = splines['Id'].x
+    curves = []
+    for row in range(listId.shape[0]):
+        pltIdI = np.arange( listIdI[row].min(), listIdI[row].max(), CURVE_ID_STEP)
+        pltI = splines['Id'].row(row)(pltIdI)
+        curve = {}
+        curve['VGS'] = {'x' : listVGS, 'Id' : listId[row], 'Ft' : listFt[row], 'Av' : listAv[row], 'Fom' : listFt[row] * listGmOverId[row]}
+        curve['Vstar'] = {
+            'x' : pltVstar,
+            'Id' : pltV['Id'][row],
+            'Ft' : pltV['Ft'][row],
+            'Av' : pltV['Av'][row],
+            'Fom' : 2.0 * pltV['Ft'][row] / pltVstar}
+        curve['GmId'] = {
+            'x' : pltGmId,
+            'Id' : pltG['Id'][row],
+            'Ft' : pltG['Ft'][row],
+            'Av' : pltG['Av'][row],
+            'Fom' : pltGmId * pltG['Ft'][row]}
+        curve['Id'] = {
+            'x' : pltIdI,
+            'GmId' : pltI['GmId'],
+            'Ft' : pltI['Ft'],
+            'Av' : pltI['Av'],
+            'Fom' : pltI['Ft'] * pltI['GmId']}
+        curves.append(curve)
+    return curves
+
+@gp.profiled
+def gmIdCurves(mosDats, listL, VDS, VSB, listVGS, pltVstar, pltGmId, kind=SPLINE_CUBIC):
+    '''gmIdCurve of every table (corner) at every L of listL, as curves[table][L]
+
+    The tables are looked up in one call along the corner axis of a cornerTable, one by one if
+    they are not on the same grid. The curves of all the tables and L are fitted together, each
+    of the Vstar, GmOverId and Id axes as one CurveSpline of Id, Ft and Av over all the rows.
+    The fits are kept in curveCache.
+    '''
+    colL = np.asarray(listL, dtype=float)[:, None]
+    curveKey = ('rows', tuple(mosDat.tableId for mosDat in mosDats), lp.memoKey(colL), lp.memoKey(VDS), lp.memoKey(VSB),
+                lp.memoKey(listVGS), kind)
+    curveRes = curveCache.get(curveKey)
+    if curveRes is None:
+        cornerTab = cornerTable(mosDats)
+        if cornerTab is not None:
+            cornerOp = cornerTab.lookupMany(CURVE_VARS, colL, listVGS, VDS, VSB)
+            tabOp = [dict((outVar, cornerOp[outVar][i]) for outVar in CURVE_VARS) for i in range(len(mosDats))]
+        else:
+            tabOp = [lp.lookupMany(mosDat, CURVE_VARS, VDS=VDS, VSB=VSB, L=colL, VGS=listVGS) for mosDat in mosDats]
+        listOp = dict((outVar, np.concatenate([np.broadcast_to(op[outVar], (colL.size, np.size(listVGS))) for op in tabOp]))
+                      for outVar in CURVE_VARS)
+        curveRes = (listOp, curveSplines(listVGS, listOp, kind, ['Id', 'Ft', 'Av']))
+        curveCache.put(curveKey, curveRes)
+    curves = curveRows(listVGS, curveRes[0], curveRes[1], pltVstar, pltGmId)
+    return [curves[first:first + colL.size] for first in range(0, len(curves), colL.size)]
+
+@gp.profiled
+def gmIdCurve(mosDat, L, VDS, VSB, listVGS, pltVstar, pltGmId):
+    '''Id, Ft, Av and Fom of the L against VGS, Vstar, GmOverId and log10(Id)
+
+    Every axis is a dict with the x points under 'x', the Id axis has GmId in place of Id.
+    '''
+    return gmIdCurves([mosDat], [L], VDS, VSB, listVGS, pltVstar, pltGmId)[0][0]
+
+@gp.profiled
+def gateLCurves(mosDats, listL, VDS, VSB, listGmId):
+    '''VGS, Av and Ft of every table (corner) at every GmOverId of listGmId and L of listL
+
+    Returns one dict per table with 'VGS', 'state', 'Av' and 'Ft' as (GmOverId, L) arrays.
+    GmOverId, Av and Ft of all the tables are looked up along the VGS grid in one call on their
+    cornerTable, and the VGS of all the tables, GmOverId and L are solved at once by the scan of
+    searchVGS. Av and Ft are read at the same crossing, which is where the lookup at the found
+    VGS interpolates them. Av and Ft are NaN where the state is not 1. Tables not on the same
+    grid are solved one at a time.
+    '''
+    cornerTab = cornerTable(mosDats)
+    if cornerTab is None:
+        if len(mosDats) > 1:
+            return [gateLCurves([mosDat], listL, VDS, VSB, listGmId)[0] for mosDat in mosDats]
+        cornerTab = lp.CornerTable([lp.MosTable(mosDats[0])])
+    colGmId = np.asarray(listGmId, dtype=float)[:, None]
+    listL = np.asarray(listL, dtype=float)
+    vgsGrid = cornerTab.vgsf
+    # (table, 1, L, VGS) scanned from the end where GmOverId is smallest
+    scanOp = cornerTab.lookupMany(['GMOVERID', 'SELF_GAIN', 'FUG'], listL[:, None], vgsGrid, VDS, VSB)
+    falling = SEARCH_FALLING['GMOVERID']
+    scanSeq = dict((outVar, (scanDat[..., ::-1] if falling else scanDat)[:, None]) for outVar, scanDat in scanOp.items())
+    gateVgs, gateState, upper, frac = lp.crossVGS(scanSeq['GMOVERID'], vgsGrid[::-1] if falling else vgsGrid, colGmId)
+    found = (gateState == 1)
+    gateAv = np.where(found, lp.crossAt(scanSeq['SELF_GAIN'], upper, frac), np.nan)
+    gateFt = np.where(found, lp.crossAt(scanSeq['FUG'], upper, frac), np.nan)
+    return [{'VGS' : gateVgs[i], 'state' : gateState[i], 'Av' : gateAv[i], 'Ft' : gateFt[i]} for i in range(len(mosDats))]
+
+def paretoFront(cost0, cost1):
+    '''Indices of the points not dominated in (cost0, cost1), sorted by cost0'''
+    order = np.lexsort((cost1, cost0))
+    sortCost1 = cost1[order]
+    # A point is on the front if it beats the best cost1 of all the cheaper points
+    bestBefore = np.concatenate(([np.inf], np.minimum.accumulate(sortCost1)[:-1]))
+    return order[sortCost1 < bestBefore]
+
+@gp.profiled
+def skyline(costs, block=SKYLINE_BLOCK, group=SKYLINE_GROUP):
+    '''Indices of the rows of costs (points x objectives) not dominated by another row, all objectives minimized
+
+    Sort-filter skyline: sorted by the sum of the objectives no point can be dominated by a later one.
+    The points are taken in blocks, the survivors of a block join the front and drop the later points
+    they cover, a group of front points at a time so that the first ones thin out the rest for the next.
+    Of equal points the first is kept, the indices are in the sorted order.
+    '''
+    costs = np.asarray(costs, dtype=float)
+    if costs.shape[1] == 2:
+        return paretoFront(costs[:, 0], costs[:, 1])
+    order = np.lexsort(tuple(costs.T[::-1]) + (costs.sum(axis=1),))
+    # One row per objective for the comparisons against the rest
+    restCost = np.ascontiguousarray(costs[order].T)
+    frontIdx = []
+    while order.size != 0:
+        # A point covered by a dropped one of the block is also covered by what dropped that one
+        blockCost = restCost[:, :block].T
+        covered = np.triu(np.all(blockCost[:, None, :] <= blockCost[None, :, :], axis=-1), 1).any(axis=0)
+        frontIdx.append(order[:block][~covered])
+        frontCost = blockCost[~covered]
+        order = order[block:]
+        restCost = restCost[:, block:]
+        for first in range(0, frontCost.shape[0], group):
+            groupCost = frontCost[first:first + group]
+            covered = groupCost[:, 0, None] <= restCost[0]
+            for obj in range(1, restCost.shape[0]):
+                covered &= groupCost[:, obj, None] <= restCost[obj]
+            keep = ~covered.any(axis=0)
+            order = order[keep]
+            restCost = restCost[:, keep]
+    return np.concatenate(frontIdx) if frontIdx else order
+
+@gp.profiled
+def optDesign(mosDat, sizeMode, target, VSB, minGm=None, minFt=None, minAv=None, maxVDS=None, satMargin=0.0, listL=None):
+    '''Search the (L, GmOverId, VDS) grid for the sizes meeting all the constraints
+
+    Every point of the GmIdTable grid at VSB is a candidate, sized to the Gm, Id or Area target
+    like optSizeMos. The saturation headroom VDS - Vdsat has to be at least satMargin.
+    Returns the Pareto set of Id (power) and W*L (area) sorted by the first, the one fixed by
+    an Id or Area target is traded against Gm instead. 'Feasible' and 'Candidates' count the
+    points before the front.
+    '''
+    if sizeMode not in [SIZE_GM, SIZE_ID, SIZE_AREA]:
+        raise ValueError('Unknown Design size mode %s' % sizeMode)
+    gmIdTab = getattr(mosDat, 'gmIdTab', None)
+    if gmIdTab is None:
+        gmIdTab = lp.buildGmIdTable(mosDat)
+    # Planes outside the VDS headroom or the L range are never read
+    vdsIdx = np.nonzero((gmIdTab.vdsf > 0) & (gmIdTab.vdsf <= (np.inf if maxVDS is None else maxVDS + 1e-12)))[0]
+    lIdx = np.arange(gmIdTab.lf.size)
+    if listL is not None and np.size(listL) != 0:
+        lIdx = np.nonzero((gmIdTab.lf >= np.min(listL) - 1e-12) & (gmIdTab.lf <= np.max(listL) + 1e-12))[0]
+    vsbInd, vsbFrac = gmIdTab.cellIndex(0, VSB)
+    def atVSB(varName):
+        varDat = gmIdTab[varName]
+        lower = varDat[vsbInd][vdsIdx][..., lIdx]
+        if gmIdTab.vsbf.size == 1:
+            return lower
+        upper = varDat[vsbInd + 1][vdsIdx][..., lIdx]
+        return lower + vsbFrac * (upper - lower)
+    # (VDS, L) columns along GmOverId, pruned on their best Ft, Av and Vdsat
+    ftDat = np.moveaxis(atVSB('FUG'), 1, -1)
+    avDat = np.moveaxis(atVSB('SELF_GAIN'), 1, -1)
+    vdsatDat = np.moveaxis(atVSB('VDSAT'), 1, -1)
+    vdsCol = gmIdTab.vdsf[vdsIdx][:, None, None]
+    colOk = np.fmin.reduce(vdsatDat, axis=-1) <= vdsCol[..., 0] - satMargin
+    if minFt is not None:
+        colOk &= np.fmax.reduce(ftDat, axis=-1) >= minFt
+    if minAv is not None:
+        colOk &= np.fmax.reduce(avDat, axis=-1) >= minAv
+    vdsSel, lSel = np.nonzero(colOk)
+    def columns(varDat):
+        return varDat[vdsSel, lSel]
+    gmIdGrid = gmIdTab.vgsf[None, :]
+    colDat = dict((varName, columns(np.moveaxis(atVSB(varName), 1, -1))) for varName in ['VGS', 'GM', 'ID', 'VT', 'CGG', 'CDD'])
+    colDat['FUG'] = columns(ftDat)
+    colDat['SELF_GAIN'] = columns(avDat)
+    colDat['VDSAT'] = columns(vdsatDat)
+    colVDS = gmIdTab.vdsf[vdsIdx][vdsSel][:, None] + 0.0 * gmIdGrid
+    colL = gmIdTab.lf[lIdx][lSel][:, None] + 0.0 * gmIdGrid
+    colGmId = gmIdGrid + 0.0 * colVDS
+    # Size every candidate, the target itself is kept exact
+    mosW = devWidth(mosDat)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if sizeMode == SIZE_GM:
+            sizeW = target / colDat['GM'] * mosW
+        elif sizeMode == SIZE_ID:
+            sizeW = target / colDat['ID'] * mosW
+        else:
+            sizeW = target / colL
+        sizeId = np.where(sizeMode == SIZE_ID, target, sizeW * colDat['ID'] / mosW)
+        sizeGm = np.where(sizeMode == SIZE_GM, target, sizeW * colDat['GM'] / mosW)
+        sizeArea = np.where(sizeMode == SIZE_AREA, target, sizeW * colL)
+        feasible = np.isfinite(sizeW) & (sizeW > 0) & (colDat['VDSAT'] <= colVDS - satMargin)
+        if minGm is not None:
+            feasible &= sizeGm >= minGm
+        if minFt is not None:
+            feasible &= colDat['FUG'] >= minFt
+        if minAv is not None:
+            feasible &= colDat['SELF_GAIN'] >= minAv
+    if sizeMode == SIZE_ID:
+        front = paretoFront(sizeArea[feasible], -sizeGm[feasible])
+    elif sizeMode == SIZE_AREA:
+        front = paretoFront(sizeId[feasible], -sizeGm[feasible])
+    else:
+        front = paretoFront(sizeId[feasible], sizeArea[feasible])
+    def onFront(varDat):
+        return varDat[feasible][front]
+    return {
+        'L' : onFront(colL),
+        'VDS' : onFront(colVDS),
+        'Vgs' : onFront(colDat['VGS']),
+        'Vth' : onFront(colDat['VT']),
+        'Vdsat' : onFront(colDat['VDSAT']),
+        'GmId' : onFront(colGmId),
+        'Vstar' : 2.0/onFront(colGmId),
+        'Ft' : onFront(colDat['FUG']),
+        'Avo' : onFront(colDat['SELF_GAIN']),
+        'W' : onFront(sizeW),
+        'Id' : onFront(sizeId),
+        'Gm' : onFront(sizeGm),
+        'Area' : onFront(sizeArea),
+        'Cgg' : onFront(sizeW * colDat['CGG'] / mosW),
+        'Cdd' : onFront(sizeW * colDat['CDD'] / mosW),
+        'Feasible' : int(np.count_nonzero(feasible)),
+        'Candidates' : int(vdsIdx.size * lIdx.size * gmIdTab.vgsf.size)}
+
+@gp.profiled
+def tradeFront(mosDat, sizeMode, target, VDS, VSB, listL=None, listGmId=None):
+    '''Non-dominated operating points over L and GmOverId at the bias
+
+    Every (L, GmOverId) pair of listL and listGmId, by default the grids of the GmIdTable, is sized
+    to the Gm or Id target like optSizeMos. Id, W*L and Cgg are minimized and Ft is maximized.
+    Returns the front sorted by Id with the keys of optDesign.
+    '''
+    if sizeMode not in [SIZE_GM, SIZE_ID]:
+        raise ValueError('Unknown Front size mode %s' % sizeMode)
+    gmIdTab = getattr(mosDat, 'gmIdTab', None)
+    if gmIdTab is None:
+        gmIdTab = lp.buildGmIdTable(mosDat)
+    if listL is None or np.size(listL) == 0:
+        listL = gmIdTab.lf
+    if listGmId is None:
+        listGmId = gmIdTab.vgsf
+    candL, candGmId = [grid.ravel() for grid in np.meshgrid(np.asarray(listL, dtype=float), np.asarray(listGmId, dtype=float), indexing='ij')]
+    candOp = gmIdTab.lookupGmId(['VGS', 'GM', 'ID', 'VT', 'VDSAT', 'FUG', 'SELF_GAIN', 'CGG', 'CDD'], candL, candGmId, VDS, VSB)
+    mosW = devWidth(mosDat)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if sizeMode == SIZE_GM:
+            sizeW = target / candOp['GM'] * mosW
+        else:
+            sizeW = target / candOp['ID'] * mosW
+        sizeId = sizeW * candOp['ID'] / mosW
+        sizeArea = sizeW * candL
+        sizeCgg = sizeW * candOp['CGG'] / mosW
+        costs = np.stack((sizeId, sizeArea, sizeCgg, -candOp['FUG']), axis=-1)
+        # NaN outside the GmOverId range of a column
+        feasible = np.all(np.isfinite(costs), axis=-1) & (sizeW > 0)
+    candIdx = np.nonzero(feasible)[0]
+    front = candIdx[skyline(costs[candIdx])]
+    front = front[np.argsort(sizeId[front], kind='stable')]
+    return {
+        'L' : candL[front],
+        'VDS' : np.full(front.size, float(VDS)),
+        'Vgs' : candOp['VGS'][front],
+        'Vth' : candOp['VT'][front],
+        'Vdsat' : candOp['VDSAT'][front],
+        'GmId' : candGmId[front],
+        'Vstar' : 2.0/candGmId[front],
+        'Ft' : candOp['FUG'][front],
+        'Avo' : candOp['SELF_GAIN'][front],
+        'W' : sizeW[front],
+        'Id' : sizeId[front],
+        'Gm' : sizeW[front] * candOp['GM'][front] / mosW,
+        'Area' : sizeArea[front],
+        'Cgg' : sizeCgg[front],
+        'Cdd' : sizeW[front] * candOp['CDD'][front] / mosW,
+        'Feasible' : int(candIdx.size),
+        'Candidates' : int(candL.size)}
@@ -0,0 +1,136 @@
+# Profiling hooks of the lookups and the GUI handlers
+# Functions marked with profiled and the blocks under section add their calls and time to the
+# profiler while it is on, while it is off the marked functions only check a flag
+
+import functools
+import os
+import threading
+import time
+
+# Set to 1 to start with the profiler on
+PROFILE_ENV = 'GMID_PROFILE'
+
+class Profiler(object):
+    '''Calls, total time, self time and the longest call of every profiled name
+
+    The self time leaves out the profiled functions and sections called inside,
+    so it shows where the time is actually spent.
+    '''
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        # Time of the profiled children of the open calls, one list per thread
+        self.local = threading.local()
+        # name : [calls, total, self, max] in s
+        self.records = {}
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def enter(self):
+        '''Open a call, returns its start time'''
+        if not hasattr(self.local, 'childTime'):
+            self.local.childTime = []
+        self.local.childTime.append(0.0)
+        return time.perf_counter()
+
+    def exit(self, name, start):
+        '''Close the call opened at start'''
+        elapsed = time.perf_counter() - start
+        childTime = self.local.childTime.pop()
+        if self.local.childTime:
+            self.local.childTime[-1] += elapsed
+        with self.lock:
+            record = self.records.setdefault(name, [0, 0.0, 0.0, 0.0])
+            record[0] += 1
+            record[1] += elapsed
+            record[2] += elapsed - childTime
+            record[3] = max(record[3], elapsed)
+
+    def clear(self):
+        with self.lock:
+            self.records = {}
+
+    def stats(self):
+        '''name : calls, total, self, mean and max time in ms'''
+        with self.lock:
+            records = dict((name, list(record)) for name, record in self.records.items())
+        return dict((name, {
+            'calls' : calls,
+            'total_ms' : 1000 * total,
+            'self_ms' : 1000 * selfTime,
+            'mean_ms' : 1000 * total / calls,
+            'max_ms' : 1000 * maxTime}) for name, (calls, total, selfTime, maxTime) in records.items())
+
+    def report(self):
+        '''Table of the stats sorted by total time'''
+        stats = self.stats()
+        lines = ['%8s %10s %10s %9s %9s  %s' % ('calls', 'total ms', 'self ms', 'mean ms', 'max ms', 'name')]
+        for name in sorted(stats, key=lambda name: -stats[name]['total_ms']):
+            stat = stats[name]
+            lines.append('%8d %10.1f %10.1f %9.3f %9.3f  %s' % (
+                stat['calls'], stat['total_ms'], stat['self_ms'], stat['mean_ms'], stat['max_ms'], name))
+        return '\n'.join(lines)
+
+profiler = Profiler(os.environ.get(PROFILE_ENV, '0') not in ('', '0'))
+
+def profileName(fn):
+    '''Name of the function in the stats'''
+    if fn.__module__ == '__main__':
+        return fn.__qualname__
+    return '%s.%s' % (fn.__module__, fn.__qualname__)
+
+def profiled(fn):
+    '''Decorator adding the calls of fn to the profiler'''
+    name = profileName(fn)
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not profiler.enabled:
+            return fn(*args, **kwargs)
+        start = profiler.enter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profiler.exit(name, start)
+    return wrapper
+
+def profiledSlot(fn):
+    '''profiled for the slots of Qt signals
+
+    PyQt only drops the signal arguments a slot does not take when the slot itself
+    refuses them, so the wrapper drops them as well.
+    '''
+    nArgs = fn.__code__.co_argcount
+    wrapper = profiled(fn)
+    @functools.wraps(fn)
+    def slot(*args):
+        return wrapper(*args[:nArgs])
+    return slot
+
+class Section(object):
+    '''Block timed under a name, see section'''
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = profiler.enter()
+        return self
+
+    def __exit__(self, *excInfo):
+        profiler.exit(self.name, self.start)
+        return False
+
+class NullSection(object):
+    '''Block left untimed while the profiler is off'''
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excInfo):
+        return False
+
+# Shared by every section while the profiler is off
+NULL_SECTION = NullSection()
+
+def section(name):
+    '''Context manager adding the time of the block to the profiler under name'''
+    return Section(name) if profiler.enabled else NULL_SECTION
@@ -0,0 +1,197 @@
+# Background jobs of the Gm Id GUI
+# The jobs run on the QThreadPool of the window and hand their result back through signals,
+# so all the plot items are still created and changed on the main thread
+
+import sys
+import traceback
+from functools import partial
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+# import library for mos lookup and sizing
+import LupMos as lp
+import GmIdEngine as ge
+
+class JobCancelled(Exception):
+    '''Raised by JobCtl.check once the job is cancelled'''
+    pass
+
+class WorkerSignals(QObject):
+    '''Signals of a Worker, QRunnable itself can not emit signals'''
+    # the return value of the job
+    result = pyqtSignal(object)
+    # results so far, sent while the job is still running
+    partial = pyqtSignal(object)
+    # done and total steps
+    progress = pyqtSignal(int, int)
+    # the error message if the job raised
+    error = pyqtSignal(str)
+    # the job stopped at a check after cancel
+    cancelled = pyqtSignal()
+    # emitted after result, error or cancelled
+    finished = pyqtSignal()
+
+class JobCtl(object):
+    '''Cancel token and progress report handed to the job as first argument'''
+    def __init__(self, signals):
+        self.signals = signals
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def check(self):
+        '''Stop the job here if it has been cancelled'''
+        if self.cancelled:
+            raise JobCancelled()
+
+    def progress(self, done, total):
+        self.signals.progress.emit(done, total)
+
+    def partial(self, partialRes):
+        self.signals.partial.emit(partialRes)
+
+class Worker(QRunnable):
+    '''Run fn(jobCtl, *args, **kwargs) in the thread pool'''
+    def __init__(self, fn, *args, **kwargs):
+        super(Worker, self).__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self.ctl = JobCtl(self.signals)
+        # set on the main thread once finished is handled
+        self.done = False
+
+    def run(self):
+        try:
+            self.ctl.check()
+            jobRes = self.fn(self.ctl, *self.args, **self.kwargs)
+        except JobCancelled:
+            self.signals.cancelled.emit()
+        except Exception:
+            traceback.print_exc()
+            errType, errValue = sys.exc_info()[:2]
+            self.signals.error.emit('%s: %s' % (errType.__name__, errValue))
+        else:
+            self.signals.result.emit(jobRes)
+        finally:
+            self.signals.finished.emit()
+
+class JobRunner(object):
+    '''Start jobs by name, the latest request wins
+
+    Starting a job cancels the running job of the same name, and the signals of a job
+    only reach the slots while it is still the latest one of its name.
+    '''
+    def __init__(self, threadpool):
+        self.threadpool = threadpool
+        self.lastId = 0
+        # jobName : jobId of the latest job
+        self.current = {}
+        # jobId : Worker, kept alive until its last signal is handled
+        self.workers = {}
+
+    def start(self, jobName, fn, *args, onResult=None, onPartial=None, onProgress=None, onError=None, onFinished=None):
+        self.cancel(jobName)
+        for doneId in [jobId for jobId, worker in self.workers.items() if worker.done]:
+            del self.workers[doneId]
+        self.lastId += 1
+        jobId = self.lastId
+        worker = Worker(fn, *args)
+        self.current[jobName] = jobId
+        self.workers[jobId] = worker
+        for signal, slot in [(worker.signals.result, onResult), (worker.signals.partial, onPartial),
+                             (worker.signals.progress, onProgress), (worker.signals.error, onError)]:
+            if slot is not None:
+                signal.connect(self.latest(jobName, jobId, slot))
+        worker.signals.finished.connect(partial(self.finish, jobName, jobId, onFinished))
+        self.threadpool.start(worker)
+        return worker
+
+    def latest(self, jobName, jobId, slot):
+        def latestSlot(*sigArgs):
+            if self.current.get(jobName) == jobId:
+                slot(*sigArgs)
+        return latestSlot
+
+    def finish(self, jobName, jobId, onFinished):
+        self.workers[jobId].done = True
+        if self.current.get(jobName) == jobId:
+            del self.current[jobName]
+            if onFinished is not None:
+                onFinished()
+
+    def cancel(self, jobName):
+        '''Cancel the job, its remaining signals are dropped'''
+        jobId = self.current.pop(jobName, None)
+        if jobId is not None:
+            self.workers[jobId].ctl.cancel()
+
+    def cancelAll(self):
+        for jobName in list(self.current.keys()):
+            self.cancel(jobName)
+
+    def busy(self, jobName):
+        return jobName in self.current
+
+# Jobs
+def loadCorner(jobCtl, cornerIndex, cornerFilePath, mosDat):
+    '''Load the corner and its GmIdTable if they are not resident yet'''
+    if mosDat is None:
+        mosDat = lp.loadTable(cornerFilePath)
+    jobCtl.check()
+    # Syn and Opt look up VGS from GmOverId directly once it is there
+    if mosDat.gmIdTab is None:
+        mosDat.gmIdTab = lp.loadGmIdTable(cornerFilePath, mosDat)
+    return cornerIndex, cornerFilePath, mosDat
+
+def cornerCurveJob(jobCtl, cornerIndexes, mosDats, L, Lref, VDS, VSB, listVGS, pltVstar, pltGmId, listLChk, listGmIdL):
+    '''Curves of all the loaded corners at Des-L and Ref-L fitted together, and their L curves at the GmOverId of listGmIdL
+
+    If they can not be fitted together every corner is fitted on its own, a corner that
+    still fails comes back with None in place of its curves.
+    '''
+    try:
+        cornerCurves = ge.gmIdCurves(mosDats, [L, Lref], VDS, VSB, listVGS, pltVstar, pltGmId)
+        jobCtl.check()
+        gateCurves = ge.gateLCurves(mosDats, listLChk, VDS, VSB, listGmIdL)
+    except JobCancelled:
+        raise
+    except Exception:
+        traceback.print_exc()
+    else:
+        return [(cornerIndex, desCurve, refCurve, gateCurve)
+                for cornerIndex, (desCurve, refCurve), gateCurve in zip(cornerIndexes, cornerCurves, gateCurves)]
+    curveRes = []
+    for cornerIndex, mosDat in zip(cornerIndexes, mosDats):
+        jobCtl.check()
+        try:
+            (desCurve, refCurve), = ge.gmIdCurves([mosDat], [L, Lref], VDS, VSB, listVGS, pltVstar, pltGmId)
+            gateCurve, = ge.gateLCurves([mosDat], listLChk, VDS, VSB, listGmIdL)
+        except Exception:
+            traceback.print_exc()
+            desCurve, refCurve, gateCurve = None, None, None
+        curveRes.append((cornerIndex, desCurve, refCurve, gateCurve))
+    return curveRes
+
+def optOpJob(jobCtl, mosDat, optMode, target, listL, VDS, VSB):
+    '''ge.optOpMos over ge.OPT_STEPS chunks of listL so that a cancel stops it at the next chunk
+
+    The operation points found so far are sent after every chunk.
+    '''
+    optChunks = []
+    for optChunk, doneL in ge.optOpMosIter(mosDat, optMode, target, listL, VDS, VSB):
+        jobCtl.check()
+        optChunks.append(optChunk)
+        if doneL < len(listL):
+            jobCtl.partial(ge.joinOptOp(optChunks))
+        jobCtl.progress(doneL, len(listL))
+    return ge.joinOptOp(optChunks)
+
+def optSizeJob(jobCtl, mosDat, optOp, sizeMode, target, VDS, VSB):
+    return ge.optSizeMos(mosDat, optOp, sizeMode, target, VDS, VSB)
+
+def optDesignJob(jobCtl, mosDat, sizeMode, target, VSB, minGm, minFt, minAv, maxVDS, listL):
+    return ge.optDesign(mosDat, sizeMode, target, VSB, minGm=minGm, minFt=minFt, minAv=minAv, maxVDS=maxVDS, listL=listL)
+
+def tradeFrontJob(jobCtl, mosDat, sizeMode, target, VDS, VSB, listL):
+    return ge.tradeFront(mosDat, sizeMode, target, VDS, VSB, listL=listL)
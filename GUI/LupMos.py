@@ -5,11 +5,654 @@
 # Updated for Gm Id GUI Tool
 # 2019-07-31
 
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import sys
+import threading
+from collections import OrderedDict
 import numpy as np
+import h5py
 from scipy.interpolate import interpn
+# import library for profiling
+import GmIdProfile as gp
 
 mosDat = None
 
+# Folder next to the mat file with one .npy per variable
+CACHE_SUFFIX = '.npycache'
+CACHE_META = 'meta.json'
+# Folder of the table resampled on GmOverId and its grid step in S/A
+GMID_SUFFIX = '.gmid' + CACHE_SUFFIX
+GMID_STEP = 0.1
+
+# Lookup results kept by LookupCache, and the bytes of the results and keys they may take
+MEMO_SIZE = 4096
+MEMO_BYTES = 256 * 2**20
+# Digits the inputs are rounded to for the key, inputs above MEMO_KEY_BYTES are keyed by a digest
+MEMO_DIGITS = 9
+MEMO_KEY_BYTES = 256
+# Lookups of more points than this are not memoized
+MEMO_POINTS = 2**16
+# Largest distance of a grid point from the uniform grid, in steps, for the axis to count as uniform
+UNIFORM_TOL = 1e-9
+# Largest distance from a grid point, in steps, for a query to read the stored sample
+GRID_TOL = 1e-9
+# Interpolations reading up to this many vertex samples gather them at once, larger ones vertex by vertex
+GATHER_POINTS = 2**14
+
+def cacheBytes(obj):
+    '''Bytes held by a cached key or value, arrays and the containers of them'''
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, (tuple, list)):
+        return sum(cacheBytes(item) for item in obj)
+    if isinstance(obj, dict):
+        return sum(cacheBytes(key) + cacheBytes(value) for key, value in obj.items())
+    if hasattr(obj, '__dict__'):
+        return cacheBytes(vars(obj))
+    return sys.getsizeof(obj)
+
+class LookupCache(object):
+    '''LRU cache of lookup results bounded by entries and bytes, with hit and miss counters
+
+    A value larger than maxBytes by itself is not kept.
+    '''
+    def __init__(self, maxSize=MEMO_SIZE, maxBytes=MEMO_BYTES):
+        self.maxSize = maxSize
+        self.maxBytes = maxBytes
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+
+    def get(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        entryBytes = cacheBytes(key) + cacheBytes(value)
+        with self.lock:
+            if key in self.entries:
+                self.nbytes -= self.entries.pop(key)[1]
+            if entryBytes > self.maxBytes:
+                return
+            self.entries[key] = (value, entryBytes)
+            self.nbytes += entryBytes
+            while len(self.entries) > self.maxSize or self.nbytes > self.maxBytes:
+                self.nbytes -= self.entries.popitem(last=False)[1][1]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.nbytes = 0
+
+    def stats(self):
+        return {'hits' : self.hits, 'misses' : self.misses, 'size' : len(self.entries), 'maxSize' : self.maxSize,
+                'bytes' : self.nbytes, 'maxBytes' : self.maxBytes}
+
+# BiasSlice kept per table
+SLICE_SIZE = 8
+
+# Shared by all the tables, set maxSize to 0 to turn it off
+lookupCache = LookupCache()
+tableCount = itertools.count()
+
+def memoKey(x):
+    '''Hashable key of the rounded input, -0.0 is folded into 0.0
+
+    Inputs above MEMO_KEY_BYTES are keyed by a 128-bit digest instead of their bytes.
+    '''
+    x = np.round(np.asarray(x, dtype=float), MEMO_DIGITS) + 0.0
+    if x.nbytes > MEMO_KEY_BYTES:
+        return (x.shape, hashlib.blake2b(np.ascontiguousarray(x), digest_size=16).digest())
+    return (x.shape, x.tobytes())
+
+def memoized(*inputs):
+    '''The lookupCache is on and the broadcast inputs are small enough to be kept'''
+    return lookupCache.maxSize != 0 and np.broadcast(*inputs).size <= MEMO_POINTS
+
+def readOnly(x):
+    '''Cached arrays are shared between the callers'''
+    if isinstance(x, np.ndarray):
+        x.setflags(write=False)
+    return x
+
+def uniformInvStep(grid):
+    '''1/step of the grid if it is uniform, else None'''
+    if grid.size < 2 or grid[-1] <= grid[0]:
+        return None
+    step = (grid[-1] - grid[0]) / (grid.size - 1)
+    if np.max(np.abs(grid - (grid[0] + step * np.arange(grid.size)))) > UNIFORM_TOL * step:
+        return None
+    return 1.0 / step
+
+def gridPoint(cellInd, cellFrac):
+    '''Index of the grid point of every input of cellIndex if they all are on the grid, else None'''
+    if cellFrac.size == 0:
+        return None
+    upper = np.rint(cellFrac)
+    # A NaN weight is never on the grid
+    if not np.all(np.abs(cellFrac - upper) <= GRID_TOL):
+        return None
+    return cellInd + upper.astype(int)
+
+def gridIndex(gridInd, strides, xShape):
+    '''Flat index of the grid points of gridPoint'''
+    return np.broadcast_to(sum(ind * stride for ind, stride in zip(gridInd, strides)), xShape)
+
+def axisSlice(gridInd):
+    '''The grid index of a 1-D query as an int or slice, None if it is not evenly spaced'''
+    if gridInd.ndim == 0 or np.all(gridInd == gridInd.flat[0]):
+        return int(gridInd.flat[0])
+    if gridInd.ndim > 1:
+        return None
+    step = int(gridInd[1] - gridInd[0])
+    if step < 1 or np.any(np.diff(gridInd) != step):
+        return None
+    return slice(int(gridInd[0]), int(gridInd[-1]) + 1, step)
+
+class MosTable(object):
+    '''Decoded MOS data of one mat file with the grid and the stacked variables cached'''
+    # Name of the third axis of the table
+    xAxis = 'VGS'
+
+    def __init__(self, mosDat):
+        self.mosDat = mosDat
+        self.datCache = {}
+        self.stackCache = {}
+        self.flatCache = {}
+        self.sliceCache = OrderedDict()
+        # Identity of the table in the lookupCache keys
+        self.tableId = next(tableCount)
+        # Grid of the table, VSB is stored with the flipped sign
+        self.vsbf = self['VSB'].flatten()
+        self.vdsf = self['VDS'].flatten()
+        self.vgsf = self[self.xAxis].flatten()
+        self.lf = self['L'].flatten()
+        self.points = ( -self.vsbf, self.vdsf, self.vgsf, self.lf)
+        self.gridShape = tuple(grid.size for grid in self.points)
+        # 1/step of the uniform axes, None for the others
+        self.invSteps = [uniformInvStep(grid) for grid in self.points]
+        # GmIdTable of the same data, set by loadTable
+        self.gmIdTab = None
+
+    def __getitem__(self, varName):
+        '''Decode the variable from the mat file only once'''
+        if varName not in self.datCache:
+            with gp.section('LupMos.MosTable.read'):
+                self.datCache[varName] = np.asarray(self.mosDat[varName])
+        return self.datCache[varName]
+
+    def __contains__(self, varName):
+        return varName in self.mosDat
+
+    def keys(self):
+        return self.mosDat.keys()
+
+    @gp.profiled
+    def lookup(self, outVar, L, VGS, VDS, VSB):
+        '''Interpolate outVar on the grid spanned by the inputs'''
+        xi = [np.reshape(x, (-1,) + (1,) * (3 - i)) for i, x in enumerate((VSB, VDS, VGS, L))]
+        return np.squeeze(self.interpMany([outVar], xi[3], xi[2], xi[1], xi[0])[outVar])
+
+    def stack(self, outVars):
+        '''Stack the output variables along a leading axis'''
+        outVars = tuple(outVars)
+        if outVars not in self.stackCache:
+            self.stackCache[outVars] = np.stack([self[outVar] for outVar in outVars])
+        return self.stackCache[outVars]
+
+    def flat(self, varName):
+        '''The variable with the grid axes flattened, a view unless it is not contiguous'''
+        if varName not in self.flatCache:
+            self.flatCache[varName] = self[varName].reshape(-1)
+        return self.flatCache[varName]
+
+    def gridData(self, outVars):
+        '''The outVars as read by gather, stacked along a leading axis with the grid axes flattened'''
+        stackDat = self.stack(outVars)
+        return stackDat.reshape(stackDat.shape[:-4] + (-1,))
+
+    def gather(self, gridDat, flatInd):
+        '''Samples of gridData at the flat grid index'''
+        return np.take(gridDat, flatInd, axis=-1)
+
+    def cellIndex(self, axisIndex, x):
+        '''Index of the lower grid point and the weight of the upper one
+
+        A NaN input gets the first cell and a NaN weight, so that its outputs are NaN.
+        '''
+        grid = self.points[axisIndex]
+        x = np.asarray(x, dtype=float)
+        xNan = np.isnan(x)
+        if xNan.any():
+            x = np.where(xNan, grid[0], x)
+        if x.size > 0 and (x.min() < grid[0] or x.max() > grid[-1]):
+            raise ValueError("One of the requested xi is out of bounds in dimension %d" % axisIndex)
+        if grid.size == 1:
+            index, frac = np.zeros(x.shape, dtype=int), np.zeros(x.shape)
+        elif self.invSteps[axisIndex] is not None:
+            # Uniform axis : no search needed, x is inside the grid so only the last cell needs a clip
+            pos = (x - grid[0]) * self.invSteps[axisIndex]
+            index = np.minimum(pos.astype(int), grid.size - 2)
+            frac = pos - index
+        else:
+            index = np.minimum(np.searchsorted(grid, x, 'right') - 1, grid.size - 2)
+            frac = (x - grid[index]) / (grid[index + 1] - grid[index])
+        if xNan.any():
+            frac = np.where(xNan, np.nan, frac)
+        return index, frac
+
+    @gp.profiled
+    def lookupMany(self, outVars, L, VGS, VDS, VSB):
+        '''Interpolate all outVars at the broadcast inputs, repeated lookups come from the lookupCache'''
+        if not memoized(L, VGS, VDS, VSB):
+            return self.interpMany(outVars, L, VGS, VDS, VSB)
+        inKey = (memoKey(L), memoKey(VGS), memoKey(VDS), memoKey(VSB))
+        result = {}
+        for outVar in outVars:
+            result[outVar] = lookupCache.get((self.tableId, outVar) + inKey)
+            if result[outVar] is None:
+                break
+        else:
+            return result
+        result = self.interpMany(outVars, L, VGS, VDS, VSB)
+        for outVar in outVars:
+            result[outVar] = readOnly(result[outVar])
+            lookupCache.put((self.tableId, outVar) + inKey, result[outVar])
+        return result
+
+    @gp.profiled
+    def interpMany(self, outVars, L, VGS, VDS, VSB):
+        '''Interpolate all outVars at the broadcast inputs with one set of weights'''
+        # Cells of the inputs as given, they are broadcast by the sums below
+        xi = (VSB, VDS, VGS, L)
+        xShape = np.broadcast(*xi).shape
+        # Axes in front of the 4 grid axes are kept whole, the grid is read through one flat index
+        gridDat = self.gridData(outVars)
+        strides = [int(np.prod(self.gridShape[i + 1:])) for i in range(4)]
+        cells = [self.cellIndex(i, xi[i]) for i in range(4)]
+        # Queries on the grid points read the stored samples
+        gridInd = []
+        for cellInd, cellFrac in cells:
+            gridInd.append(gridPoint(cellInd, cellFrac))
+            if gridInd[-1] is None:
+                break
+        else:
+            return dict(zip(outVars, self.gridSamples(outVars, gridDat, strides, gridInd, xShape)))
+        # Flat index of the lower vertex, and offset and weight of the 16 vertices of the cell
+        base = 0
+        vertices = [(0, 1.0)]
+        for i, (cellInd, cellFrac) in enumerate(cells):
+            base = base + cellInd * strides[i]
+            upperVertices = [(offset + strides[i], weight * cellFrac) for offset, weight in vertices] if self.gridShape[i] > 1 else []
+            vertices = [(offset, weight * (1.0 - cellFrac)) for offset, weight in vertices] + upperVertices
+        if np.size(base) * len(vertices) <= GATHER_POINTS:
+            # Few points : the vertices are read by one gather
+            vertexInd = np.stack([np.broadcast_to(base + offset, xShape) for offset, weight in vertices])
+            vertexWeight = np.stack([np.broadcast_to(weight, xShape) for offset, weight in vertices])
+            vertexDat = iter(np.moveaxis(self.gather(gridDat, vertexInd) * vertexWeight, -1 - len(xShape), 0))
+        else:
+            vertexDat = (self.gather(gridDat, base + offset) * weight for offset, weight in vertices)
+        # Summed vertex by vertex in both cases so that they give the same result
+        result = 0.0 + next(vertexDat)
+        for vertexSample in vertexDat:
+            result += vertexSample
+        return dict(zip(outVars, result))
+
+    def gridSamples(self, outVars, gridDat, strides, gridInd, xShape):
+        '''Stored samples at grid points, without interpolation
+
+        If at most one axis varies along a 1-D query and evenly over the grid the
+        samples are a read-only view of the stack, else they are gathered.
+        '''
+        axisInd = [axisSlice(ind) for ind in gridInd]
+        varying = [ind for ind in axisInd if isinstance(ind, slice)]
+        if len(xShape) <= 1 and None not in axisInd and len(varying) <= 1:
+            stackDat = self.stack(outVars)
+            result = stackDat[(Ellipsis,) + tuple(axisInd)]
+            if not varying:
+                result = np.broadcast_to(result[(Ellipsis,) + (None,) * len(xShape)], stackDat.shape[:-4] + xShape)
+            result = result.view()
+            result.flags.writeable = False
+            return result
+        return self.gather(gridDat, gridIndex(gridInd, strides, xShape))
+
+    def biasSlice(self, outVars, L, VGS):
+        '''Table of the outVars at L and VGS left to interpolate along VSB and VDS'''
+        sliceKey = (tuple(outVars), memoKey(L), memoKey(VGS))
+        if sliceKey not in self.sliceCache:
+            self.sliceCache[sliceKey] = BiasSlice(self, outVars, L, VGS)
+            while len(self.sliceCache) > SLICE_SIZE:
+                self.sliceCache.popitem(last=False)
+        self.sliceCache.move_to_end(sliceKey)
+        return self.sliceCache[sliceKey]
+
+    def lookupVGS(self, outVar, target, L, VDS, VSB, falling=None):
+        '''Solve VGS where outVar reaches the target
+
+        outVar is scanned along the VGS grid from the end where it is smallest
+        (from the top of VGS if falling) and the first crossing of the target is
+        interpolated inside its cell. The state is 1 for a solution, 0 if the
+        target is already met at the start of the scan and 2 if it is never met.
+        '''
+        if not memoized(target, L, VDS, VSB):
+            return self.solveVGS(outVar, target, L, VDS, VSB, falling)
+        vgsKey = (self.tableId, 'VGS@' + outVar, memoKey(target), memoKey(L), memoKey(VDS), memoKey(VSB),
+                  None if falling is None else memoKey(falling))
+        vgsRes = lookupCache.get(vgsKey)
+        if vgsRes is None:
+            vgs, state = self.solveVGS(outVar, target, L, VDS, VSB, falling)
+            vgsRes = (readOnly(vgs), readOnly(state))
+            lookupCache.put(vgsKey, vgsRes)
+        return vgsRes
+
+    @gp.profiled
+    def solveVGS(self, outVar, target, L, VDS, VSB, falling=None):
+        '''Uncached lookupVGS'''
+        target, L, VDS, VSB = np.broadcast_arrays(target, L, VDS, VSB)
+        vgsGrid = self.vgsf
+        ySlice = self.lookupMany([outVar], L=L[..., None], VGS=vgsGrid, VDS=VDS[..., None], VSB=VSB[..., None])[outVar]
+        if falling is None:
+            falling = ySlice[..., -1] < ySlice[..., 0]
+        # ySlice has the corner axis of a CornerTable in front of the target shape
+        falling = np.broadcast_to(falling, ySlice.shape[:-1])[..., None]
+        ySeq = np.where(falling, ySlice[..., ::-1], ySlice)
+        vgsSeq = np.where(falling, vgsGrid[::-1], vgsGrid)
+        vgs, state = crossVGS(ySeq, vgsSeq, target)[:2]
+        if vgs.ndim == 0:
+            return float(vgs), int(state)
+        return vgs, state
+
+def crossVGS(ySeq, vgsSeq, target):
+    '''VGS where ySeq first meets the target along the last axis, the scan of lookupVGS
+
+    The inputs broadcast against each other. Returns VGS and the state of lookupVGS, and the
+    upper point and weight of the crossing to read other variables of the scan with crossAt.
+    '''
+    target = np.asarray(target, dtype=float)
+    # First point of the scan that meets the target
+    reached = ySeq >= target[..., None]
+    first = np.argmax(reached, axis=-1)[..., None]
+    found = np.take_along_axis(reached, first, -1)[..., 0]
+    state = np.where(found, np.where(first[..., 0] == 0, 0, 1), 2)
+    upper = np.clip(first, 1, ySeq.shape[-1] - 1)
+    y0 = np.take_along_axis(ySeq, upper - 1, -1)[..., 0]
+    y1 = np.take_along_axis(ySeq, upper, -1)[..., 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        frac = np.where(y1 != y0, (target - y0) / (y1 - y0), 1.0)
+    vgs = crossAt(vgsSeq, upper, frac)
+    # Out of range : clamp to the end of the scan
+    vgs = np.where(state == 0, vgsSeq[..., 0], vgs)
+    vgs = np.where(state == 2, vgsSeq[..., -1], vgs)
+    return vgs, state, upper, frac
+
+def crossAt(seq, upper, frac):
+    '''Value of seq, scanned like the ySeq of crossVGS, at its crossing'''
+    seq = np.reshape(seq, (1,) * (upper.ndim - np.ndim(seq)) + np.shape(seq))
+    lower = np.take_along_axis(seq, upper - 1, -1)[..., 0]
+    return lower + frac * (np.take_along_axis(seq, upper, -1)[..., 0] - lower)
+
+class BiasSlice(object):
+    '''The VSB x VDS plane of outVars at a fixed L and VGS list
+
+    Interpolation along L and VGS is done once, a new bias only needs the
+    bilinear weights of VSB and VDS. Gives the same result as lookupMany.
+    '''
+    @gp.profiled
+    def __init__(self, mosTable, outVars, L, VGS):
+        self.mosTable = mosTable
+        self.outVars = list(outVars)
+        self.L = L
+        self.VGS = np.asarray(VGS, dtype=float)
+        stackDat = mosTable.stack(self.outVars)
+        # The outVars, and the corners of a CornerTable, in front of the bias axes
+        self.leadAxes = (slice(None),) * (stackDat.ndim - 4)
+        # L first as it shrinks the table the most
+        lInd, lFrac = mosTable.cellIndex(3, L)
+        lGrid = gridPoint(lInd, lFrac)
+        if mosTable.lf.size == 1:
+            planeDat = stackDat[..., 0]
+        elif lGrid is not None:
+            planeDat = stackDat[..., lGrid]
+        else:
+            planeDat = stackDat[..., lInd] * (1.0 - lFrac) + stackDat[..., lInd + 1] * lFrac
+        vgsInd, vgsFrac = mosTable.cellIndex(2, self.VGS)
+        vgsGrid = gridPoint(vgsInd, vgsFrac)
+        if mosTable.vgsf.size == 1:
+            self.planeDat = planeDat[..., vgsInd]
+        elif vgsGrid is not None:
+            self.planeDat = planeDat[..., vgsGrid]
+        else:
+            self.planeDat = planeDat[..., vgsInd] * (1.0 - vgsFrac) + planeDat[..., vgsInd + 1] * vgsFrac
+
+    @gp.profiled
+    def lookup(self, VDS, VSB):
+        '''outVars over the VGS list at the bias'''
+        result = 0.0
+        vsbInd, vsbFrac = self.mosTable.cellIndex(0, VSB)
+        vdsInd, vdsFrac = self.mosTable.cellIndex(1, VDS)
+        vsbGrid = gridPoint(vsbInd, vsbFrac)
+        vdsGrid = gridPoint(vdsInd, vdsFrac)
+        if vsbGrid is not None and vdsGrid is not None:
+            # On the bias grid : the plane itself
+            result = self.planeDat[self.leadAxes + (vsbGrid, vdsGrid)]
+            result.flags.writeable = False
+            return dict(zip(self.outVars, result))
+        for vsbUp, vdsUp in itertools.product((0, 1), repeat=2):
+            if (vsbUp == 1 and self.mosTable.vsbf.size == 1) or (vdsUp == 1 and self.mosTable.vdsf.size == 1):
+                continue
+            weight = (vsbFrac if vsbUp == 1 else 1.0 - vsbFrac) * (vdsFrac if vdsUp == 1 else 1.0 - vdsFrac)
+            result = result + self.planeDat[self.leadAxes + (vsbInd + vsbUp, vdsInd + vdsUp)] * weight
+        return dict(zip(self.outVars, result))
+
+class CornerTable(MosTable):
+    '''MOS tables of several corners on the same grid seen along a corner axis
+
+    lookupMany, lookupVGS and biasSlice give every outVar with the corners as first axis,
+    all the corners share one set of interpolation weights. The grid is taken from the
+    first table. lookupMany does not copy the corners into one array, only the cells the
+    weights need are gathered from every corner table. A variable read by name, and the
+    stack of biasSlice, are the corner variables stacked along a leading axis.
+    '''
+    def __init__(self, mosTables):
+        self.mosTables = list(mosTables)
+        for mosTable in self.mosTables[1:]:
+            if mosTable.xAxis != self.mosTables[0].xAxis or not all(
+                    np.array_equal(grid, firstGrid) for grid, firstGrid in zip(mosTable.points, self.mosTables[0].points)):
+                raise ValueError('The corner tables are not on the same grid')
+        self.xAxis = self.mosTables[0].xAxis
+        super(CornerTable, self).__init__(self.mosTables[0])
+        # The same corners share the lookupCache entries
+        self.tableId = ('corners',) + tuple(mosTable.tableId for mosTable in self.mosTables)
+
+    def __getitem__(self, varName):
+        '''The grid of the first table, any other variable stacked over the corners'''
+        if varName in ['VSB', 'VDS', self.xAxis, 'L']:
+            return self.mosTables[0][varName]
+        if varName not in self.datCache:
+            self.datCache[varName] = np.stack([mosTable[varName] for mosTable in self.mosTables])
+        return self.datCache[varName]
+
+    def gridData(self, outVars):
+        '''The flat outVars of every corner table, as [outVar][corner]'''
+        return [[mosTable.flat(outVar) for mosTable in self.mosTables] for outVar in outVars]
+
+    def gather(self, gridDat, flatInd):
+        '''Samples of every corner at the flat grid index, the outVars along the first axis and the corners along the second'''
+        return np.array([[np.take(cornerDat, flatInd) for cornerDat in varDat] for varDat in gridDat])
+
+    def gridSamples(self, outVars, gridDat, strides, gridInd, xShape):
+        '''Stored samples at grid points, always gathered'''
+        return self.gather(gridDat, gridIndex(gridInd, strides, xShape))
+
+class GmIdTable(MosTable):
+    '''MOS table resampled with GmOverId in place of VGS as the third axis
+
+    VGS is a variable of this table. Grid points outside the GmOverId range
+    of their (VSB, VDS, L) column are NaN.
+    '''
+    xAxis = 'GMID'
+
+    @gp.profiled
+    def lookupGmId(self, outVars, L, GmId, VDS, VSB):
+        '''Interpolate the outVars at the GmOverId'''
+        return self.lookupMany(outVars, L, GmId, VDS, VSB)
+
+    def inRange(self, GmId):
+        return bool(np.all(GmId >= self.vgsf[0]) and np.all(GmId <= self.vgsf[-1]))
+
+@gp.profiled
+def buildGmIdTable(mosTable, step=GMID_STEP):
+    '''Resample all the 4-D variables of the table on a GmOverId grid
+
+    GmOverId is solved along VGS like lookupVGS with falling=True: scanning down
+    from the top VGS, the first crossing of the grid value is interpolated.
+    '''
+    vgsGrid = mosTable.vgsf
+    # (VSB, VDS, L) columns with VGS from the top
+    def columns(varDat):
+        return np.moveaxis(np.asarray(varDat), 2, -1)[..., ::-1].reshape(-1, vgsGrid.size)
+    colShape = mosTable['GMOVERID'].shape[:2] + mosTable['GMOVERID'].shape[3:]
+    ySeq = columns(mosTable['GMOVERID'])
+    # First point of the scan reaching the target is the first one of the running max
+    yReach = np.maximum.accumulate(ySeq, axis=-1)
+    gmIdGrid = np.arange(np.floor(ySeq[:, 0].min() / step), np.ceil(yReach[:, -1].max() / step) + 1) * step
+    upper = np.empty((ySeq.shape[0], gmIdGrid.size), dtype=int)
+    for col in range(ySeq.shape[0]):
+        upper[col] = np.searchsorted(yReach[col], gmIdGrid, 'left')
+    valid = (upper > 0) & (upper < vgsGrid.size)
+    upper = np.clip(upper, 1, vgsGrid.size - 1)
+    y0 = np.take_along_axis(ySeq, upper - 1, -1)
+    y1 = np.take_along_axis(ySeq, upper, -1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        frac = np.where(valid, (gmIdGrid - y0) / (y1 - y0), np.nan)
+    def resample(seqDat):
+        lower = np.take_along_axis(seqDat, upper - 1, -1)
+        colDat = lower + frac * (np.take_along_axis(seqDat, upper, -1) - lower)
+        return np.moveaxis(colDat.reshape(colShape + (gmIdGrid.size,)), -1, 2)
+    gmIdDat = {'GMID' : gmIdGrid.reshape(1, -1)}
+    gmIdDat['VGS'] = resample(np.broadcast_to(vgsGrid[::-1], ySeq.shape))
+    for varName in mosTable.keys():
+        if varName in ['GMOVERID', 'VGS']:
+            continue
+        varDat = mosTable[varName]
+        if varDat.ndim == 4 and varDat.shape == mosTable['GMOVERID'].shape:
+            gmIdDat[varName] = resample(columns(varDat))
+        elif varDat.ndim == 2 and varDat.dtype.kind == 'f':
+            gmIdDat[varName] = varDat
+    return GmIdTable(gmIdDat)
+
+def matStamp(matFilePath):
+    '''Modification time and size identifying the content of the mat file'''
+    matStat = os.stat(matFilePath)
+    return {'mtime' : matStat.st_mtime_ns, 'size' : matStat.st_size}
+
+def readCacheMeta(cacheDir):
+    try:
+        with open(os.path.join(cacheDir, CACHE_META), 'r') as metaFile:
+            return json.load(metaFile)
+    except (OSError, ValueError):
+        return None
+
+def stampMatch(meta, stamp):
+    return meta is not None and all(meta.get(key) == value for key, value in stamp.items())
+
+def saveArrays(cacheDir, arrays, stamp):
+    '''Write the (name, array) pairs as .npy files and replace cacheDir at once'''
+    tmpDir = '%s.tmp%d' % (cacheDir, os.getpid())
+    shutil.rmtree(tmpDir, ignore_errors=True)
+    os.makedirs(tmpDir)
+    try:
+        meta = dict(stamp)
+        meta['vars'] = []
+        for varName, varDat in arrays:
+            np.save(os.path.join(tmpDir, varName + '.npy'), np.ascontiguousarray(varDat))
+            meta['vars'].append(varName)
+        with open(os.path.join(tmpDir, CACHE_META), 'w') as metaFile:
+            json.dump(meta, metaFile)
+        shutil.rmtree(cacheDir, ignore_errors=True)
+        os.rename(tmpDir, cacheDir)
+    except OSError:
+        shutil.rmtree(tmpDir, ignore_errors=True)
+        # Another process may have written the same cache in the meantime
+        if not stampMatch(readCacheMeta(cacheDir), stamp):
+            raise
+
+def loadArrays(cacheDir, stamp):
+    '''Memory-map the .npy files of cacheDir, None if they were not written for the stamp'''
+    meta = readCacheMeta(cacheDir)
+    if not stampMatch(meta, stamp):
+        return None
+    return dict((varName, np.load(os.path.join(cacheDir, varName + '.npy'), mmap_mode='r')) for varName in meta['vars'])
+
+@gp.profiled
+def writeCache(matFilePath, cacheDir):
+    '''Decode every variable of the mat file into its own .npy file'''
+    with h5py.File(matFilePath, 'r') as matDat:
+        saveArrays(cacheDir, ((varName, varDat[()]) for varName, varDat in matDat.items() if isinstance(varDat, h5py.Dataset)),
+                   matStamp(matFilePath))
+
+@gp.profiled
+def openCache(matFilePath):
+    '''Memory-map the decoded variables, the cache is rebuilt if the mat file changed'''
+    cacheDir = matFilePath + CACHE_SUFFIX
+    stamp = matStamp(matFilePath)
+    arrays = loadArrays(cacheDir, stamp)
+    if arrays is None:
+        print ('Build cache : %s' % cacheDir, file=sys.stderr)
+        writeCache(matFilePath, cacheDir)
+        arrays = loadArrays(cacheDir, stamp)
+    return arrays
+
+@gp.profiled
+def loadGmIdTable(matFilePath, mosTable=None, step=GMID_STEP):
+    '''GmIdTable of the mat file, built once and kept next to it like the cache of loadTable'''
+    cacheDir = matFilePath + GMID_SUFFIX
+    stamp = matStamp(matFilePath)
+    stamp['step'] = step
+    arrays = loadArrays(cacheDir, stamp)
+    if arrays is not None:
+        return GmIdTable(arrays)
+    print ('Build GmId table : %s' % cacheDir, file=sys.stderr)
+    if mosTable is None:
+        mosTable = loadTable(matFilePath)
+    gmIdTab = buildGmIdTable(mosTable, step)
+    try:
+        saveArrays(cacheDir, gmIdTab.mosDat.items(), stamp)
+    except OSError as cacheErr:
+        print ('No cache for %s : %s' % (cacheDir, cacheErr), file=sys.stderr)
+    return gmIdTab
+
+@gp.profiled
+def loadTable(matFilePath, useCache=True, withGmId=False):
+    '''Open the mat file as MosTable, through the memory-mapped cache if possible
+
+    With withGmId the GmIdTable of the file is attached as gmIdTab.
+    '''
+    mosTable = None
+    if useCache and os.path.isfile(matFilePath):
+        try:
+            mosTable = MosTable(openCache(matFilePath))
+        except OSError as cacheErr:
+            print ('No cache for %s : %s' % (matFilePath, cacheErr), file=sys.stderr)
+    if mosTable is None:
+        mosTable = MosTable(h5py.File(matFilePath, 'r'))
+    if withGmId:
+        mosTable.gmIdTab = loadGmIdTable(matFilePath, mosTable)
+    return mosTable
+
 def info(mosDat):
     if( mosDat == None):
         print ("No MOSFET data available. Please set first")
@@ -32,6 +675,7 @@ def info(mosDat):
         return maxVgs, stepVgs, minVsb
         #print ('Gate Length Set :', end = ' ')
 
+@gp.profiled
 def lookup(mosDat, mosType, *outVars, **inVars):
     '''Main lookup function'''
 
@@ -159,6 +803,47 @@ def lookup(mosDat, mosType, *outVars, **inVars):
     # Return the result
     return result
 
+@gp.profiled
+def lookupMany(mosDat, outVars, **inVars):
+    '''Look up several output variables at once, the inputs are broadcast against each other'''
+    if (type(outVars) == str):
+        outVars = [outVars]
+    for outVar in outVars:
+        if (type(outVar) != str):
+            print ("ERROR: Output variables must be strings!")
+            return None
+    for varName in inVars.keys():
+        if (varName not in ['L', 'VGS', 'VDS', 'VSB']):
+            print ("ERROR: Invalid keyword arg(s). Allowed arguments: L, VGS, VDS and VSB.")
+            return None
+    if (not isinstance(mosDat, MosTable)):
+        mosDat = MosTable(mosDat)
+
+    L = inVars.get('L', min(mosDat.lf))
+    VGS = inVars.get('VGS', mosDat.vgsf)
+    VDS = inVars.get('VDS', max(mosDat.vdsf)/2)
+    VSB = inVars.get('VSB', 0)
+    return mosDat.lookupMany([outVar.upper() for outVar in outVars], L=L, VGS=VGS, VDS=VDS, VSB=VSB)
+
+@gp.profiled
+def lookupVGS(mosDat, outVar, target, falling=None, **inVars):
+    '''Inverse lookup of VGS for the target of outVar, returns VGS and the search state'''
+    if (type(outVar) != str):
+        print ("ERROR: Output variables must be strings!")
+        return None
+    for varName in inVars.keys():
+        if (varName not in ['L', 'VDS', 'VSB']):
+            print ("ERROR: Invalid keyword arg(s). Allowed arguments: L, VDS and VSB.")
+            return None
+    if (not isinstance(mosDat, MosTable)):
+        mosDat = MosTable(mosDat)
+
+    L = inVars.get('L', min(mosDat.lf))
+    VDS = inVars.get('VDS', max(mosDat.vdsf)/2)
+    VSB = inVars.get('VSB', 0)
+    return mosDat.lookupVGS(outVar.upper(), target, L=L, VDS=VDS, VSB=VSB, falling=falling)
+
+@gp.profiled
 def lookupfz(mosDat, mosTypeVar,*outVars, **inVars):
     '''Development of simplified version of lookup function'''
     mosType = mosTypeVar.lower()
@@ -221,6 +906,10 @@ def lookupfz(mosDat, mosTypeVar,*outVars, **inVars):
     if ('VSB' in varNames):
         VSB = inVars['VSB']
 
+    # Decoded table : only the interpolation is left
+    if (isinstance(mosDat, MosTable) and mode == 1):
+        return mosDat.lookup(outVarList[0], L=L, VGS=VGS, VDS=VDS, VSB=VSB)
+
     xdataRaw = None
     ydataRaw = None
 
@@ -230,12 +919,13 @@ def lookupfz(mosDat, mosTypeVar,*outVars, **inVars):
         xdataRaw = mosDat[outVarList[1]]
 
     # Change Data Type
-    xdata = np.array(xdataRaw)
-    ydata = np.array(ydataRaw)
-    vsbf = np.array(mosDat['VSB']).flatten()
-    vdsf = np.array(mosDat['VDS']).flatten()
-    vgsf = np.array(mosDat['VGS']).flatten()
-    lf = np.array(mosDat['L']).flatten()
+    with gp.section('LupMos.lookupfz.read'):
+        xdata = np.array(xdataRaw)
+        ydata = np.array(ydataRaw)
+        vsbf = np.array(mosDat['VSB']).flatten()
+        vdsf = np.array(mosDat['VDS']).flatten()
+        vgsf = np.array(mosDat['VGS']).flatten()
+        lf = np.array(mosDat['L']).flatten()
     points = ( -vsbf, vdsf, vgsf, lf)
     ## Interpolate for the input variables provided
     #if (mosType[0] == 'n'):
@@ -258,7 +948,8 @@ def lookupfz(mosDat, mosTypeVar,*outVars, **inVars):
     xfit = None
     result = None
     if (mode == 1):
-        result = np.squeeze(interpn(points, ydata, xi).reshape( len_VSB, len_VDS, len_VGS, len_L))
+        with gp.section('LupMos.lookupfz.interpn'):
+            result = np.squeeze(interpn(points, ydata, xi).reshape( len_VSB, len_VDS, len_VGS, len_L))
     elif (mode == 2):
         yfit = np.squeeze(interpn(points, ydata, xi).reshape( len_VSB, len_VDS, len_VGS, len_L))
         xfit = np.squeeze(interpn(points, xdata, xi).reshape( len_VSB, len_VDS, len_VGS, len_L))
@@ -0,0 +1,210 @@
+# Dataset of the mat files in a directory
+# Every file is indexed by (tech, device, corner, temp) so that the corners and temperatures
+# of one device can be used together, the tables are only opened once they are looked up
+
+import json
+import os
+import re
+import sys
+import numpy as np
+import h5py
+# import library for mos lookup
+import LupMos as lp
+
+# TEMP is saved in K, the run scripts hand TEMP - 273 to the simulator
+TEMP_OFFSET = 273
+MAT_SUFFIX = '.mat'
+# Index of the directory, hidden like the other dot files
+INDEX_FILE = '.gmIdIndex.json'
+INDEX_VERSION = 1
+# Fields of the record making the key of a file
+INFO_KEY = ('tech', 'device', 'corner', 'temp')
+
+def decodeChar(charDat):
+    '''String of a MATLAB char array'''
+    return ''.join(chr(int(charCode)) for charCode in np.asarray(charDat).flatten())
+
+def readInfo(matFilePath):
+    '''Index record of the mat file
+
+    It has tech, device, corner, temp in C, the L list, [min, max, points] of VGS, VDS and VSB,
+    W and NFING. tech and device come from the name (tech-device-corner.mat, or tech_device_corner.mat
+    as saved by the run scripts), corner and temp from CORNER and TEMP if they are stored.
+    '''
+    nameInfo = re.split('[-_]', os.path.basename(matFilePath)[:-len(MAT_SUFFIX)])
+    matInfo = dict(zip(INFO_KEY, (nameInfo + [None, None, None])[:3] + [None]))
+    with h5py.File(matFilePath, 'r') as matFile:
+        if 'CORNER' in matFile:
+            matInfo['corner'] = decodeChar(matFile['CORNER'])
+        if 'TEMP' in matFile:
+            matInfo['temp'] = round(float(np.asarray(matFile['TEMP']).flatten()[0]) - TEMP_OFFSET, 3)
+        matInfo['L'] = np.asarray(matFile['L'], dtype=float).flatten().tolist()
+        for axisName in ['VGS', 'VDS', 'VSB']:
+            axisDat = np.asarray(matFile[axisName], dtype=float).flatten()
+            matInfo[axisName] = [float(axisDat.min()), float(axisDat.max()), int(axisDat.size)]
+        for sizeName in ['W', 'NFING']:
+            matInfo[sizeName] = float(np.asarray(matFile[sizeName]).flatten()[0])
+    return matInfo
+
+def readIndex(indexPath):
+    '''File name : record of the index file, empty if there is none of this version'''
+    try:
+        with open(indexPath, 'r') as indexFile:
+            index = json.load(indexFile)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(index, dict) or index.get('version') != INDEX_VERSION:
+        return {}
+    return index.get('files', {})
+
+def writeIndex(indexPath, fileInfo):
+    '''Replace the index file at once, a read-only directory is only reported'''
+    tmpPath = '%s.tmp%d' % (indexPath, os.getpid())
+    try:
+        with open(tmpPath, 'w') as indexFile:
+            json.dump({'version' : INDEX_VERSION, 'files' : fileInfo}, indexFile, indent=1, sort_keys=True)
+        os.replace(tmpPath, indexPath)
+    except OSError as writeErr:
+        print ('Index not saved : %s' % writeErr, file=sys.stderr)
+        if os.path.exists(tmpPath):
+            os.remove(tmpPath)
+
+class MosDataset(object):
+    '''The mat files of a directory indexed by (tech, device, corner, temp)
+
+    The records of the files are kept in INDEX_FILE of the directory, a scan only
+    opens the mat files that are new or changed since.
+    '''
+    def __init__(self, dirPath, useIndex=True):
+        self.dirPath = dirPath
+        self.useIndex = useIndex
+        # (tech, device, corner, temp) : mat file path
+        self.files = {}
+        # mat file name : index record
+        self.fileInfo = {}
+        # mat file path : MosTable, opened on first use
+        self.tables = {}
+        self.scan()
+
+    def scan(self):
+        '''Index every mat file of the directory, the files that can not be read are skipped'''
+        indexPath = os.path.join(self.dirPath, INDEX_FILE)
+        lastInfo = readIndex(indexPath) if self.useIndex else {}
+        self.files = {}
+        self.fileInfo = {}
+        changed = False
+        for fileName in sorted(os.listdir(self.dirPath)):
+            matFilePath = os.path.join(self.dirPath, fileName)
+            if fileName[0] == '.' or not fileName.endswith(MAT_SUFFIX) or not os.path.isfile(matFilePath):
+                continue
+            stamp = lp.matStamp(matFilePath)
+            matInfo = lastInfo.get(fileName)
+            if not lp.stampMatch(matInfo, stamp):
+                try:
+                    matInfo = readInfo(matFilePath)
+                except (OSError, KeyError, ValueError) as readErr:
+                    # Kept in the index too so that it is not opened again
+                    matInfo = {'error' : str(readErr)}
+                matInfo.update(stamp)
+                changed = True
+            self.fileInfo[fileName] = matInfo
+            if 'error' in matInfo:
+                print ('Skip %s : %s' % (matFilePath, matInfo['error']), file=sys.stderr)
+                continue
+            matKey = tuple(matInfo[infoKey] for infoKey in INFO_KEY)
+            if matKey in self.files:
+                print ('Skip %s : %s is already %s' % (matFilePath, matKey, self.files[matKey]), file=sys.stderr)
+                continue
+            self.files[matKey] = matFilePath
+        if self.useIndex and (changed or set(lastInfo) != set(self.fileInfo)):
+            writeIndex(indexPath, self.fileInfo)
+
+    def select(self, tech=None, device=None, corner=None, temp=None):
+        '''Keys matching all the given fields'''
+        return [matKey for matKey in self.files
+                if all(value is None or value == keyValue for value, keyValue in zip((tech, device, corner, temp), matKey))]
+
+    def fileNames(self, tech=None, device=None, corner=None, temp=None):
+        '''Sorted names of the mat files matching all the given fields'''
+        return sorted(os.path.basename(self.files[matKey]) for matKey in self.select(tech, device, corner, temp))
+
+    def info(self, matFilePath):
+        '''Index record of the mat file, None if it is not in the dataset'''
+        if os.path.abspath(os.path.dirname(matFilePath)) != os.path.abspath(self.dirPath):
+            return None
+        matInfo = self.fileInfo.get(os.path.basename(matFilePath))
+        return None if matInfo is None or 'error' in matInfo else matInfo
+
+    def keyOf(self, matFilePath):
+        '''Key of the mat file, None if it is not in the dataset'''
+        matInfo = self.info(matFilePath)
+        if matInfo is None:
+            return None
+        matKey = tuple(matInfo[infoKey] for infoKey in INFO_KEY)
+        return matKey if os.path.basename(self.files.get(matKey, '')) == os.path.basename(matFilePath) else None
+
+    def find(self, tech, device, corner, temp):
+        '''Path of the mat file, None if there is none'''
+        return self.files.get((tech, device, corner, temp))
+
+    def corners(self, tech, device, temp=None):
+        return sorted(set(matKey[2] for matKey in self.select(tech, device, temp=temp)))
+
+    def temps(self, tech, device, corner=None):
+        return sorted(set(matKey[3] for matKey in self.select(tech, device, corner=corner) if matKey[3] is not None))
+
+    def table(self, matFilePath):
+        '''MosTable of the mat file, loaded on first use'''
+        if matFilePath not in self.tables:
+            self.tables[matFilePath] = lp.loadTable(matFilePath)
+        return self.tables[matFilePath]
+
+    def view(self, tech, device, corners=None, temps=None):
+        '''DatasetView of the device, by default over all its corners and temperatures'''
+        if corners is None:
+            corners = self.corners(tech, device)
+        if temps is None:
+            temps = self.temps(tech, device)
+        return DatasetView(self, tech, device, corners, temps)
+
+class DatasetView(object):
+    '''One device as an N-D table with corner and temperature axes in front of the MOS grid
+
+    lookupMany gives every outVar with the corners as first axis, linear in temperature
+    between the two temperatures around it. The tables of a temperature are only
+    opened by the first lookup that needs them.
+    '''
+    def __init__(self, dataSet, tech, device, corners, temps):
+        self.dataSet = dataSet
+        self.tech = tech
+        self.device = device
+        self.corners = list(corners)
+        self.temps = np.array(sorted(temps), dtype=float)
+        if len(self.corners) == 0 or self.temps.size == 0:
+            raise ValueError('No corner or temperature of %s %s' % (tech, device))
+        missing = [(corner, temp) for corner in self.corners for temp in self.temps.tolist() if dataSet.find(tech, device, corner, temp) is None]
+        if missing:
+            raise ValueError('No mat file of %s %s for (corner, temp) %s' % (tech, device, missing))
+        # temp : CornerTable of the corners
+        self.cornerTabs = {}
+
+    def cornerTable(self, temp):
+        '''CornerTable of all the corners at one of the temperatures'''
+        if temp not in self.cornerTabs:
+            self.cornerTabs[temp] = lp.CornerTable(
+                [self.dataSet.table(self.dataSet.find(self.tech, self.device, corner, temp)) for corner in self.corners])
+        return self.cornerTabs[temp]
+
+    def lookupMany(self, outVars, L, VGS, VDS, VSB, temp=None):
+        '''Interpolate all outVars at the broadcast inputs for every corner at the temperature'''
+        if temp is None and self.temps.size == 1:
+            temp = self.temps[0]
+        if temp is None or temp < self.temps[0] or temp > self.temps[-1]:
+            raise ValueError('Temperature %s is out of %s' % (temp, self.temps.tolist()))
+        upper = int(np.searchsorted(self.temps, temp, 'left'))
+        if self.temps[upper] == temp:
+            return self.cornerTable(self.temps[upper]).lookupMany(outVars, L, VGS, VDS, VSB)
+        tempFrac = (temp - self.temps[upper - 1]) / (self.temps[upper] - self.temps[upper - 1])
+        lower = self.cornerTable(self.temps[upper - 1]).lookupMany(outVars, L, VGS, VDS, VSB)
+        result = self.cornerTable(self.temps[upper]).lookupMany(outVars, L, VGS, VDS, VSB)
+        return dict((outVar, lower[outVar] + tempFrac * (result[outVar] - lower[outVar])) for outVar in outVars)
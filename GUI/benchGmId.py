@@ -0,0 +1,230 @@
+# Part 0 Introduction
+# gmIdBench
+# Time the lookups and the sizing flows of the GUI on synthetic tables, no simulator or PDK needed
+# Usage : python benchGmId.py -o bench.json --nl 20 --step 0.01
+#
+# The tables follow an EKV model written in the layout of the MATLAB v7.3 mat files,
+# so the lookups can be checked against the model at points off the grid.
+# Every benchmark reports the latency percentiles in ms and the throughput as JSON.
+
+# Part 1 Libraries
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+import h5py
+# import library for mos lookup and sizing
+import LupMos as lp
+import GmIdEngine as ge
+import GmIdProfile as gp
+# inversion levels of the L curves
+import const
+
+# Model parameters of the synthetic device
+EKV_N = 1.3
+EKV_KP = 300e-6
+EKV_VT0 = 0.45
+EKV_GAMMA = 0.4
+EKV_PHI = 0.7
+EKV_LAMBDA = 0.08
+EKV_LMIN = 0.18
+EKV_W = 5.0
+EKV_NFING = 2
+# Header of the 512 byte user block of a MATLAB v7.3 mat file
+MAT_HEADER = 'MATLAB 7.3 MAT-file, Platform: GLNXA64, Created on: %s HDF5 schema 1.00 .'
+# Latency percentiles in the report
+PERCENTILES = [50, 90, 99]
+# Corners of gmid_curves, copies of the one table
+BENCH_CORNERS = 5
+
+# Part 2 Synthetic Table
+def ekvModel(VSB, VDS, VGS, L, temp=300.0, dVth=0.0):
+    '''All the table variables of the EKV model at the broadcast bias, VSB >= 0'''
+    UT = 0.0258 * temp / 300.0
+    Vth = EKV_VT0 + dVth + EKV_GAMMA * (np.sqrt(EKV_PHI + VSB) - np.sqrt(EKV_PHI)) - 0.05 * EKV_LMIN / L
+    # Inversion level and its derivative
+    x = (VGS - Vth) / (2 * EKV_N * UT)
+    sp = np.logaddexp(0, x)
+    sig = 1 / (1 + np.exp(-x))
+    lam = EKV_LAMBDA * EKV_LMIN / L
+    fVds = (1 + lam * VDS) * (1 - np.exp(-VDS / UT))
+    I0 = 2 * EKV_N * EKV_KP * (EKV_W * EKV_NFING / L) * UT**2
+    ID = I0 * sp**2 * fVds
+    GM = I0 * sp * sig / (EKV_N * UT) * fVds
+    GDS = I0 * sp**2 * (lam * (1 - np.exp(-VDS / UT)) + (1 + lam * VDS) * np.exp(-VDS / UT) / UT) + 1e-12
+    CGG = 8.5e-15 * EKV_W * EKV_NFING * L * (0.3 + 0.7 * sig) + 0.3e-15 * EKV_W * EKV_NFING
+    return {
+        'ID' : ID,
+        'GM' : GM,
+        'GMB' : 0.2 * GM,
+        'GDS' : GDS,
+        'CGG' : CGG,
+        'CDD' : 0.4 * CGG,
+        'VT' : Vth + 0.0 * ID,
+        'FUG' : GM / (2 * np.pi * CGG),
+        'GMOVERID' : sig / (EKV_N * UT * sp),
+        'SELF_GAIN' : GM / GDS,
+        'VDSAT' : 1.8 * EKV_N * UT * sp / sig}
+
+def matChar(text):
+    '''MATLAB char array as stored in a v7.3 file'''
+    return np.array([[ord(char)] for char in text], dtype=np.uint16)
+
+def writeTable(matFilePath, nL=10, step=0.025, vMax=1.8, nVSB=4, vsbMax=0.3, temp=300.0, corner='tt', dVth=0.0):
+    '''Write the EKV model on the grid as a MATLAB v7.3 mat file of the run scripts'''
+    L = np.linspace(EKV_LMIN, 1.0, nL)
+    VGS = np.round(np.arange(0, vMax + step / 2, step), 6)
+    VDS = VGS.copy()
+    # VSB is saved from high to low like the run scripts do
+    VSB = np.round(np.linspace(vsbMax, 0, nVSB), 6)
+    tableDat = ekvModel(*np.meshgrid(VSB, VDS, VGS, L, indexing='ij'), temp=temp, dVth=dVth)
+    with h5py.File(matFilePath, 'w', userblock_size=512) as matFile:
+        for varName, varDat in tableDat.items():
+            matFile[varName] = varDat
+        for varName, varDat in [('L', L[None, :]), ('VGS', VGS[None, :]), ('VDS', VDS[None, :]), ('VSB', VSB[None, :]),
+                                ('W', np.array([[EKV_W]])), ('NFING', np.array([[float(EKV_NFING)]])), ('TEMP', np.array([[temp]]))]:
+            matFile[varName] = varDat
+        for varName, varText in [('CORNER', corner), ('INFO', 'bench, EKV')]:
+            matFile[varName] = matChar(varText)
+            matFile[varName].attrs['MATLAB_class'] = np.bytes_('char')
+            matFile[varName].attrs['MATLAB_int_decode'] = np.int32(2)
+        for varName in list(tableDat) + ['L', 'VGS', 'VDS', 'VSB', 'W', 'NFING', 'TEMP']:
+            matFile[varName].attrs['MATLAB_class'] = np.bytes_('double')
+    # Text header, version 0x0200 and the endian indicator in the user block
+    header = (MAT_HEADER % time.strftime('%a %b %d %H:%M:%S %Y')).ljust(116).encode('ascii')
+    with open(matFilePath, 'r+b') as matFile:
+        matFile.write(header + b'\x00' * 8 + b'\x00\x02IM')
+    return matFilePath
+
+# Part 3 Timing
+def timeCalls(fn, argList, items=1):
+    '''Latency percentiles in ms and throughput of fn over the argument list'''
+    callTime = np.empty(len(argList))
+    for i, args in enumerate(argList):
+        start = time.perf_counter()
+        fn(*args)
+        callTime[i] = time.perf_counter() - start
+    result = {
+        'calls' : len(argList),
+        'mean_ms' : 1000 * float(callTime.mean()),
+        'max_ms' : 1000 * float(callTime.max())}
+    for percentile in PERCENTILES:
+        result['p%d_ms' % percentile] = 1000 * float(np.percentile(callTime, percentile))
+    result['calls_per_s'] = len(argList) / float(callTime.sum())
+    if items != 1:
+        result['items_per_call'] = items
+        result['items_per_s'] = items * result['calls_per_s']
+    return result
+
+def randomBias(mosDat, rng, size=None):
+    '''Random (L, VGS, VDS, VSB) inside the grid, VSB as the lookups take it'''
+    def inside(grid):
+        return rng.uniform(np.min(grid), np.max(grid), size)
+    return inside(mosDat.lf), inside(mosDat.vgsf), inside(mosDat.vdsf), -inside(mosDat.vsbf)
+
+def runBench(matFilePath, repeat, batch, seed=0):
+    '''Time every flow on the table and check the lookups against the model'''
+    rng = np.random.default_rng(seed)
+    report = {}
+    start = time.perf_counter()
+    mosDat = lp.loadTable(matFilePath, useCache=False)
+    report['load_h5py_ms'] = 1000 * (time.perf_counter() - start)
+    lp.loadTable(matFilePath)
+    start = time.perf_counter()
+    mosDat = lp.loadTable(matFilePath)
+    report['load_cache_ms'] = 1000 * (time.perf_counter() - start)
+    mosDat.gmIdTab = lp.loadGmIdTable(matFilePath, mosDat)
+    pointArgs = [randomBias(mosDat, rng) for i in range(repeat)]
+    midL = float(np.median(mosDat.lf))
+    VDS = 0.5 * float(np.max(mosDat.vdsf))
+    # Single lookups through the old and the new API
+    report['lookupfz'] = timeCalls(lambda L, VGS, VDS, VSB: lp.lookupfz(mosDat, 'nch', 'ID', L=L, VGS=VGS, VDS=VDS, VSB=VSB), pointArgs)
+    report['lookup'] = timeCalls(lambda L, VGS, VDS, VSB: lp.lookupMany(mosDat, ['ID'], L=L, VGS=VGS, VDS=VDS, VSB=VSB), pointArgs)
+    batchArgs = [randomBias(mosDat, rng, batch) for i in range(max(repeat // 10, 1))]
+    report['lookup_batch'] = timeCalls(lambda L, VGS, VDS, VSB: lp.lookupMany(mosDat, ['ID', 'GM', 'CGG', 'GDS'], L=L, VGS=VGS, VDS=VDS, VSB=VSB),
+                                       batchArgs, batch)
+    # Inverse search of VGS and its forward lookup in the GmIdTable
+    searchArgs = [(rng.uniform(5.0, 20.0), L, VDS, VSB) for L, VGS, VDS, VSB in pointArgs]
+    report['search_vgs'] = timeCalls(lambda GmId, L, VDS, VSB: ge.searchVGS(mosDat, 'GMOVERID', GmId, L, VDS, VSB), searchArgs)
+    report['gmid_vgs'] = timeCalls(lambda GmId, L, VDS, VSB: ge.gmIdVGS(mosDat, GmId, L, VDS, VSB), searchArgs)
+    # Flows of the GUI
+    sweepArgs = [(rng.uniform(0.1, 0.3),) for i in range(max(repeat // 10, 1))]
+    report['opt_sweep'] = timeCalls(lambda Vstar: ge.optSizeMos(mosDat, ge.optOpMos(mosDat, ge.OPT_VSTAR, Vstar, mosDat.lf, VDS, 0.0),
+                                                                ge.SIZE_GM, 1e-3, VDS, 0.0), sweepArgs, mosDat.lf.size)
+    listVGS = np.arange(0, np.max(mosDat.vgsf), np.min(np.diff(mosDat.vgsf)))
+    pltVstar = np.arange(0.085, 1.0, 0.0005)
+    pltGmId = np.arange(2.0, 23.5, 0.01)
+    curveArgs = [(L,) for L in rng.choice(mosDat.lf, max(repeat // 10, 1))]
+    report['gmid_curve'] = timeCalls(lambda L: ge.gmIdCurve(mosDat, L, VDS, 0.0, listVGS, pltVstar, pltGmId), curveArgs)
+    # Des-L and Ref-L of all the corners as the GUI builds them on Plot
+    report['gmid_curves'] = timeCalls(lambda L: ge.gmIdCurves([mosDat] * BENCH_CORNERS, [L, midL], VDS, 0.0, listVGS, pltVstar, pltGmId),
+                                      curveArgs, 2 * BENCH_CORNERS)
+    # The design curves of the GUI at a new bias, the three axes of all the outputs
+    biasArgs = [(L, VDS * rng.uniform(0.5, 1.5)) for L in rng.choice(mosDat.lf, max(repeat // 10, 1))]
+    report['bias_curves'] = timeCalls(lambda L, biasVDS: [curveSpline[axis](pltX) for curveSpline in ge.biasCurves(mosDat, L, biasVDS, 0.0, listVGS)[1:]
+                                                          for axis, pltX in [('Vstar', pltVstar), ('GmId', pltGmId)]], biasArgs)
+    # Av and Ft of the six inversion levels against every L of all the corners
+    report['gate_l_curves'] = timeCalls(lambda: ge.gateLCurves([mosDat] * BENCH_CORNERS, mosDat.lf, VDS, 0.0, const.GMIDL),
+                                        [()] * max(repeat // 10, 1), BENCH_CORNERS * len(const.GMIDL) * mosDat.lf.size)
+    # Interpolated against the model at random points
+    L, VGS, VDS, VSB = randomBias(mosDat, rng, batch)
+    lookupRes = lp.lookupMany(mosDat, ['ID', 'GMOVERID'], L=L, VGS=VGS, VDS=VDS, VSB=VSB)
+    modelRes = ekvModel(-VSB, VDS, VGS, L)
+    onDev = modelRes['ID'] > 1e-3 * np.max(modelRes['ID'])
+    report['check'] = {
+        'points' : int(batch),
+        'id_max_rel_err' : float(np.max(np.abs(lookupRes['ID'] - modelRes['ID'])[onDev] / modelRes['ID'][onDev])),
+        'gmid_max_abs_err' : float(np.max(np.abs(lookupRes['GMOVERID'] - modelRes['GMOVERID'])))}
+    GmId = np.array([args[0] for args in searchArgs])
+    vgsRes, state = ge.searchVGS(mosDat, 'GMOVERID', GmId, midL, 0.5 * float(np.max(mosDat.vdsf)), 0.0)
+    modelGmId = ekvModel(0.0, 0.5 * float(np.max(mosDat.vdsf)), vgsRes, midL)['GMOVERID']
+    report['check']['search_gmid_max_abs_err'] = float(np.max(np.abs(modelGmId - GmId)[state == 1]))
+    return report
+
+# Part 4 Command Line
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the lookups and sizing flows on synthetic EKV tables')
+    parser.add_argument('-o', '--output', help='JSON report, stdout if not given')
+    parser.add_argument('--nl', type=int, default=10, help='points of L')
+    parser.add_argument('--step', type=float, default=0.025, help='step of VGS and VDS in V')
+    parser.add_argument('--nvsb', type=int, default=4, help='points of VSB')
+    parser.add_argument('-r', '--repeat', type=int, default=200, help='calls of each single point benchmark')
+    parser.add_argument('-b', '--batch', type=int, default=10000, help='points of each batched lookup')
+    parser.add_argument('--cache', action='store_true', help='keep the lookupCache and curveCache on, repeated points are then served from them')
+    parser.add_argument('--keep', help='write the table into this folder and keep it')
+    parser.add_argument('--profile', action='store_true', help='add the stats of the profiled functions, they add their own overhead')
+    args = parser.parse_args(argv)
+    gp.profiler.enable(args.profile)
+    if not args.cache:
+        lp.lookupCache.maxSize = 0
+        ge.curveCache.maxSize = 0
+    tableDir = args.keep if args.keep else tempfile.mkdtemp(prefix='gmIdBench')
+    try:
+        os.makedirs(tableDir, exist_ok=True)
+        matFilePath = writeTable(os.path.join(tableDir, 'bench-nch-tt.mat'), nL=args.nl, step=args.step, nVSB=args.nvsb)
+        report = {
+            'table' : {'nL' : args.nl, 'step' : args.step, 'nVSB' : args.nvsb, 'bytes' : os.path.getsize(matFilePath)},
+            'python' : platform.python_version(),
+            'numpy' : np.__version__,
+            'cache' : args.cache}
+        report.update(runBench(matFilePath, args.repeat, args.batch))
+        if args.profile:
+            report['profile'] = gp.profiler.stats()
+    finally:
+        if not args.keep:
+            shutil.rmtree(tableDir, ignore_errors=True)
+    reportText = json.dumps(report, indent=1)
+    if args.output is None:
+        print (reportText)
+    else:
+        with open(args.output, 'w') as outFile:
+            outFile.write(reportText + '\n')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,28 @@
+# Fixtures of the tests : small synthetic tables of benchGmId in the layout of the mat files,
+# so the lookups can be checked without a PDK
+
+import pytest
+# import library for mos lookup and sizing
+import LupMos as lp
+import GmIdEngine as ge
+import benchGmId as bg
+
+# Coarse grid so that the brute force references stay fast
+TEST_STEP = 0.05
+TEST_NL = 6
+
+@pytest.fixture(scope='module')
+def matFiles(tmp_path_factory):
+    '''A typical and a slower corner on the same grid'''
+    tableDir = tmp_path_factory.mktemp('tables')
+    return [bg.writeTable(str(tableDir / ('test-nch-%s.mat' % corner)), nL=TEST_NL, step=TEST_STEP, corner=corner, dVth=dVth)
+            for corner, dVth in [('tt', 0.0), ('ss', 0.03)]]
+
+@pytest.fixture(scope='module')
+def mosTabs(matFiles):
+    return [lp.loadTable(matFile, withGmId=True) for matFile in matFiles]
+
+@pytest.fixture(autouse=True)
+def freshCaches():
+    lp.lookupCache.clear()
+    ge.curveCache.clear()
@@ -1,4 +1,10 @@
 UNIT_PREFIX = '012yzafpnum kMGTPEZY'
+# Index of the prefix of 1 in UNIT_PREFIX
+UNIT_OFFSET = UNIT_PREFIX.index(' ')
+# Mouse readout : updates per second at most
+HOVER_RATE = 60
+# Corner slots of the plots, in the order of their checkboxes, pens and 'Des Corner' entries
+CORNERS = ['tt', 'ff', 'ss', 'fs', 'sf']
 # Vstar Setting
 COLORW0 = (0,255,0)
 SYMW0 = 'o'
@@ -36,3 +42,11 @@ SYMS1 = 'h'
 NAMES1 = '400mV'
 VSTARLS1 = 0.4
 GMIDLS1 = 5.0
+
+# Inversion levels of the L curves, in the order W0, W1, M0, M1, S0, S1
+GMIDL = [GMIDLW0, GMIDLW1, GMIDLM0, GMIDLM1, GMIDLS0, GMIDLS1]
+COLORL = [COLORW0, COLORW1, COLORM0, COLORM1, COLORS0, COLORS1]
+SYML = [SYMW0, SYMW1, SYMM0, SYMM1, SYMS0, SYMS1]
+NAMEL = [NAMEW0, NAMEW1, NAMEM0, NAMEM1, NAMES0, NAMES1]
+# Region of each level : 0-WI, 1-MI, 2-SI
+INVL = [0, 0, 1, 1, 2, 2]
@@ -347,6 +347,18 @@ class Ui_GmIdMainWindow(object):
         self.horizontalLayout_53.setStretch(1, 1)
         self.horizontalLayout_53.setStretch(3, 1)
         self.verticalLayout_9.addLayout(self.horizontalLayout_53)
+        self.horizontalLayout_92 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_92.setObjectName("horizontalLayout_92")
+        self.checkBoxLWI = QtWidgets.QCheckBox(self.tabGateL)
+        self.checkBoxLWI.setObjectName("checkBoxLWI")
+        self.horizontalLayout_92.addWidget(self.checkBoxLWI)
+        self.checkBoxLMI = QtWidgets.QCheckBox(self.tabGateL)
+        self.checkBoxLMI.setObjectName("checkBoxLMI")
+        self.horizontalLayout_92.addWidget(self.checkBoxLMI)
+        self.checkBoxLSI = QtWidgets.QCheckBox(self.tabGateL)
+        self.checkBoxLSI.setObjectName("checkBoxLSI")
+        self.horizontalLayout_92.addWidget(self.checkBoxLSI)
+        self.verticalLayout_9.addLayout(self.horizontalLayout_92)
         self.verticalLayout_9.setStretch(0, 10)
         self.verticalLayout_9.setStretch(1, 10)
         self.gridLayout_5.addLayout(self.verticalLayout_9, 0, 0, 1, 1)
@@ -395,6 +407,50 @@ class Ui_GmIdMainWindow(object):
         self.verticalLayout_12.setStretch(1, 15)
         self.gridLayout_6.addLayout(self.verticalLayout_12, 0, 0, 1, 1)
         self.tabWidgetPlots.addTab(self.tabOpt, "")
+        self.tabPareto = QtWidgets.QWidget()
+        self.tabPareto.setObjectName("tabPareto")
+        self.gridLayout_12 = QtWidgets.QGridLayout(self.tabPareto)
+        self.gridLayout_12.setObjectName("gridLayout_12")
+        self.verticalLayout_20 = QtWidgets.QVBoxLayout()
+        self.verticalLayout_20.setObjectName("verticalLayout_20")
+        self.horizontalLayout_90 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_90.setObjectName("horizontalLayout_90")
+        spacerItem40 = QtWidgets.QSpacerItem(2, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_90.addItem(spacerItem40)
+        self.topLPlotPareto = PlotWidget(self.tabPareto)
+        self.topLPlotPareto.setObjectName("topLPlotPareto")
+        self.horizontalLayout_90.addWidget(self.topLPlotPareto)
+        spacerItem41 = QtWidgets.QSpacerItem(2, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_90.addItem(spacerItem41)
+        self.topRPlotPareto = PlotWidget(self.tabPareto)
+        self.topRPlotPareto.setObjectName("topRPlotPareto")
+        self.horizontalLayout_90.addWidget(self.topRPlotPareto)
+        spacerItem42 = QtWidgets.QSpacerItem(2, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_90.addItem(spacerItem42)
+        self.horizontalLayout_90.setStretch(1, 1)
+        self.horizontalLayout_90.setStretch(3, 1)
+        self.verticalLayout_20.addLayout(self.horizontalLayout_90)
+        self.horizontalLayout_91 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_91.setObjectName("horizontalLayout_91")
+        spacerItem43 = QtWidgets.QSpacerItem(2, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_91.addItem(spacerItem43)
+        self.botLPlotPareto = PlotWidget(self.tabPareto)
+        self.botLPlotPareto.setObjectName("botLPlotPareto")
+        self.horizontalLayout_91.addWidget(self.botLPlotPareto)
+        spacerItem44 = QtWidgets.QSpacerItem(2, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_91.addItem(spacerItem44)
+        self.botRPlotPareto = PlotWidget(self.tabPareto)
+        self.botRPlotPareto.setObjectName("botRPlotPareto")
+        self.horizontalLayout_91.addWidget(self.botRPlotPareto)
+        spacerItem45 = QtWidgets.QSpacerItem(2, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_91.addItem(spacerItem45)
+        self.horizontalLayout_91.setStretch(1, 1)
+        self.horizontalLayout_91.setStretch(3, 1)
+        self.verticalLayout_20.addLayout(self.horizontalLayout_91)
+        self.verticalLayout_20.setStretch(0, 15)
+        self.verticalLayout_20.setStretch(1, 15)
+        self.gridLayout_12.addLayout(self.verticalLayout_20, 0, 0, 1, 1)
+        self.tabWidgetPlots.addTab(self.tabPareto, "")
         self.tabDev = QtWidgets.QWidget()
         self.tabDev.setObjectName("tabDev")
         self.tabWidgetPlots.addTab(self.tabDev, "")
@@ -942,8 +998,22 @@ class Ui_GmIdMainWindow(object):
         self.horizontalLayout_79.addLayout(self.horizontalLayout_76)
         self.horizontalLayout_85 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_85.setObjectName("horizontalLayout_85")
-        spacerItem38 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
-        self.horizontalLayout_85.addItem(spacerItem38)
+        self.checkBoxSynWorst = QtWidgets.QCheckBox(self.tabSyn)
+        font = QtGui.QFont()
+        font.setBold(True)
+        font.setWeight(75)
+        self.checkBoxSynWorst.setFont(font)
+        self.checkBoxSynWorst.setObjectName("checkBoxSynWorst")
+        self.horizontalLayout_85.addWidget(self.checkBoxSynWorst)
+        self.checkBoxSynResize = QtWidgets.QCheckBox(self.tabSyn)
+        font = QtGui.QFont()
+        font.setBold(True)
+        font.setWeight(75)
+        self.checkBoxSynResize.setFont(font)
+        self.checkBoxSynResize.setObjectName("checkBoxSynResize")
+        self.horizontalLayout_85.addWidget(self.checkBoxSynResize)
+        self.horizontalLayout_85.setStretch(0, 1)
+        self.horizontalLayout_85.setStretch(1, 1)
         self.horizontalLayout_79.addLayout(self.horizontalLayout_85)
         self.horizontalLayout_79.setStretch(0, 1)
         self.horizontalLayout_79.setStretch(1, 1)
@@ -1224,11 +1294,18 @@ class Ui_GmIdMainWindow(object):
 "}")
         self.pushButtonOptSize.setObjectName("pushButtonOptSize")
         self.horizontalLayout_28.addWidget(self.pushButtonOptSize)
+        self.pushButtonOptDesign = QtWidgets.QPushButton(self.groupBoxMosCheck)
+        self.pushButtonOptDesign.setStyleSheet("*{\n"
+"color: rgb(255, 128, 0);\n"
+"}")
+        self.pushButtonOptDesign.setObjectName("pushButtonOptDesign")
+        self.horizontalLayout_28.addWidget(self.pushButtonOptDesign)
         self.horizontalLayout_28.setStretch(0, 1)
         self.horizontalLayout_28.setStretch(1, 1)
         self.horizontalLayout_28.setStretch(2, 1)
         self.horizontalLayout_28.setStretch(3, 1)
         self.horizontalLayout_28.setStretch(4, 1)
+        self.horizontalLayout_28.setStretch(5, 1)
         self.verticalLayout_17.addLayout(self.horizontalLayout_28)
         self.verticalLayout_5 = QtWidgets.QVBoxLayout()
         self.verticalLayout_5.setObjectName("verticalLayout_5")
@@ -1524,8 +1601,12 @@ class Ui_GmIdMainWindow(object):
         self.tabWidgetPlots.setTabText(self.tabWidgetPlots.indexOf(self.tabId), _translate("GmIdMainWindow", "Id"))
         self.tabWidgetPlots.setTabText(self.tabWidgetPlots.indexOf(self.tabVgs), _translate("GmIdMainWindow", "Vgs"))
         self.tabWidgetPlots.setTabText(self.tabWidgetPlots.indexOf(self.tabGmId), _translate("GmIdMainWindow", "GmId"))
+        self.checkBoxLWI.setText(_translate("GmIdMainWindow", "WI"))
+        self.checkBoxLMI.setText(_translate("GmIdMainWindow", "MI"))
+        self.checkBoxLSI.setText(_translate("GmIdMainWindow", "SI"))
         self.tabWidgetPlots.setTabText(self.tabWidgetPlots.indexOf(self.tabGateL), _translate("GmIdMainWindow", "OptOp"))
         self.tabWidgetPlots.setTabText(self.tabWidgetPlots.indexOf(self.tabOpt), _translate("GmIdMainWindow", "OptW"))
+        self.tabWidgetPlots.setTabText(self.tabWidgetPlots.indexOf(self.tabPareto), _translate("GmIdMainWindow", "Pareto"))
         self.tabWidgetPlots.setTabText(self.tabWidgetPlots.indexOf(self.tabDev), _translate("GmIdMainWindow", "Dev"))
         self.titleVgs.setText(_translate("GmIdMainWindow", "Vgs :"))
         self.labelVgs.setText(_translate("GmIdMainWindow", "0.75"))
@@ -1564,6 +1645,8 @@ class Ui_GmIdMainWindow(object):
         self.checkBoxSynGm.setText(_translate("GmIdMainWindow", "Gm(uS)"))
         self.lineEditSynGm.setText(_translate("GmIdMainWindow", "150"))
         self.checkBoxSynId.setText(_translate("GmIdMainWindow", "Id (uA)"))
+        self.checkBoxSynWorst.setText(_translate("GmIdMainWindow", "Worst"))
+        self.checkBoxSynResize.setText(_translate("GmIdMainWindow", "Resize"))
         self.lineEditSynId.setText(_translate("GmIdMainWindow", "15"))
         self.titleSynWidth.setText(_translate("GmIdMainWindow", "Wtot :"))
         self.labelSynW.setText(_translate("GmIdMainWindow", "10 um"))
@@ -1604,6 +1687,7 @@ class Ui_GmIdMainWindow(object):
         self.pushButtonFuEst.setText(_translate("GmIdMainWindow", "Est"))
         self.pushButtonOptOp.setText(_translate("GmIdMainWindow", "Oppt"))
         self.pushButtonOptSize.setText(_translate("GmIdMainWindow", "Size"))
+        self.pushButtonOptDesign.setText(_translate("GmIdMainWindow", "Pareto"))
         self.titleSynCload.setText(_translate("GmIdMainWindow", "Cload(fF):"))
         self.lineEditSynCload.setText(_translate("GmIdMainWindow", "50"))
         self.titleChkVdsat.setText(_translate("GmIdMainWindow", "Vdsat :"))
@@ -0,0 +1,120 @@
+# Part 0 Introduction
+# gmIdSizingBatch
+# Size a list of MOS transistors from a CSV/JSON spec file without the GUI
+# Usage : python runGmIdBatch.py spec.csv -o sized.csv -j 8
+#
+# Every row of the spec needs the columns
+#   file : .mat file of the device, relative to the spec file
+#   L    : gate length in the unit of the .mat file
+#   gmid or vstar : GmOverId in S/A or Vstar in V
+#   gm or id      : Gm in S or Id in A
+#   vds, vsb      : bias in V, vsb is entered as in the 'Vbs' box of the GUI
+#   mult, fin     : multiplier and number of fingers (optional, default 1)
+
+# Part 1 Libraries
+import argparse
+import csv
+import json
+import os
+import sys
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+# import library for mos sizing
+import GmIdEngine as ge
+
+# Columns written for every sized transistor
+OUT_COLS = ['W', 'WFin', 'VGS', 'Cgg', 'Ft', 'Rout', 'Av', 'Vth', 'Vdsat', 'State']
+
+# MOS tables loaded in this process, each .mat file is only opened once per worker
+tableCache = {}
+
+# Part 2 Sizing
+def getTable(matFilePath, withGmId=False):
+    '''Load the table once per process'''
+    if matFilePath not in tableCache:
+        tableCache[matFilePath] = ge.loadTable(matFilePath, withGmId=withGmId)
+    return tableCache[matFilePath]
+
+def rowValue(row, key, default=None):
+    '''Float value of the column or the default for an empty cell'''
+    value = row.get(key)
+    if value is None or value == '':
+        return default
+    return float(value)
+
+def sizeRow(row, specDir='', withGmId=False):
+    '''Run the Syn and Chk math of the GUI on one spec row'''
+    result = dict(row)
+    try:
+        mosDat = getTable(os.path.join(specDir, row['file']), withGmId)
+        gmId = rowValue(row, 'gmid')
+        if gmId is None:
+            gmId = 2.0 / rowValue(row, 'vstar')
+        synRes = ge.synMos(mosDat, rowValue(row, 'L'), rowValue(row, 'vds'), -rowValue(row, 'vsb', 0.0), gmId,
+                           Gm=rowValue(row, 'gm'), Id=rowValue(row, 'id'),
+                           multi=int(rowValue(row, 'mult', 1)), fin=int(rowValue(row, 'fin', 1)))
+        for col in OUT_COLS:
+            result[col] = float(synRes[col])
+        result['State'] = int(synRes['State'])
+        result['Error'] = ''
+    except (KeyError, TypeError, ValueError, OSError) as err:
+        for col in OUT_COLS:
+            result[col] = ''
+        result['Error'] = '%s: %s' % (type(err).__name__, err)
+    return result
+
+# Part 3 Spec Files
+def readSpec(specPath):
+    '''Read the rows of a CSV or JSON spec'''
+    with open(specPath, 'r') as specFile:
+        if specPath.lower().endswith('.json'):
+            return json.load(specFile)
+        return list(csv.DictReader(specFile))
+
+def writeResult(rows, outPath):
+    '''Write the sized rows as CSV, or JSON for a .json output'''
+    if outPath is not None and outPath.lower().endswith('.json'):
+        with open(outPath, 'w') as outFile:
+            json.dump(rows, outFile, indent=1)
+        return
+    colNames = []
+    for row in rows:
+        colNames += [key for key in row.keys() if key not in colNames]
+    outFile = sys.stdout if outPath is None else open(outPath, 'w', newline='')
+    writer = csv.DictWriter(outFile, fieldnames=colNames)
+    writer.writeheader()
+    writer.writerows(rows)
+    if outFile is not sys.stdout:
+        outFile.close()
+
+# Part 4 Batch Excute
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Size MOS transistors from a CSV/JSON spec with the Gm/Id method')
+    parser.add_argument('spec', help='CSV or JSON spec file')
+    parser.add_argument('-o', '--output', default=None, help='CSV or JSON result file, CSV to stdout if not given')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help='number of worker processes')
+    parser.add_argument('-g', '--gmid-table', action='store_true', help='look VGS up in the GmOverId resampled tables')
+    args = parser.parse_args(argv)
+    rows = readSpec(args.spec)
+    # The device files are relative to the spec file
+    sizeSpecRow = partial(sizeRow, specDir=os.path.dirname(os.path.abspath(args.spec)), withGmId=args.gmid_table)
+    # Keep the rows of one device together so each worker only needs few tables,
+    # a row without a file is left to sizeRow to report
+    order = sorted(range(len(rows)), key=lambda i: rows[i].get('file') or '')
+    sizedRows = [None] * len(rows)
+    if args.jobs <= 1:
+        for i in order:
+            sizedRows[i] = sizeSpecRow(rows[i])
+    else:
+        chunkSize = max(1, len(rows) // (4 * args.jobs))
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            for i, sizedRow in zip(order, pool.map(sizeSpecRow, [rows[i] for i in order], chunksize=chunkSize)):
+                sizedRows[i] = sizedRow
+    writeResult(sizedRows, args.output)
+    failed = sum(1 for row in sizedRows if row['Error'])
+    if failed:
+        print('%d of %d rows failed' % (failed, len(rows)), file=sys.stderr)
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -29,11 +29,52 @@ import datetime
 import h5py
 # import library for interpn data
 from scipy.interpolate import interpn
-from scipy.interpolate import CubicSpline
 # import library for mos lookup
 import LupMos as lp
+# import library for mos sizing
+import GmIdEngine as ge
+import MosDataset as md
+# import library for profiling
+import GmIdProfile as gp
+# import library for background jobs
+from GmIdWorker import JobRunner, loadCorner, cornerCurveJob, optOpJob, optSizeJob, optDesignJob, tradeFrontJob
+from functools import partial
 import const
-import decimal
+import math
+
+# 1/scale of every prefix of UNIT_PREFIX
+ENG_SCALE = [1000.0 ** (const.UNIT_OFFSET - scaleIndex) for scaleIndex in range(len(const.UNIT_PREFIX))]
+
+def engPrint(rawNum, unit):
+    '''The rawNum with 3 decimals and the prefix of UNIT_PREFIX that keeps it below 1000'''
+    rawNum = float(rawNum)
+    scaleIndex = const.UNIT_OFFSET
+    if rawNum != 0.0 and math.isfinite(rawNum):
+        scaleIndex = min(max(int(math.floor(math.log10(abs(rawNum)) / 3.0)) + const.UNIT_OFFSET, 0), len(const.UNIT_PREFIX) - 1)
+        # Rounded up to 1000 : next prefix
+        if abs(round(rawNum * ENG_SCALE[scaleIndex], 3)) >= 1000.0 and scaleIndex < len(const.UNIT_PREFIX) - 1:
+            scaleIndex += 1
+    return '%.3f %s%s' % (rawNum * ENG_SCALE[scaleIndex], const.UNIT_PREFIX[scaleIndex], unit)
+
+def cornerSlots(corners, tgtName):
+    '''Corner names of the const.CORNERS slots, '--' for a slot without corner
+
+    The usual corners keep their slot and the others take the free slots, the tgtName first.
+    The corners left without a slot are reported and not loaded.
+    '''
+    slotNames = ['--'] * len(const.CORNERS)
+    otherNames = []
+    for cornerName in sorted(corners, key=lambda cornerName: cornerName != tgtName):
+        if cornerName.lower() in const.CORNERS and slotNames[const.CORNERS.index(cornerName.lower())] == '--':
+            slotNames[const.CORNERS.index(cornerName.lower())] = cornerName
+        else:
+            otherNames.append(cornerName)
+    for cornerName in otherNames:
+        if '--' in slotNames:
+            slotNames[slotNames.index('--')] = cornerName
+        else:
+            print ('%s corner Skipped : no free corner slot' % cornerName)
+    return slotNames
 
 # Part 2 GUI Class
 class gmIdGUIWindow(QtWidgets.QMainWindow):
@@ -49,10 +90,15 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
         self.configDataLib()
         # Threading
         self.threadpool = QThreadPool()
+        self.jobRunner = JobRunner(self.threadpool)
         # Connect buttons and checkBoxes
         self.configBondKeys()
         # Set the plot
         self.configPlot()
+        # Progress and Cancel of the background jobs
+        self.configJobs()
+        # Profiling of the lookups and handlers
+        self.configProfile()
         # Initialize the checkbox
         self.configDefault()
 
@@ -66,6 +112,9 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
         self.ui.checkBoxCornerFS.stateChanged.connect(self.PlotCornerFS)
         self.ui.checkBoxCornerSF.stateChanged.connect(self.PlotCornerSF)
         self.ui.checkBoxRef.stateChanged.connect(self.PlotRef)
+        self.ui.checkBoxLWI.stateChanged.connect(self.PlotLWI)
+        self.ui.checkBoxLMI.stateChanged.connect(self.PlotLMI)
+        self.ui.checkBoxLSI.stateChanged.connect(self.PlotLSI)
         ## checkBox for Syn Mos Setting
         self.ui.checkBoxSynGmId.stateChanged.connect(self.SynGmId)
         self.ui.checkBoxSynVstar.stateChanged.connect(self.SynVstar)
@@ -92,8 +141,14 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
         self.ui.pushButtonCal.clicked.connect(self.CalMos)
         self.ui.pushButtonOptOp.clicked.connect(self.OptOpMos)
         self.ui.pushButtonOptSize.clicked.connect(self.OptSizeMos)
+        self.ui.pushButtonOptDesign.clicked.connect(self.OptDesign)
+        #tabWidget.currentChanged.connect()
+        self.ui.tabWidgetPlots.currentChanged.connect(self.PlotTabChanged)
         #comboBox.currentIndexChanged.connect()
         self.ui.comboBoxDesignCorner.currentIndexChanged.connect(self.changeCorner)
+        #spinBox.valueChanged.connect()
+        self.ui.spinBoxBiasVds.valueChanged.connect(self.BiasLive)
+        self.ui.spinBoxBiasVbs.valueChanged.connect(self.BiasLive)
 
     def configPlot(self):
         # vstar as x axis
@@ -203,6 +258,35 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
         self.ui.botRPlotOpt.plotItem.setLabel('bottom', 'L', units = 'nm')
         self.ui.botRPlotOpt.plotItem.setTitle('Fig.4 Cdd vs L')
         self.ui.botRPlotOpt.plotItem.setLabel('left','Cdd', units = 'F')
+        # Id as x axis for the Pareto front
+        self.ui.topLPlotPareto.plotItem.showGrid(True, True, 0.7)
+        self.ui.topLPlotPareto.plotItem.setTitle('Fig.1 W*L vs Id')
+        self.ui.topLPlotPareto.plotItem.setLabel('bottom', 'Id', units = 'A')
+        self.ui.topLPlotPareto.plotItem.setLabel('left', 'W*L (um^2)')
+        self.ui.topLPlotPareto.plotItem.setLogMode(True, True)
+        self.ui.topRPlotPareto.plotItem.showGrid(True, True, 0.7)
+        self.ui.topRPlotPareto.plotItem.setTitle('Fig.2 Ft vs Id')
+        self.ui.topRPlotPareto.plotItem.setLabel('bottom', 'Id', units = 'A')
+        self.ui.topRPlotPareto.plotItem.setLabel('left', 'Ft', units = 'Hz')
+        self.ui.topRPlotPareto.plotItem.setLogMode(True, True)
+        self.ui.botLPlotPareto.plotItem.showGrid(True, True, 0.7)
+        self.ui.botLPlotPareto.plotItem.setTitle('Fig.3 Cgg vs Id')
+        self.ui.botLPlotPareto.plotItem.setLabel('bottom', 'Id', units = 'A')
+        self.ui.botLPlotPareto.plotItem.setLabel('left', 'Cgg', units = 'F')
+        self.ui.botLPlotPareto.plotItem.setLogMode(True, True)
+        self.ui.botRPlotPareto.plotItem.showGrid(True, True, 0.7)
+        self.ui.botRPlotPareto.plotItem.setTitle('Fig.4 GmId vs L')
+        self.ui.botRPlotPareto.plotItem.setLabel('bottom', 'L', units = 'nm')
+        self.ui.botRPlotPareto.plotItem.setLabel('left', 'GmId', units = '1/V')
+        # Front points and the hovered one on each plot
+        self.frontPlots = [self.ui.topLPlotPareto, self.ui.topRPlotPareto, self.ui.botLPlotPareto, self.ui.botRPlotPareto]
+        self.curveFront = []
+        self.markFront = []
+        for frontPlot in self.frontPlots:
+            self.curveFront.append(pg.PlotDataItem([], [], pen = None, symbol = 'o', symbolSize = 6, symbolBrush = (255,0,0), symbolPen = 'w'))
+            self.markFront.append(pg.PlotDataItem([], [], pen = None, symbol = 'o', symbolSize = 12, symbolBrush = None, symbolPen = pg.mkPen('g', width = 2)))
+            frontPlot.addItem(self.curveFront[-1])
+            frontPlot.addItem(self.markFront[-1], ignoreBounds=True)
         # Pen & Line & Legend
         self.legTLPlotL = pg.LegendItem()
         self.legTLPlotL.setParentItem(self.ui.topLPlotL.plotItem.graphicsItem())
@@ -253,11 +337,34 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
         self.ui.topRPlotL.addItem(self.topRVLineL, ignoreBounds=True)
         self.ui.botLPlotL.addItem(self.botLVLineL, ignoreBounds=True)
         self.ui.botRPlotL.addItem(self.botRVLineL, ignoreBounds=True)
-        self.ui.topLPlotVstar.scene().sigMouseMoved.connect(self.topMouseMovedVstar)
-        self.ui.topLPlotGmId.scene().sigMouseMoved.connect(self.topMouseMovedGmId)
-        self.ui.topLPlotId.scene().sigMouseMoved.connect(self.topMouseMovedId)
-        self.ui.topLPlotVgs.scene().sigMouseMoved.connect(self.topMouseMovedVgs)
-        self.ui.topLPlotL.scene().sigMouseMoved.connect(self.topMouseMovedL)
+        # The mouse moves are merged to HOVER_RATE readouts per second, the slots get the last position as (pos,)
+        hoverSlots = [(self.ui.topLPlotVstar, self.topMouseMovedVstar), (self.ui.topLPlotGmId, self.topMouseMovedGmId),
+                      (self.ui.topLPlotId, self.topMouseMovedId), (self.ui.topLPlotVgs, self.topMouseMovedVgs),
+                      (self.ui.topLPlotL, self.topMouseMovedL)]
+        hoverSlots += [(frontPlot, partial(self.mouseMovedPareto, plotIndex)) for plotIndex, frontPlot in enumerate(self.frontPlots)]
+        self.hoverProxy = [pg.SignalProxy(hoverPlot.scene().sigMouseMoved, rateLimit = const.HOVER_RATE, slot = hoverSlot)
+                           for hoverPlot, hoverSlot in hoverSlots]
+
+    def configJobs(self):
+        '''Progress bar and Cancel button of the background jobs in the status bar'''
+        self.progressBarJob = QtWidgets.QProgressBar()
+        self.progressBarJob.setMaximumWidth(200)
+        self.progressBarJob.setFormat('%v/%m')
+        self.pushButtonCancel = QtWidgets.QPushButton('Cancel')
+        self.pushButtonCancel.clicked.connect(self.CancelJob)
+        self.ui.statusbar.addPermanentWidget(self.progressBarJob)
+        self.ui.statusbar.addPermanentWidget(self.pushButtonCancel)
+
+    def configProfile(self):
+        '''Switch and stats of the profiler in the status bar'''
+        self.pushButtonProfile = QtWidgets.QPushButton('Profile')
+        self.pushButtonProfile.setCheckable(True)
+        self.pushButtonProfile.setChecked(gp.profiler.enabled)
+        self.pushButtonProfile.toggled.connect(self.ProfileSwitch)
+        self.pushButtonStats = QtWidgets.QPushButton('Stats')
+        self.pushButtonStats.clicked.connect(self.ProfileStats)
+        self.ui.statusbar.addPermanentWidget(self.pushButtonProfile)
+        self.ui.statusbar.addPermanentWidget(self.pushButtonStats)
 
     def configDataLib(self):
         # MOS Transistor
@@ -313,14 +420,26 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
         self.optPltCdd = []
         self.optPltVth = []
         self.optPltVdsat = []
+        # VDS of the operation points, the bias for Oppt and per point for Pareto
+        self.optPltVds = []
         # Process
         self.tgtCorner = 0
-        #avaiable corner: TT, FF, SS, FS, SF
-        self.listCorner =["tt","ff","ss","fs","sf"]
+        # Corner of every slot, taken from the dataset by cornerMat
+        self.listCorner = list(const.CORNERS)
         self.avaCorner = [ 0,  0,  0,  0,  0]
         self.visCorner = [ False, False, False, False, False]
         self.mosCorner = [None, None, None, None, None]
+        # CornerTable of the loaded corners for the worst case Syn
+        self.cornerTab = None
+        self.cornerTabKey = None
+        self.cornerTabList = []
         self.mosDat = None
+        # Loaded tables by file path, kept resident across PlotUpdate
+        self.mosTables = {}
+        # Corner jobs still running in the thread pool
+        self.cornerJobLeft = 0
+        # L, bias and x points of the corner curves, taken by cornerMat
+        self.cornerCurveArgs = None
         # Data
         self.listVGS = []
         self.listL = []
@@ -429,16 +548,11 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
         self.lTgtGmId = 15.0
         self.curveAvDes = None
         self.curveAvDesCorner = [None, None, None, None, None]
-        self.curveAvW1 = None
-        self.curveAvW1Corner = [None, None, None, None, None]
-        self.curveAvS0 = None
-        self.curveAvS0Corner = [None, None, None, None, None]
+        # Av and Ft against L of the inversion levels of const.GMIDL, [level][corner]
+        self.curveAvLCorner = [[None, None, None, None, None] for gmIdL in const.GMIDL]
         self.curveFtDes = None
         self.curveFtDesCorner = [None, None, None, None, None]
-        self.curveFtW1 = None
-        self.curveFtW1Corner = [None, None, None, None, None]
-        self.curveFtS0 = None
-        self.curveFtS0Corner = [None, None, None, None, None]
+        self.curveFtLCorner = [[None, None, None, None, None] for gmIdL in const.GMIDL]
         # Curve for Opt Result of L
         self.curveOptW = None
         self.curveOptCgg = None
@@ -469,17 +583,21 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
         self.desLInd = 0
         self.refLSet = 0
         self.refLInd = 0
-        self.w0LReady = [ 0, 0, 0, 0, 0]
-        self.w1LReady = [ 0, 0, 0, 0, 0]
-        self.m0LReady = [ 0, 0, 0, 0, 0]
-        self.m1LReady = [ 0, 0, 0, 0, 0]
-        self.s0LReady = [ 0, 0, 0, 0, 0]
-        self.s1LReady = [ 0, 0, 0, 0, 0]
+        # L curve of the level found for the corner, [level][corner]
+        self.lReady = [[ 0, 0, 0, 0, 0] for gmIdL in const.GMIDL]
         ## Opt Operation Point : 0-Vstar, 1-Ft, 2-Av
         self.optOpptMode = 0
         self.optOpptReady = 0
         ## Opt Size : 0-Gm, 1-Id, 2-Area
         self.optSizeMode = 0
+        ## Pareto front on the plots
+        self.frontReady = 0
+        # Mouse readout : labels, their units, and the array and index shown
+        self.readLabels = [self.ui.labelId, self.ui.labelGmId, self.ui.labelVstar, self.ui.labelFt,
+                           self.ui.labelVgs, self.ui.labelVdsat, self.ui.labelGain, self.ui.labelFOM]
+        self.readUnits = ['A', '1/V', 'V', 'Hz', 'V', 'V', 'V/V', 'Hz/V']
+        self.readSrc = None
+        self.readIndex = None
 
 
     def configDefault(self):
@@ -557,20 +675,16 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
             self.ui.labelLog.setText('No Data Available')
 
     def PlotLWI(self, state):
-        '''Turn Off WI Curve'''
-        pass
-        #if state == Qt.Checked:
-        #    self.visibleLCurve(0, True)
-        #else:
-        #    self.visibleLCurve(0, False)
+        '''Turn On/Off the WI Curves of the design corner'''
+        self.visibleLCurve()
+
+    def PlotLMI(self, state):
+        '''Turn On/Off the MI Curves of the design corner'''
+        self.visibleLCurve()
 
     def PlotLSI(self, state):
-        '''Turn Off SI Curve'''
-        pass
-        #if state == Qt.Checked:
-        #    self.visibleLCurve(2, True)
-        #else:
-        #    self.visibleLCurve(2, False)
+        '''Turn On/Off the SI Curves of the design corner'''
+        self.visibleLCurve()
 
     def PlotRef(self, state):
         if self.refLSet == 1:
@@ -618,26 +732,35 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
             #self.ui.checkBoxOptId.setCheckState(0)# No optid in GUI Vp1
 
     # pushButton Functions
+    @gp.profiledSlot
     def DirSel(self):
         '''Select the Directory for the Data'''
         self.matDirPath = QFileDialog.getExistingDirectory()
-        self.matDir = QDir(self.matDirPath)
-        self.matDir.setFilter(QtCore.QDir.Files)
-        self.matFileList = self.matDir.entryList()
+        if not self.matDirPath:
+            return
+        # Only new or changed files are opened, the rest comes from the index of the folder
+        self.dataSet = md.MosDataset(self.matDirPath)
+        self.matFileList = self.dataSet.fileNames()
         self.ui.listWidgetMat.clear()
-        for i in range(len(self.matFileList)):
-            if self.matFileList[i][0] == '.':
-                continue
-            self.ui.listWidgetMat.addItem(self.matFileList[i])
-
+        for matFileName in self.matFileList:
+            matInfo = self.dataSet.info(self.matDirPath + '/' + matFileName)
+            self.ui.listWidgetMat.addItem(matFileName)
+            self.ui.listWidgetMat.item(self.ui.listWidgetMat.count() - 1).setToolTip(
+                '%s %s %s %s C\nL : %s um\nW : %g um x %d' % (matInfo['tech'], matInfo['device'], matInfo['corner'], matInfo['temp'],
+                                                         ' '.join('%g' % gateL for gateL in matInfo['L']), matInfo['W'], matInfo['NFING']))
+
+    @gp.profiledSlot
     def MosMatSet(self):
         self.matItem = self.ui.listWidgetMat.currentItem()
         if self.matItem == None:
             self.ui.labelLog.setText('No MOS Data Set')
+        elif self.dataSet.keyOf(self.matDirPath + '/' + self.matItem.text()) is None:
+            self.ui.labelLog.setText('Not a MOS Data Set')
         else:
             self.matFilePath = self.matDirPath + '/' + self.matItem.text()
             self.matFileName = self.matItem.text().split('.')[0]
-            self.matFileInfo = self.matFileName.split('-')
+            # (tech, device, corner, temp) of the dataset
+            self.matFileInfo = self.dataSet.keyOf(self.matFilePath)
             self.mosModel = self.matFileInfo[1]
             self.ui.titleMosCharData.setText(self.matFileName)
             self.ui.labelDevType.setText(self.mosModel)
@@ -687,6 +810,7 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
             self.Lchk = float(self.gateLChkItem.text())
             self.ui.labelGateLChk.setText(self.gateLChkItem.text())
 
+    @gp.profiledSlot
     def PlotUpdate(self):
         if self.desLSet == 0:
             self.ui.labelLog.setText('No Des Gate Length')
@@ -722,21 +846,109 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
             self.visibleAllRef(True)
             self.visibleAllRef(False)
 
+    @gp.profiledSlot
     def CalMos(self):
         self.UpdateBias()
         self.calVGS = float(self.ui.lineEditCalVgs.text())*0.001
         self.calW = float(self.ui.lineEditCalWidth.text())
-        self.calGmId = lp.lookupfz(self.mosDat, self.mosModel, 'GMOVERID', VDS=self.VDS, VSB=self.VSB, L=self.Lchk, VGS=self.calVGS)
-        self.calId = lp.lookupfz(self.mosDat, self.mosModel, 'ID', VDS=self.VDS, VSB=self.VSB, L=self.Lchk, VGS=self.calVGS) * self.calW / self.W
+        calRes = ge.calMos(self.mosDat, self.calW, self.calVGS, L=self.Lchk, VDS=self.VDS, VSB=self.VSB)
+        self.calGmId = calRes['GmId']
+        self.calId = calRes['Id']
         self.ui.labelCalGmId.setText(self.sciPrint(self.calGmId, 'S/A'))
-        self.ui.labelCalVstar.setText(self.sciPrint((2.0/self.calGmId), 'V'))
+        self.ui.labelCalVstar.setText(self.sciPrint(calRes['Vstar'], 'V'))
         self.ui.labelChkId.setText(self.sciPrint(self.calId, 'A'))
-        self.ui.labelChkGm.setText(self.sciPrint(self.calId*self.calGmId, 'S'))
-        self.ChkMos(self.calW, self.calVGS)
+        self.ui.labelChkGm.setText(self.sciPrint(calRes['Gm'], 'S'))
+        self.ChkMos(calRes)
 
+    @gp.profiledSlot
     def OptOpMos(self):
         '''Search the Operation Point for the Target'''
         self.UpdateBias()
+        self.optClear()
+        # GmOverId as Constriant
+        if self.optOpptMode == ge.OPT_VSTAR:
+            optTarget = 0.001*float(self.ui.lineEditOptVstar.text())
+            self.optOpGmId = 2.0/optTarget
+        # Ft as constriant
+        elif self.optOpptMode == ge.OPT_FT:
+            optTarget = 1000000.0*float(self.ui.lineEditOptFt.text())
+            self.optOpFt = optTarget
+        # Avo as constriant
+        elif self.optOpptMode == ge.OPT_AVO:
+            optTarget = float(self.ui.lineEditOptAvo.text())
+            self.optOpAvo = optTarget
+        # Solve the gate lengths in the thread pool, the curves grow with every chunk of L
+        self.optOpptReady = 0
+        self.optPltVds = self.VDS
+        self.jobRunner.cancel('Size')
+        self.jobRunner.start('Opt', optOpJob, self.mosDat, self.optOpptMode, optTarget, self.listLChk, self.VDS, self.VSB,
+                             onPartial=self.optOpPlot, onResult=self.optOpPlot, onProgress=partial(self.jobProgress, 'Opt'),
+                             onError=self.jobFailed)
+
+    @gp.profiledSlot
+    def OptDesign(self):
+        '''Search L, GmOverId and VDS up to the bias VDS for the Gm, Id or Area target with Gm, Ft and Av as constraints'''
+        self.UpdateBias()
+        self.optClear()
+        designGm = float(self.ui.lineEditOptGm.text())*0.000001
+        designFt = 1000000.0*float(self.ui.lineEditOptFt.text())
+        designAvo = float(self.ui.lineEditOptAvo.text())
+        if self.optSizeMode == ge.SIZE_ID:
+            designTarget = float(self.ui.lineEditOptId.text())*0.000001
+        elif self.optSizeMode == ge.SIZE_AREA:
+            designTarget = float(self.ui.lineEditOptArea.text())
+        else:
+            designTarget = designGm
+        self.optOpptReady = 0
+        self.jobRunner.cancel('Size')
+        self.jobRunner.start('Opt', optDesignJob, self.mosDat, self.optSizeMode, designTarget, self.VSB, designGm, designFt, designAvo,
+                             self.VDS, self.listLChk, onResult=self.optDesignPlot, onError=self.jobFailed)
+        if self.ui.tabWidgetPlots.currentWidget() is self.ui.tabPareto:
+            self.FrontUpdate()
+
+    @gp.profiledSlot
+    def optDesignPlot(self, designRes):
+        '''Plot the Pareto set of the design search against L on the Opt plots'''
+        self.ui.labelLog.setText('Pareto %d of %d/%d' % (len(designRes['L']), designRes['Feasible'], designRes['Candidates']))
+        order = np.lexsort((designRes['Id'], designRes['L']))
+        designRes = dict((key, designRes[key][order]) for key in designRes if np.ndim(designRes[key]) == 1)
+        self.optOpPlot(designRes)
+        if self.optOpptReady == 1:
+            self.optPltVds = designRes['VDS']
+            self.optSizePlot(designRes)
+
+    @gp.profiledSlot
+    def PlotTabChanged(self, tabIndex):
+        '''Search the front when the Pareto tab is shown'''
+        if self.ui.tabWidgetPlots.widget(tabIndex) is self.ui.tabPareto:
+            self.FrontUpdate()
+
+    @gp.profiled
+    def FrontUpdate(self):
+        '''Search the non-dominated (L, GmOverId) points of the design corner at the bias for the Gm'''
+        if self.mosDat is None:
+            return
+        self.UpdateBias()
+        frontGm = float(self.ui.lineEditOptGm.text())*0.000001
+        self.jobRunner.start('Front', tradeFrontJob, self.mosDat, ge.SIZE_GM, frontGm, self.VDS, self.VSB, self.listLChk,
+                             onResult=self.frontPlot, onError=self.jobFailed)
+
+    @gp.profiledSlot
+    def frontPlot(self, frontRes):
+        '''Plot the front on the Pareto plots'''
+        self.ui.labelLog.setText('Front %d of %d/%d' % (len(frontRes['L']), frontRes['Feasible'], frontRes['Candidates']))
+        self.frontRes = frontRes
+        self.pltFront = [(frontRes['Id'], frontRes['Area']), (frontRes['Id'], frontRes['Ft']), (frontRes['Id'], frontRes['Cgg']),
+                    (1000*frontRes['L'], frontRes['GmId'])]
+        # Points in the view coordinates of the plots for the hover
+        self.frontView = [(np.log10(frontX), np.log10(frontY)) for frontX, frontY in self.pltFront[:3]] + self.pltFront[3:]
+        for curve, mark, (frontX, frontY) in zip(self.curveFront, self.markFront, self.pltFront):
+            curve.setData(frontX, frontY)
+            mark.setData([], [])
+        self.frontReady = 1 if len(frontRes['L']) != 0 else 0
+
+    def optClear(self):
+        '''Clear the L and Opt plots for a new Opt'''
         self.ui.topLPlotOpt.clear()
         self.ui.topRPlotOpt.clear()
         self.ui.botLPlotOpt.clear()
@@ -749,60 +961,34 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
         self.ui.topRPlotL.addItem(self.topRVLineL, ignoreBounds=True)
         self.ui.botLPlotL.addItem(self.botLVLineL, ignoreBounds=True)
         self.ui.botRPlotL.addItem(self.botRVLineL, ignoreBounds=True)
-        self.optPltL = []
-        self.optPltFt = []
-        self.optPltAvo = []
-        self.optPltGmId = []
-        self.optPltVgs = []
-        self.optPltVth = []
-        self.optPltVdsat = []
-        self.optPltVstar = []
+        self.addLCurve()
         if self.optOpptReady == 1:
             self.legTLPlotL.removeItem('Vgs')
             self.legTLPlotL.removeItem('Vth')
             self.legTRPlotL.removeItem('Vstar')
             self.legTRPlotL.removeItem('Vdsat')
-        # GmOverId as Constriant
-        if self.optOpptMode == 0:
-            self.optOpGmId = 2000.0/float(self.ui.lineEditOptVstar.text())
-            for optL in self.listLChk:
-                self.optVGS, self.optState = self.SearchVGSG( self.tgtCorner, self.optOpGmId, optL, 4)
-                if self.optState == 1:
-                    self.optPltL.append(1000*optL)
-                    self.optPltVgs.append(self.optVGS)
-                    self.optPltVth.append(lp.lookupfz(self.mosDat, self.mosModel, 'VT', VDS=self.VDS, VSB=self.VSB, L=optL, VGS=self.optVGS))
-                    self.optPltVdsat.append(lp.lookupfz(self.mosDat, self.mosModel, 'VDSAT', VDS=self.VDS, VSB=self.VSB, L=optL, VGS=self.optVGS))
-                    self.optPltVstar.append(2.0/lp.lookupfz(self.mosDat, self.mosModel, 'GMOVERID', VDS=self.VDS, VSB=self.VSB, L=optL, VGS=self.optVGS))
-                    self.optPltFt.append(lp.lookupfz(self.mosDat, self.mosModel, 'FUG', VDS=self.VDS, VSB=self.VSB, L=optL, VGS=self.optVGS))
-                    self.optPltAvo.append(lp.lookupfz(self.mosDat, self.mosModel, 'SELF_GAIN', VDS=self.VDS, VSB=self.VSB, L=optL, VGS=self.optVGS))
-        # Ft as constriant
-        elif self.optOpptMode == 1:
-            self.optOpFt = 1000000.0*float(self.ui.lineEditOptFt.text())
-            for optL in self.listLChk:
-                self.optVGS, self.optState = self.SearchVGSF(self.optOpFt, optL)
-                if self.optState == 1:
-                    self.optPltL.append(1000*optL)
-                    self.optPltVgs.append(self.optVGS)
-                    self.optPltVth.append(lp.lookupfz(self.mosDat, self.mosModel, 'VT', VDS=self.VDS, VSB=self.VSB, L=optL, VGS=self.optVGS))
-                    self.optPltVdsat.append(lp.lookupfz(self.mosDat, self.mosModel, 'VDSAT', VDS=self.VDS, VSB=self.VSB, L=optL, VGS=self.optVGS))
-                    self.optPltVstar.append(2.0/lp.lookupfz(self.mosDat, self.mosModel, 'GMOVERID', VDS=self.VDS, VSB=self.VSB, L=optL, VGS=self.optVGS))
-                    self.optPltFt.append(lp.lookupfz(self.mosDat, self.mosModel, 'FUG', VDS=self.VDS, VSB=self.VSB, L=optL, VGS=self.optVGS))
-                    self.optPltAvo.append(lp.lookupfz(self.mosDat, self.mosModel, 'SELF_GAIN', VDS=self.VDS, VSB=self.VSB, L=optL, VGS=self.optVGS))
-        # Avo as constriant
-        elif self.optOpptMode == 2:
-            self.optOpAvo = float(self.ui.lineEditOptAvo.text())
-            for optL in self.listLChk:
-                self.optVGS, self.optState = self.SearchVGSA(self.optOpAvo, optL)
-                if self.optState == 1:
-                    self.optPltL.append(1000*optL)
-                    self.optPltVgs.append(self.optVGS)
-                    self.optPltVth.append(lp.lookupfz(self.mosDat, self.mosModel, 'VT', VDS=self.VDS, VSB=self.VSB, L=optL, VGS=self.optVGS))
-                    self.optPltVdsat.append(lp.lookupfz(self.mosDat, self.mosModel, 'VDSAT', VDS=self.VDS, VSB=self.VSB, L=optL, VGS=self.optVGS))
-                    self.optPltVstar.append(2.0/lp.lookupfz(self.mosDat, self.mosModel, 'GMOVERID', VDS=self.VDS, VSB=self.VSB, L=optL, VGS=self.optVGS))
-                    self.optPltFt.append(lp.lookupfz(self.mosDat, self.mosModel, 'FUG', VDS=self.VDS, VSB=self.VSB, L=optL, VGS=self.optVGS))
-                    self.optPltAvo.append(lp.lookupfz(self.mosDat, self.mosModel, 'SELF_GAIN', VDS=self.VDS, VSB=self.VSB, L=optL, VGS=self.optVGS))
+
+    @gp.profiledSlot
+    def optOpPlot(self, optRes):
+        '''Plot the operation points found so far'''
+        self.optPltL = 1000*optRes['L']
+        self.optPltVgs = optRes['Vgs']
+        self.optPltVth = optRes['Vth']
+        self.optPltVdsat = optRes['Vdsat']
+        self.optPltGmId = optRes['GmId']
+        self.optPltVstar = optRes['Vstar']
+        self.optPltFt = optRes['Ft']
+        self.optPltAvo = optRes['Avo']
+        # Curve is already on the plots
+        if len(self.optPltL) != 0 and self.optOpptReady == 1:
+            self.curveOptFt.setData( self.optPltL, self.optPltFt)
+            self.curveOptAvo.setData( self.optPltL, self.optPltAvo)
+            self.curveOptVstar.setData( self.optPltL, self.optPltVstar)
+            self.curveOptVdsat.setData( self.optPltL, self.optPltVdsat)
+            self.curveOptVgs.setData( self.optPltL, self.optPltVgs)
+            self.curveOptVth.setData( self.optPltL, self.optPltVth)
         # If Curve is Ready
-        if len(self.optPltL) != 0:
+        elif len(self.optPltL) != 0:
             self.optOpptReady = 1
             self.curveOptFt = pg.PlotDataItem( self.optPltL, self.optPltFt, pen = self.pen, symbolBrush=(255,0,0), symbolPen='w', clear=True)
             self.curveOptAvo = pg.PlotDataItem( self.optPltL, self.optPltAvo, pen = self.pen, symbolBrush=(255,0,0), symbolPen='w', clear=True)
@@ -820,61 +1006,47 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
             self.legTRPlotL.addItem(self.curveOptVdsat, 'Vdsat')
             self.ui.botLPlotL.addItem(self.curveOptAvo)
             self.ui.botRPlotL.addItem(self.curveOptFt)
-        else:
-            self.optOpptReady = 0
 
+    @gp.profiledSlot
     def OptSizeMos(self):
         '''Size the Mos'''
-        sizeW = 10.0
-        sizeL = 0.18
-        sizeId = 10.0
-        sizeCgg = 0.0
-        sizeCdd = 0.0
         if self.optOpptReady == 0:
-            self.optOpMos()
-        if self.optOpptReady == 1:
+            self.OptOpMos()
+        if self.jobRunner.busy('Opt'):
+            self.ui.labelLog.setText('Opt still running')
+        elif self.optOpptReady == 1:
             self.ui.botLPlotOpt.clear()
             self.ui.botRPlotOpt.clear()
             self.ui.topLPlotOpt.clear()
             self.ui.topRPlotOpt.clear()
-            self.optPltW = []
-            self.optPltId = []
-            self.optPltCgg = []
-            self.optPltCdd = []
-            if self.optSizeMode == 0:
+            if self.optSizeMode == ge.SIZE_GM:
                 self.optGm = float(self.ui.lineEditOptGm.text())*0.000001
-                for i in range(len(self.optPltL)):
-                    sizeL = self.optPltL[i]/1000.0
-                    sizeW = self.optGm / lp.lookupfz(self.mosDat, self.mosModel, 'GM', VDS=self.VDS, VSB=self.VSB, L=sizeL, VGS=self.optPltVgs[i]) * self.W
-                    self.optPltW.append(sizeW)
-            elif self.optSizeMode == 1:
+                sizeTarget = self.optGm
+            elif self.optSizeMode == ge.SIZE_ID:
                 self.optId = float(self.ui.lineEditOptId.text())*0.000001
-                for i in range(len(self.optPltL)):
-                    sizeL = self.optPltL[i]/1000.0
-                    sizeW = self.optId / lp.lookupfz(self.mosDat, self.mosModel, 'ID', VDS=self.VDS, VSB=self.VSB, L=sizeL, VGS=self.optPltVgs[i]) * self.W
-                    self.optPltW.append(sizeW)
-            elif self.optSizeMode == 2:
+                sizeTarget = self.optId
+            elif self.optSizeMode == ge.SIZE_AREA:
                 self.optArea = float(self.ui.lineEditOptArea.text())
-                for i in range(len(self.optPltL)):
-                    sizeL = self.optPltL[i]/1000.0
-                    sizeW = self.optArea/sizeL
-                    self.optPltW.append(sizeW)
-            for i in range(len(self.optPltL)):
-                sizeL = self.optPltL[i]/1000.0
-                sizeId = self.optPltW[i] * lp.lookupfz(self.mosDat, self.mosModel, 'ID', VDS=self.VDS, VSB=self.VSB, L=sizeL, VGS=self.optPltVgs[i]) / self.W
-                sizeCgg = self.optPltW[i] * lp.lookupfz(self.mosDat, self.mosModel, 'CGG', VDS=self.VDS, VSB=self.VSB, L=sizeL, VGS=self.optPltVgs[i]) / self.W
-                sizeCdd = self.optPltW[i] * lp.lookupfz(self.mosDat, self.mosModel, 'CDD', VDS=self.VDS, VSB=self.VSB, L=sizeL, VGS=self.optPltVgs[i]) / self.W
-                self.optPltId.append(sizeId)
-                self.optPltCgg.append(sizeCgg)
-                self.optPltCdd.append(sizeCdd)
-            self.curveOptW = pg.PlotDataItem(self.optPltL, self.optPltW, pen = self.pen, symbolBrush=(255,0,0), symbolPen='w', clear=True)
-            self.curveOptCgg = pg.PlotDataItem(self.optPltL, self.optPltCgg, pen = self.pen, symbolBrush=(255,0,0), symbolPen='w', clear=True)
-            self.curveOptCdd = pg.PlotDataItem(self.optPltL, self.optPltCdd, pen = self.pen, symbolBrush=(255,0,0), symbolPen='w', clear=True)
-            self.curveOptId = pg.PlotDataItem(self.optPltL, self.optPltId, pen = self.pen, symbolBrush=(255,0,0), symbolPen='w', clear=True)
-            self.ui.topLPlotOpt.addItem(self.curveOptW)
-            self.ui.topRPlotOpt.addItem(self.curveOptId)
-            self.ui.botLPlotOpt.addItem(self.curveOptCgg)
-            self.ui.botRPlotOpt.addItem(self.curveOptCdd)
+                sizeTarget = self.optArea
+            sizeOp = {'L' : self.optPltL/1000.0, 'Vgs' : self.optPltVgs}
+            self.jobRunner.start('Size', optSizeJob, self.mosDat, sizeOp, self.optSizeMode, sizeTarget, self.optPltVds, self.VSB,
+                                 onResult=self.optSizePlot, onError=self.jobFailed)
+
+    @gp.profiledSlot
+    def optSizePlot(self, sizeRes):
+        '''Plot the size of the MOS at the operation points'''
+        self.optPltW = sizeRes['W']
+        self.optPltId = sizeRes['Id']
+        self.optPltCgg = sizeRes['Cgg']
+        self.optPltCdd = sizeRes['Cdd']
+        self.curveOptW = pg.PlotDataItem(self.optPltL, self.optPltW, pen = self.pen, symbolBrush=(255,0,0), symbolPen='w', clear=True)
+        self.curveOptCgg = pg.PlotDataItem(self.optPltL, self.optPltCgg, pen = self.pen, symbolBrush=(255,0,0), symbolPen='w', clear=True)
+        self.curveOptCdd = pg.PlotDataItem(self.optPltL, self.optPltCdd, pen = self.pen, symbolBrush=(255,0,0), symbolPen='w', clear=True)
+        self.curveOptId = pg.PlotDataItem(self.optPltL, self.optPltId, pen = self.pen, symbolBrush=(255,0,0), symbolPen='w', clear=True)
+        self.ui.topLPlotOpt.addItem(self.curveOptW)
+        self.ui.topRPlotOpt.addItem(self.curveOptId)
+        self.ui.botLPlotOpt.addItem(self.curveOptCgg)
+        self.ui.botRPlotOpt.addItem(self.curveOptCdd)
 
     def FuEst(self):
         pass
@@ -884,28 +1056,67 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
         if (self.curveAvDes != None):
             self.ui.botLPlotL.removeItem(self.curveAvDes)
             self.ui.botRPlotL.removeItem(self.curveFtDes)
+            self.curveAvDes = None
+            self.curveFtDes = None
         self.UpdateBias()
         self.lTgtVstar = float(self.ui.lineEditOptVstar.text())
         self.lTgtGmId = 2.0 / self.lTgtVstar
-        vstarReady = 0
-        vstarVgs = 0.0
-        vstarState = 0
-        vstarPltAv = []
-        vstarPltFt = []
-        vstarPltL = []
-        for swL in self.listLChk:
-            vstarVgs, vstarState = self.SearchVGSG(self.tgtCorner, self.lTgtGmId, swL, 3)
-            if vstarState == 1:
-                vstarReady = 1
-                vstarPltL.append(1000*swL)
-                vstarPltAv.append(lp.lookupfz(self.mosDat, self.mosModel, 'SELF_GAIN', VDS=self.VDS, VSB=self.VSB, L=swL, VGS=vstarVgs))
-                vstarPltFt.append(lp.lookupfz(self.mosDat, self.mosModel, 'FUG', VDS=self.VDS, VSB=self.VSB, L=swL, VGS=vstarVgs))
-        if (vstarReady == 1):
-            self.curveAvDes = pg.PlotDataItem( vstarPltL, vstarPltAv, pen = self.pen, symbolBrush = (255,0,0), symbolPen='w', clear = True)
-            self.curveFtDes = pg.PlotDataItem( vstarPltL, vstarPltFt, pen = self.pen, symbolBrush = (255,0,0), symbolPen='w', clear = True)
+        self.jobRunner.start('LChk', optOpJob, self.mosCorner[self.tgtCorner], ge.OPT_VSTAR, self.lTgtVstar, self.listLChk, self.VDS, self.VSB,
+                             onPartial=self.lChkPlot, onResult=self.lChkPlot, onProgress=partial(self.jobProgress, 'LChk'),
+                             onError=self.jobFailed)
+
+    @gp.profiledSlot
+    def lChkPlot(self, vstarRes):
+        '''Plot Av and Ft at the Vstar for the L found so far'''
+        if len(vstarRes['L']) == 0:
+            return
+        vstarPltL = 1000*vstarRes['L']
+        if (self.curveAvDes != None):
+            self.curveAvDes.setData( vstarPltL, vstarRes['Avo'])
+            self.curveFtDes.setData( vstarPltL, vstarRes['Ft'])
+        else:
+            self.curveAvDes = pg.PlotDataItem( vstarPltL, vstarRes['Avo'], pen = self.pen, symbolBrush = (255,0,0), symbolPen='w', clear = True)
+            self.curveFtDes = pg.PlotDataItem( vstarPltL, vstarRes['Ft'], pen = self.pen, symbolBrush = (255,0,0), symbolPen='w', clear = True)
             self.ui.botLPlotL.addItem(self.curveAvDes)
             self.ui.botRPlotL.addItem(self.curveFtDes)
 
+    def jobProgress(self, jobName, done, total):
+        self.progressBarJob.setMaximum(max(total, 1))
+        self.progressBarJob.setValue(done)
+        self.ui.statusbar.showMessage('%s : %d/%d' % (jobName, done, total))
+
+    def jobFailed(self, errMsg):
+        self.ui.labelLog.setText(errMsg)
+
+    def CancelJob(self):
+        '''Cancel all the background jobs'''
+        self.jobRunner.cancelAll()
+        self.ui.labelLog.setText('Job Cancelled')
+        self.ui.statusbar.showMessage('Job Cancelled')
+
+    def ProfileSwitch(self, state):
+        '''Turn the profiler on or off, the stats so far are kept'''
+        gp.profiler.enable(state)
+        self.ui.statusbar.showMessage('Profile %s' % ('On' if state else 'Off'))
+
+    def ProfileStats(self):
+        '''Calls and time of the profiled functions, Reset clears them'''
+        dialogStats = QtWidgets.QDialog(self)
+        dialogStats.setWindowTitle('Profile Stats')
+        textStats = QtWidgets.QPlainTextEdit(gp.profiler.report())
+        textStats.setReadOnly(True)
+        textStats.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+        textStats.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont))
+        buttonBox = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Reset | QtWidgets.QDialogButtonBox.Close)
+        buttonBox.rejected.connect(dialogStats.reject)
+        buttonBox.button(QtWidgets.QDialogButtonBox.Reset).clicked.connect(gp.profiler.clear)
+        buttonBox.button(QtWidgets.QDialogButtonBox.Reset).clicked.connect(lambda: textStats.setPlainText(gp.profiler.report()))
+        layoutStats = QtWidgets.QVBoxLayout(dialogStats)
+        layoutStats.addWidget(textStats)
+        layoutStats.addWidget(buttonBox)
+        dialogStats.resize(800, 400)
+        dialogStats.exec_()
+
     def ExtCheck(self):
         pass
 
@@ -914,6 +1125,7 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
         self.VDS = float(self.ui.spinBoxBiasVds.value())*0.001
         self.VSB = -float(self.ui.spinBoxBiasVbs.value())*0.001
 
+    @gp.profiledSlot
     def SynMos(self):
         '''Syn MOS from Gm'''
         self.UpdateBias()
@@ -924,107 +1136,76 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
         else:
             self.synGmId = 2000.0/float(self.ui.lineEditSynVstar.text())
         if self.synSize == 0:
-            self.synGm = float(self.ui.lineEditSynGm.text()) * 0.000001
-            self.synId = self.synGm / self.synGmId
+            synGm, synId = float(self.ui.lineEditSynGm.text()) * 0.000001, None
+        else:
+            synGm, synId = None, float(self.ui.lineEditSynId.text()) * 0.000001
+        if self.ui.checkBoxSynWorst.isChecked():
+            # Size at the design corner and check all the loaded corners at once
+            try:
+                cornerTab = self.cornerTable()
+            except ValueError as err:
+                self.ui.labelLog.setText(str(err))
+                return
+            if self.tgtCorner not in self.cornerTabList:
+                self.ui.labelLog.setText('Plot the corners first')
+                return
+            synRes = ge.worstMos(cornerTab, self.cornerTabList.index(self.tgtCorner), self.Lchk, self.VDS, self.VSB, self.synGmId, Gm=synGm, Id=synId,
+                                 multi=self.synMulti, fin=self.synFin, resize=self.ui.checkBoxSynResize.isChecked())
         else:
-            self.synId = float(self.ui.lineEditSynId.text()) * 0.000001
-            self.synGm = self.synId * self.synGmId
-        self.synVGS, self.synState = self.SearchVGSG( self.tgtCorner, self.synGmId, self.Lchk, 4)
-        self.synW =  self.synId * self.W / lp.lookupfz(self.mosDat, self.mosModel, 'ID', VDS=self.VDS, VSB=self.VSB, L=self.Lchk, VGS=self.synVGS)
-        self.synWFin = self.synW / (self.synMulti * self.synFin)
+            synRes = ge.synMos(self.mosDat, self.Lchk, self.VDS, self.VSB, self.synGmId, Gm=synGm, Id=synId, multi=self.synMulti, fin=self.synFin)
+        self.synGm = synRes['Gm']
+        self.synId = synRes['Id']
+        self.synVGS = synRes['VGS']
+        self.synState = synRes['State']
+        self.synW = synRes['W']
+        self.synWFin = synRes['WFin']
         self.ui.labelSynW.setText(self.sciPrint(0.000001 * self.synW, 'm'))
         self.ui.labelSynWFin.setText(self.sciPrint(0.000001 * self.synWFin, 'm'))
         self.ui.labelSynVgs.setText(self.sciPrint(self.synVGS, 'V'))
         self.ui.labelChkId.setText(self.sciPrint(self.synId, 'A'))
         self.ui.labelChkGm.setText(self.sciPrint(self.synGm, 'S/A'))
-        self.ChkMos(self.synW, self.synVGS)
-
-    def ChkMos(self, chkW, chkVgs):
-        '''Scale the Char of MOS and Change the label'''
-        mosScale = chkW / self.W
-        chkCgg = mosScale * lp.lookupfz(self.mosDat, self.mosModel, 'CGG', VDS=self.VDS, VSB=self.VSB, L=self.Lchk, VGS=chkVgs)
-        self.ui.labelChkCgg.setText(self.sciPrint(chkCgg, 'F'))
-        #print ("Cgg : %1.24f" % chkCgg)
-        chkFt = 1.0 * lp.lookupfz(self.mosDat, self.mosModel, 'FUG', VDS=self.VDS, VSB=self.VSB, L=self.Lchk, VGS=chkVgs)
-        self.ui.labelChkFt.setText(self.sciPrint(chkFt, 'Hz'))
-        chkRout = 1.0 / ( mosScale * lp.lookupfz(self.mosDat, self.mosModel, 'GDS', VDS=self.VDS, VSB=self.VSB, L=self.Lchk, VGS=chkVgs))
-        self.ui.labelChkRout.setText(self.sciPrint(chkRout, 'Ohm'))
-        chkAv = 1.0 * lp.lookupfz(self.mosDat, self.mosModel, 'SELF_GAIN', VDS=self.VDS, VSB=self.VSB, L=self.Lchk, VGS=chkVgs)
-        self.ui.labelChkAv.setText(self.sciPrint(chkAv, 'V/V'))
-        chkVth = 1.0 * lp.lookupfz(self.mosDat, self.mosModel, 'VT', VDS=self.VDS, VSB=self.VSB, L=self.Lchk, VGS=chkVgs)
-        self.ui.labelChkVth.setText(self.sciPrint(chkVth, 'V'))
-        chkVdsat = 1.0 * lp.lookupfz(self.mosDat, self.mosModel, 'VDSAT', VDS=self.VDS, VSB=self.VSB, L=self.Lchk, VGS=chkVgs)
-        self.ui.labelChkVdsat.setText(self.sciPrint(chkVdsat, 'V'))
-
-    def SearchVGSG(self, cornerIndex, tgtGmId, tgtL, absRel):
-        vgsStart = 0
-        vgsEnd = self.maxVGS
-        gmIdSeq = None
-        vgsStep= [0.1,0.01,0.001,0.0001]
-        vgsLeft= 0
-        searchState = 1
-        for i in range(absRel):
-            vgsSeq = np.arange( vgsEnd, vgsStart, -vgsStep[i])
-            gmIdSeq = lp.lookupfz(self.mosCorner[cornerIndex], self.mosModel, 'GMOVERID', VDS=self.VDS, VSB=self.VSB, L=tgtL, VGS=vgsSeq)
-            vgsLeft = np.searchsorted( gmIdSeq, tgtGmId, 'left')
-            if vgsLeft == vgsSeq.size:
-                searchState = 2
-                break
-            vgsStart = vgsSeq[vgsLeft]
-            if vgsLeft == 0:
-                searchState = 0
-                break
-            vgsEnd = vgsSeq[vgsLeft - 1]
-        return vgsStart, searchState
-
-    def SearchVGSA(self, tgtAvo, tgtL):
-        '''Search VGS for fixed Avo'''
-        vgsStart = 0
-        vgsEnd = self.maxVGS
-        avoSeq = None
-        vgsStep= [0.1,0.01,0.001,0.0001]
-        vgsLeft= 0
-        searchState = 1
-        for i in range(4):
-            vgsSeq = np.arange( vgsEnd, vgsStart, -vgsStep[i])
-            avoSeq = lp.lookupfz(self.mosDat, self.mosModel, 'SELF_GAIN', VDS=self.VDS, VSB=self.VSB, L=tgtL, VGS=vgsSeq)
-            vgsLeft = np.searchsorted( avoSeq, tgtAvo, 'left')
-            if vgsLeft == vgsSeq.size:
-                searchState = 2
-                break
-            vgsStart = vgsSeq[vgsLeft]
-            if vgsLeft == 0:
-                searchState = 0
-                break
-            vgsEnd = vgsSeq[vgsLeft - 1]
-        return vgsStart, searchState
-
-    def SearchVGSF(self, tgtFt, tgtL):
-        '''Search VGS for fixed Ft'''
-        vgsStart = 0
-        vgsEnd = self.maxVGS
-        ftSeq = None
-        vgsStep= [0.1,0.01,0.001,0.0001]
-        vgsLeft= 0
-        searchState = 1
-        for i in range(4):
-            vgsSeq = np.arange( vgsStart, vgsEnd, vgsStep[i])
-            ftSeq = lp.lookupfz(self.mosDat, self.mosModel, 'FUG', VDS=self.VDS, VSB=self.VSB, L=tgtL, VGS=vgsSeq)
-            vgsLeft = np.searchsorted( ftSeq, tgtFt, 'left')
-            if vgsLeft == vgsSeq.size:
-                searchState = 2
-                break
-            vgsEnd = vgsSeq[vgsLeft]
-            if vgsLeft == 0:
-                searchState = 0
-                break
-            vgsStart = vgsSeq[vgsLeft - 1]
-        return vgsStart, searchState
+        self.ChkMos(synRes)
+        if 'Corner' in synRes:
+            self.ChkCorner(synRes)
+
+    def cornerTable(self):
+        '''CornerTable of the loaded corners, built again once they change'''
+        cornerList = [i for i in range(len(self.listCorner)) if self.mosCorner[i] is not None]
+        cornerKey = tuple(self.mosCorner[i].tableId for i in cornerList)
+        if cornerKey != self.cornerTabKey:
+            self.cornerTab = lp.CornerTable([self.mosCorner[i] for i in cornerList]) if cornerList else None
+            self.cornerTabKey = cornerKey
+            self.cornerTabList = cornerList
+        return self.cornerTab
+
+    def ChkCorner(self, worstRes):
+        '''Change the label for the Char of MOS to the spread over the corners, the tooltip lists each corner'''
+        for label, key, unit in [(self.ui.labelChkGm, 'Gm', 'S'), (self.ui.labelChkId, 'Id', 'A'), (self.ui.labelChkCgg, 'Cgg', 'F'),
+                                 (self.ui.labelChkFt, 'Ft', 'Hz'), (self.ui.labelChkRout, 'Rout', 'Ohm'), (self.ui.labelChkAv, 'Av', 'V/V'),
+                                 (self.ui.labelChkVth, 'Vth', 'V'), (self.ui.labelChkVdsat, 'Vdsat', 'V')]:
+            label.setText(self.sciPrint(worstRes['Min'][key], unit) + ' ~ ' + self.sciPrint(worstRes['Max'][key], unit))
+            label.setToolTip('\n'.join('%s : %s' % (self.listCorner[cornerIndex], self.sciPrint(worstRes['Corner'][key][i], unit))
+                                       for i, cornerIndex in enumerate(self.cornerTabList)))
+        self.ui.labelLog.setText('Worst of %s, W x %.3f' % (' '.join(self.listCorner[i] for i in self.cornerTabList), worstRes['Resize']))
+
+    def ChkMos(self, chkRes):
+        '''Change the label for the Char of MOS'''
+        for label in [self.ui.labelChkGm, self.ui.labelChkId, self.ui.labelChkCgg, self.ui.labelChkFt,
+                      self.ui.labelChkRout, self.ui.labelChkAv, self.ui.labelChkVth, self.ui.labelChkVdsat]:
+            label.setToolTip('')
+        self.ui.labelChkCgg.setText(self.sciPrint(chkRes['Cgg'], 'F'))
+        self.ui.labelChkFt.setText(self.sciPrint(chkRes['Ft'], 'Hz'))
+        self.ui.labelChkRout.setText(self.sciPrint(chkRes['Rout'], 'Ohm'))
+        self.ui.labelChkAv.setText(self.sciPrint(chkRes['Av'], 'V/V'))
+        self.ui.labelChkVth.setText(self.sciPrint(chkRes['Vth'], 'V'))
+        self.ui.labelChkVdsat.setText(self.sciPrint(chkRes['Vdsat'], 'V'))
 
     def loadMat(self):
         '''Load the MAT File and Set the Voltage as Bias'''
         print ('Load Mat File : %s' % self.matItem.text())
-        self.mosDat = h5py.File(self.matFilePath, 'r')
+        if self.matFilePath not in self.mosTables:
+            self.mosTables[self.matFilePath] = lp.loadTable(self.matFilePath)
+        self.mosDat = self.mosTables[self.matFilePath]
         print ("Loading complete!")
         self.ui.listWidgetL.clear()
         self.ui.listWidgetLRef.clear()
@@ -1043,23 +1224,90 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
         self.W = self.mosDat['W'][0][0]*self.mosDat['NFING'][0][0]
         print ('Mos Default Width : %2.2f' % self.W)
 
+    @gp.profiled
     def cornerMat(self):
-        '''Search & Load all the corner Matlib Data'''
-        # Set Corner
-        self.tgtCorner = self.listCorner.index(self.matFileInfo[2])
+        '''Search all the corner Matlib Data, then load them and their curves in the thread pool'''
+        # A new Plot wins over the corners still loading
+        for cornerName in self.listCorner:
+            self.jobRunner.cancel('Corner ' + cornerName)
+        self.jobRunner.cancel('Curve')
+        # Set Corner, the other corners are the files of the same tech, device and temperature
+        matKey = self.matFileInfo
+        self.listCorner = cornerSlots(self.dataSet.corners(matKey[0], matKey[1], matKey[3]), matKey[2])
+        self.tgtCorner = self.listCorner.index(matKey[2])
         print ('Corner Set to : %s' % self.listCorner[self.tgtCorner])
+        self.UpdateBias()
+        pltVstar = np.arange( self.minVstar, self.maxVstar, 0.0005)
+        pltGmId = np.arange( self.minGmId, self.maxGmId, 0.01)
+        # The curves of all the corners are built together once the last one is loaded
+        self.cornerCurveArgs = (self.L, self.Lref, self.VDS, self.VSB, self.listVGS, pltVstar, pltGmId, self.listLChk, const.GMIDL)
+        self.cornerJobLeft = 0
         # Search Corner
         for i in range(len(self.listCorner)):
-            cornerFileName = self.matFileInfo[0]+'-'+self.matFileInfo[1]+'-'+self.listCorner[i]+'.mat'
-            if cornerFileName in self.matFileList:
+            cornerFilePath = self.dataSet.find(matKey[0], matKey[1], self.listCorner[i], matKey[3])
+            if cornerFilePath is not None:
                 print ('%s corner Found' % self.listCorner[i])
                 self.avaCorner[i] = 1
-                cornerFilePath = self.matDirPath + '/' + cornerFileName
-                self.mosCorner[i] = h5py.File(cornerFilePath, 'r')
+                # Corners already resident only get their GmIdTable if it is missing
+                self.cornerJobLeft += 1
+                self.jobRunner.start('Corner ' + self.listCorner[i], loadCorner, i, cornerFilePath, self.mosTables.get(cornerFilePath),
+                                     onResult=self.cornerLoaded, onError=partial(self.cornerFailed, i), onFinished=self.cornerDone)
             else:
                 print ('%s corner None' % self.listCorner[i])
                 self.avaCorner[i] = 0
                 self.mosCorner[i] = None
+        self.ui.labelLog.setText('Loading Corners')
+        self.cornerJobTotal = self.cornerJobLeft
+        self.jobProgress('Corner', 0, self.cornerJobTotal)
+        if self.cornerJobLeft == 0:
+            self.cornerPlot()
+
+    @gp.profiledSlot
+    def cornerLoaded(self, cornerRes):
+        '''Keep the loaded corner'''
+        cornerIndex, cornerFilePath, mosDat = cornerRes
+        self.mosTables[cornerFilePath] = mosDat
+        self.mosCorner[cornerIndex] = mosDat
+
+    def cornerFailed(self, cornerIndex, errMsg):
+        print ('%s corner Failed : %s' % (self.listCorner[cornerIndex], errMsg))
+        self.avaCorner[cornerIndex] = 0
+        self.mosCorner[cornerIndex] = None
+
+    @gp.profiledSlot
+    def cornerDone(self):
+        '''Build the curves of all the corners once the last corner job is back'''
+        self.cornerJobLeft -= 1
+        self.jobProgress('Corner', self.cornerJobTotal - self.cornerJobLeft, self.cornerJobTotal)
+        if self.cornerJobLeft == 0:
+            cornerIndexes = [i for i in range(len(self.listCorner)) if self.avaCorner[i] == 1]
+            if not cornerIndexes:
+                self.cornerPlot()
+                return
+            self.jobRunner.start('Curve', cornerCurveJob, cornerIndexes, [self.mosCorner[i] for i in cornerIndexes], *self.cornerCurveArgs,
+                                 onResult=self.cornerCurved, onError=partial(self.cornerCurveFailed, cornerIndexes), onFinished=self.cornerPlot)
+
+    @gp.profiledSlot
+    def cornerCurved(self, curveRes):
+        '''Plot items of the curves of all the corners, a corner without curves is no longer available'''
+        for cornerIndex, desCurve, refCurve, gateCurve in curveRes:
+            if desCurve is None:
+                print ('GmIdCurve Failed for Corner : ' + self.listCorner[cornerIndex])
+                self.avaCorner[cornerIndex] = 0
+                continue
+            self.gmIdCurve(cornerIndex, desCurve, refCurve)
+            self.gateLCurve(cornerIndex, gateCurve)
+            print ('GmIdCurve for Corner : ' + self.listCorner[cornerIndex])
+
+    def cornerCurveFailed(self, cornerIndexes, errMsg):
+        '''The curve job failed outside the fit of any corner, none of its corners got curves'''
+        print ('GmIdCurve Failed : %s' % errMsg)
+        for i in cornerIndexes:
+            self.avaCorner[i] = 0
+
+    @gp.profiled
+    def cornerPlot(self):
+        '''Put the curves of all the loaded corners on the plots'''
         # Update Plots
         ## Clear the plots and then add back the indicator
         self.ui.topLPlotVgs.clear()
@@ -1109,40 +1357,43 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
         self.ui.botRPlotL.addItem(self.botRVLineL, ignoreBounds=True)
         # Generate Curve
         self.genCurve()
+        for i in range(len(self.listCorner)):
+            self.ui.comboBoxDesignCorner.setItemText(i, self.listCorner[i].upper())
         self.ui.comboBoxDesignCorner.setCurrentIndex(self.tgtCorner)
         self.changeCorner()
         # Update CheckBox Text
         if self.avaCorner[0] == 0:
             self.ui.checkBoxCornerTT.setText("--")
         else:
-            self.ui.checkBoxCornerTT.setText("TT")
+            self.ui.checkBoxCornerTT.setText(self.listCorner[0].upper())
             self.ui.checkBoxCornerTT.setCheckState(2)
             self.ui.checkBoxCornerTT.setCheckState(0)
         if self.avaCorner[1] == 0:
             self.ui.checkBoxCornerFF.setText("--")
         else:
-            self.ui.checkBoxCornerFF.setText("FF")
+            self.ui.checkBoxCornerFF.setText(self.listCorner[1].upper())
             self.ui.checkBoxCornerFF.setCheckState(2)
             self.ui.checkBoxCornerFF.setCheckState(0)
         if self.avaCorner[2] == 0:
             self.ui.checkBoxCornerSS.setText("--")
         else:
-            self.ui.checkBoxCornerSS.setText("SS")
+            self.ui.checkBoxCornerSS.setText(self.listCorner[2].upper())
             self.ui.checkBoxCornerSS.setCheckState(2)
             self.ui.checkBoxCornerSS.setCheckState(0)
         if self.avaCorner[3] == 0:
             self.ui.checkBoxCornerFS.setText("--")
         else:
-            self.ui.checkBoxCornerFS.setText("FS")
+            self.ui.checkBoxCornerFS.setText(self.listCorner[3].upper())
             self.ui.checkBoxCornerFS.setCheckState(2)
             self.ui.checkBoxCornerFS.setCheckState(0)
         if self.avaCorner[4] == 0:
             self.ui.checkBoxCornerSF.setText("--")
         else:
-            self.ui.checkBoxCornerSF.setText("SF")
+            self.ui.checkBoxCornerSF.setText(self.listCorner[4].upper())
             self.ui.checkBoxCornerSF.setCheckState(2)
             self.ui.checkBoxCornerSF.setCheckState(0)
 
+    @gp.profiledSlot
     def changeCorner(self):
         '''Change the Temp Corner'''
         newTgtCorner = self.ui.comboBoxDesignCorner.currentIndex()
@@ -1157,6 +1408,7 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
             self.corCurveIdVDes[self.tgtCorner].setPen(self.linePen[self.tgtCorner])
             self.corCurveFtVDes[self.tgtCorner].setPen(self.linePen[self.tgtCorner])
             self.mosDat = self.mosCorner[self.tgtCorner]
+            self.visibleLCurve()
             self.pltCurveUpdate()
             self.LChkVstar()
             self.restCurveOff()
@@ -1164,14 +1416,11 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
         else:
             self.ui.labelLog.setText("Corner Not Found")
 
+    @gp.profiled
     def genCurve(self):
-        '''Generate all the curve'''
-        self.UpdateBias()
+        '''Add the curves of the corners, built by gmIdCurve'''
         for i in range(len(self.listCorner)):
             if self.avaCorner[i] == 1:
-                # Curve for GmId at des-l and ref-l
-                self.gmIdCurve(i)
-                print ('GmIdCurve for Corner : ' + self.listCorner[i])
                 # Vgs
                 self.ui.topLPlotVgs.addItem(self.corCurveIdDDes[i])
                 self.ui.topRPlotVgs.addItem(self.corCurveFomDDes[i])
@@ -1235,7 +1484,18 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
                 self.corCurveFtIRef[i] = None
                 self.corCurveAvIRef[i] = None
                 self.corCurveFomIRef[i]= None
+        self.addLCurve()
+
+    def addLCurve(self):
+        '''Add the L curves of the inversion levels, shown by PlotLWI, PlotLMI and PlotLSI'''
+        for i in range(len(self.listCorner)):
+            for level in range(len(const.GMIDL)):
+                if self.avaCorner[i] == 1 and self.lReady[level][i] == 1:
+                    self.ui.botLPlotL.addItem(self.curveAvLCorner[level][i])
+                    self.ui.botRPlotL.addItem(self.curveFtLCorner[level][i])
+        self.visibleLCurve()
 
+    @gp.profiled
     def pltCurveUpdate(self):
         '''Update the Plot for GmId'''
         # Update the MainCurve
@@ -1257,38 +1517,7 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
             self.ui.topRPlotId.removeItem(self.pltCurveFomIDes)
             self.ui.botLPlotId.removeItem(self.pltCurveAvIDes)
             self.ui.botRPlotId.removeItem(self.pltCurveFtIDes)
-        self.listId = lp.lookupfz(self.mosDat, self.mosModel, 'ID', VDS=self.VDS, VSB=self.VSB, L=self.L, VGS=self.listVGS)
-        self.listAv = lp.lookupfz(self.mosDat, self.mosModel, 'SELF_GAIN', VDS=self.VDS, VSB=self.VSB, L=self.L, VGS=self.listVGS)
-        self.listFt = lp.lookupfz(self.mosDat, self.mosModel, 'FUG', VDS=self.VDS, VSB=self.VSB, L=self.L, VGS=self.listVGS)
-        self.listGmId = lp.lookupfz(self.mosDat, self.mosModel, 'GMOVERID', VDS=self.VDS, VSB=self.VSB, L=self.L, VGS=self.listVGS)
-        self.listVdsat = lp.lookupfz(self.mosDat, self.mosModel, 'VDSAT', VDS=self.VDS, VSB=self.VSB, L=self.L, VGS=self.listVGS)
-        # Fig Line Extract
-        ## Vstar Line
-        self.listVstar = 2*np.reciprocal(self.listGmId)
-        self.csIdV = CubicSpline( self.listVstar, self.listId)
-        self.csFtV = CubicSpline( self.listVstar, self.listFt)
-        self.csAvV = CubicSpline( self.listVstar, self.listAv)
-        self.csVgV = CubicSpline( self.listVstar, self.listVGS)
-        self.csVdsatV = CubicSpline(self.listVstar, self.listVdsat)
-        ## GmId Line
-        self.listGmIdG = np.flip(self.listGmId, 0)
-        self.listIdG = np.flip(self.listId, 0)
-        self.listFtG = np.flip(self.listFt, 0)
-        self.listAvG = np.flip(self.listAv, 0)
-        self.listVgG = np.flip(self.listVGS, 0)
-        self.listVdsatG = np.flip(self.listVdsat, 0)
-        self.csIdG = CubicSpline( self.listGmIdG, self.listIdG)
-        self.csFtG = CubicSpline( self.listGmIdG, self.listFtG)
-        self.csAvG = CubicSpline( self.listGmIdG, self.listAvG)
-        self.csVgG = CubicSpline( self.listGmIdG, self.listVgG)
-        self.csVdsatG = CubicSpline( self.listGmIdG, self.listVdsatG)
-        ## Id Line
-        self.listIdI = np.log10(self.listId)
-        self.csGmI = CubicSpline( self.listIdI, self.listGmId)
-        self.csFtI = CubicSpline( self.listIdI, self.listFt)
-        self.csAvI = CubicSpline( self.listIdI, self.listAv)
-        self.csVgI = CubicSpline( self.listIdI, self.listVGS)
-        self.csVdsatI = CubicSpline( self.listIdI, self.listVdsat)
+        self.pltCurveData()
         # Vgs Figure
         self.pltCurveIdDDes = pg.PlotDataItem( self.listVGS, self.listId, pen = self.pen, clear=True)
         self.pltCurveFtDDes = pg.PlotDataItem( self.listVGS, self.listFt, pen = self.pen, clear=True)
@@ -1299,13 +1528,6 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
         self.ui.botLPlotVgs.addItem(self.pltCurveAvDDes)
         self.ui.botRPlotVgs.addItem(self.pltCurveFtDDes)
         # Vstar Figure
-        #self.pltVstar = np.arange( self.listVstar.min(), self.listVstar.max(), 0.001)
-        self.pltVstar = np.arange( self.minVstar, self.maxVstar, 0.0005)
-        self.pltIdV = self.csIdV(self.pltVstar)
-        self.pltFtV = self.csFtV(self.pltVstar)
-        self.pltAvV = self.csAvV(self.pltVstar)
-        self.pltVgV = self.csVgV(self.pltVstar)
-        self.pltVdsatV = self.csVdsatV(self.pltVstar)
         self.pltCurveIdVDes = pg.PlotDataItem( self.pltVstar, self.pltIdV, pen = self.pen, clear=True)
         self.pltCurveFtVDes = pg.PlotDataItem( self.pltVstar, self.pltFtV, pen = self.pen, clear=True)
         self.pltCurveAvVDes = pg.PlotDataItem( self.pltVstar, self.pltAvV, pen = self.pen, clear=True)
@@ -1315,13 +1537,6 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
         self.ui.botLPlotVstar.addItem(self.pltCurveAvVDes)
         self.ui.botRPlotVstar.addItem(self.pltCurveFtVDes)
         # GmId Figure
-        #self.pltGmId = np.arange( self.listGmId.min(), self.listGmId.max(), 0.01)
-        self.pltGmId = np.arange( self.minGmId, self.maxGmId, 0.01)
-        self.pltIdG = self.csIdG(self.pltGmId)
-        self.pltFtG = self.csFtG(self.pltGmId)
-        self.pltAvG = self.csAvG(self.pltGmId)
-        self.pltVgG = self.csVgG(self.pltGmId)
-        self.pltVdsatG = self.csVdsatG(self.pltGmId)
         self.pltCurveIdGDes = pg.PlotDataItem( self.pltGmId, self.pltIdG, pen = self.pen, clear=True)
         self.pltCurveFtGDes = pg.PlotDataItem( self.pltGmId, self.pltFtG, pen = self.pen, clear=True)
         self.pltCurveAvGDes = pg.PlotDataItem( self.pltGmId, self.pltAvG, pen = self.pen, clear=True)
@@ -1331,12 +1546,6 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
         self.ui.botLPlotGmId.addItem(self.pltCurveAvGDes)
         self.ui.botRPlotGmId.addItem(self.pltCurveFtGDes)
         # Id Figure
-        self.pltIdI = np.arange( self.listIdI.min(), self.listIdI.max(), 0.05)
-        self.pltGmI = self.csGmI( self.pltIdI)
-        self.pltFtI = self.csFtI( self.pltIdI)
-        self.pltAvI = self.csAvI( self.pltIdI)
-        self.pltVgI = self.csVgI( self.pltIdI)
-        self.pltVdsatI = self.csVdsatI( self.pltIdI)
         self.pltCurveGmIDes = pg.PlotDataItem( self.pltIdI, self.pltGmI, pen = self.pen, clear=True)
         self.pltCurveFtIDes = pg.PlotDataItem( self.pltIdI, self.pltFtI, pen = self.pen, clear=True)
         self.pltCurveFomIDes = pg.PlotDataItem( self.pltIdI, self.pltFtI*self.pltGmI, pen = self.pen, clear=True)
@@ -1351,155 +1560,139 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
         # Set Flag
         self.curveReady = 1
 
-    def gateLCurve(self, cornerIndex):
-        '''Generate the Vth, Avo, Ft as a function of L for the mosdat'''
-        # Reset the flags for the curve
-        self.w0LReady[cornerIndex] = 0
-        self.w1LReady[cornerIndex] = 0
-        self.m0LReady[cornerIndex] = 0
-        self.m1LReady[cornerIndex] = 0
-        self.s0LReady[cornerIndex] = 0
-        self.s1LReady[cornerIndex] = 0
+    @gp.profiledSlot
+    def BiasLive(self):
+        '''Redraw the design curves while the bias is changed'''
+        if self.curveReady == 0:
+            return
         self.UpdateBias()
+        try:
+            self.pltCurveData()
+        except ValueError as biasErr:
+            self.ui.labelLog.setText(str(biasErr))
+            return
+        # Vgs Figure
+        self.pltCurveIdDDes.setData( self.listVGS, self.listId)
+        self.pltCurveFtDDes.setData( self.listVGS, self.listFt)
+        self.pltCurveAvDDes.setData( self.listVGS, self.listAv)
+        self.pltCurveFomDDes.setData( self.listVGS, self.listFt * self.listGmId)
+        # Vstar Figure
+        self.pltCurveIdVDes.setData( self.pltVstar, self.pltIdV)
+        self.pltCurveFtVDes.setData( self.pltVstar, self.pltFtV)
+        self.pltCurveAvVDes.setData( self.pltVstar, self.pltAvV)
+        self.pltCurveFomVDes.setData( self.pltVstar, 2.0*self.pltFtV/self.pltVstar)
+        # GmId Figure
+        self.pltCurveIdGDes.setData( self.pltGmId, self.pltIdG)
+        self.pltCurveFtGDes.setData( self.pltGmId, self.pltFtG)
+        self.pltCurveAvGDes.setData( self.pltGmId, self.pltAvG)
+        self.pltCurveFomGDes.setData( self.pltGmId, self.pltGmId * self.pltFtG)
+        # Id Figure
+        self.pltCurveGmIDes.setData( self.pltIdI, self.pltGmI)
+        self.pltCurveFtIDes.setData( self.pltIdI, self.pltFtI)
+        self.pltCurveFomIDes.setData( self.pltIdI, self.pltFtI*self.pltGmI)
+        self.pltCurveAvIDes.setData( self.pltIdI, self.pltAvI)
+
+    @gp.profiled
+    def pltCurveData(self):
+        '''Lookup and splines of the design curves at the bias'''
+        # Fitted once per table, L and bias, all the outputs of an axis in one CurveSpline
+        listOp, curveSpline = ge.biasCurves(self.mosDat, self.L, self.VDS, self.VSB, self.listVGS)
+        self.listId = listOp['ID']
+        self.listAv = listOp['SELF_GAIN']
+        self.listFt = listOp['FUG']
+        self.listGmId = listOp['GMOVERID']
+        self.listVdsat = listOp['VDSAT']
+        self.listVstar = curveSpline['Vstar'].x[0]
+        self.listIdI = curveSpline['Id'].x[0]
+        # Curve points
+        #self.pltVstar = np.arange( self.listVstar.min(), self.listVstar.max(), 0.001)
+        self.pltVstar = np.arange( self.minVstar, self.maxVstar, 0.0005)
+        pltV = curveSpline['Vstar'](self.pltVstar)
+        self.pltIdV = pltV['Id']
+        self.pltFtV = pltV['Ft']
+        self.pltAvV = pltV['Av']
+        self.pltVgV = pltV['Vgs']
+        self.pltVdsatV = pltV['Vdsat']
+        #self.pltGmId = np.arange( self.listGmId.min(), self.listGmId.max(), 0.01)
+        self.pltGmId = np.arange( self.minGmId, self.maxGmId, 0.01)
+        pltG = curveSpline['GmId'](self.pltGmId)
+        self.pltIdG = pltG['Id']
+        self.pltFtG = pltG['Ft']
+        self.pltAvG = pltG['Av']
+        self.pltVgG = pltG['Vgs']
+        self.pltVdsatG = pltG['Vdsat']
+        self.pltIdI = np.arange( self.listIdI.min(), self.listIdI.max(), ge.CURVE_ID_STEP)
+        pltI = curveSpline['Id'](self.pltIdI)
+        self.pltGmI = pltI['GmId']
+        self.pltFtI = pltI['Ft']
+        self.pltAvI = pltI['Av']
+        self.pltVgI = pltI['Vgs']
+        self.pltVdsatI = pltI['Vdsat']
+
+    @gp.profiled
+    def gateLCurve(self, cornerIndex, gateCurve):
+        '''Plot items of the Vth, and the Avo and Ft of every inversion level as a function of L from ge.gateLCurves'''
         listVth = lp.lookupfz(self.mosCorner[cornerIndex], self.mosModel, 'VT', VDS=self.halfVGS, VSB=0, L=self.listLChk, VGS=self.halfVGS)
         self.curveVthCorner[cornerIndex] = pg.PlotDataItem( 1000*self.listLChk, listVth, pen = self.cornerPen[cornerIndex], symbolBrush = (255,0,0), symbolPen = 'w', symbol = 'o', clear=True)
-        # Generate Curve for WI, SI, MI
-        w1Vgs = 0.0
-        w1State = 0
-        w1PltAv = []
-        w1PltFt = []
-        w1PltL = []
-        s0Vgs = 0.0
-        s0State = 0
-        s0PltAv = []
-        s0PltFt = []
-        s0PltL = []
-        for swL in self.listLChk:
-            #print ('Curve for Av + Ft @ L = %1.3f in %s corner' % (swL, self.listCorner[cornerIndex]))
-            w1Vgs, w1State = self.SearchVGSG( cornerIndex, const.GMIDLW1, swL, 3)
-            s0Vgs, s0State = self.SearchVGSG( cornerIndex, const.GMIDLS0, swL, 3)
-            if w1State == 1:
-                self.w1LReady[cornerIndex] = 1
-                w1PltL.append(1000*swL)
-                w1PltAv.append(lp.lookupfz(self.mosCorner[cornerIndex], self.mosModel, 'SELF_GAIN', VDS=self.VDS, VSB=self.VSB, L=swL, VGS=w1Vgs))
-                w1PltFt.append(lp.lookupfz(self.mosCorner[cornerIndex], self.mosModel, 'FUG', VDS=self.VDS, VSB=self.VSB, L=swL, VGS=w1Vgs))
-            if s0State == 1:
-                self.s0LReady[cornerIndex] = 1
-                s0PltL.append(1000*swL)
-                s0PltAv.append(lp.lookupfz(self.mosCorner[cornerIndex], self.mosModel, 'SELF_GAIN', VDS=self.VDS, VSB=self.VSB, L=swL, VGS=s0Vgs))
-                s0PltFt.append(lp.lookupfz(self.mosCorner[cornerIndex], self.mosModel, 'FUG', VDS=self.VDS, VSB=self.VSB, L=swL, VGS=s0Vgs))
-        # Add Curve
-        if (self.w1LReady[cornerIndex] == 1):
-            self.curveAvW1Corner[cornerIndex] = pg.PlotDataItem( w1PltL, w1PltAv, symbolBrush=const.COLORW1, symbolPen = 'w', symbol = const.SYMW1, name = const.NAMEW1, pen = self.cornerPen[cornerIndex], clear=True)
-            self.curveFtW1Corner[cornerIndex] = pg.PlotDataItem( w1PltL, w1PltFt, symbolBrush=const.COLORW1, symbolPen = 'w', symbol = const.SYMW1, name = const.NAMEW1, pen = self.cornerPen[cornerIndex], clear=True)
-        if (self.s0LReady[cornerIndex] == 1):
-            self.curveAvS0Corner[cornerIndex] = pg.PlotDataItem( s0PltL, s0PltAv, symbolBrush=const.COLORS0, symbolPen = 'w', symbol = const.SYMS0, name = const.NAMES0, pen = self.cornerPen[cornerIndex], clear=True)
-            self.curveFtS0Corner[cornerIndex] = pg.PlotDataItem( s0PltL, s0PltFt, symbolBrush=const.COLORS0, symbolPen = 'w', symbol = const.SYMS0, name = const.NAMES0, pen = self.cornerPen[cornerIndex], clear=True)
-
-    def gmIdCurve(self, cornerIndex):
-        # All Curve For Des-L
-        listId = lp.lookupfz(self.mosCorner[cornerIndex], self.mosModel, 'ID', VDS=self.VDS, VSB=self.VSB, L=self.L, VGS=self.listVGS)
-        listGmOverId = lp.lookupfz(self.mosCorner[cornerIndex], self.mosModel, 'GMOVERID', VDS=self.VDS, VSB=self.VSB, L=self.L, VGS=self.listVGS)
-        listFt = lp.lookupfz(self.mosCorner[cornerIndex], self.mosModel, 'FUG', VDS=self.VDS, VSB=self.VSB, L=self.L, VGS=self.listVGS)
-        listAv = lp.lookupfz(self.mosCorner[cornerIndex], self.mosModel, 'SELF_GAIN', VDS=self.VDS, VSB=self.VSB, L=self.L, VGS=self.listVGS)
+        # Curve for WI, MI, SI
+        for level in range(len(const.GMIDL)):
+            found = (gateCurve['state'][level] == 1)
+            self.lReady[level][cornerIndex] = int(np.any(found))
+            if self.lReady[level][cornerIndex] == 0:
+                self.curveAvLCorner[level][cornerIndex] = None
+                self.curveFtLCorner[level][cornerIndex] = None
+                continue
+            gatePltL = 1000*self.listLChk[found]
+            self.curveAvLCorner[level][cornerIndex] = pg.PlotDataItem( gatePltL, gateCurve['Av'][level][found], symbolBrush=const.COLORL[level], symbolPen = 'w', symbol = const.SYML[level], name = const.NAMEL[level], pen = self.cornerPen[cornerIndex], clear=True)
+            self.curveFtLCorner[level][cornerIndex] = pg.PlotDataItem( gatePltL, gateCurve['Ft'][level][found], symbolBrush=const.COLORL[level], symbolPen = 'w', symbol = const.SYML[level], name = const.NAMEL[level], pen = self.cornerPen[cornerIndex], clear=True)
+            self.curveAvLCorner[level][cornerIndex].setVisible(False)
+            self.curveFtLCorner[level][cornerIndex].setVisible(False)
+
+    @gp.profiled
+    def gmIdCurve(self, cornerIndex, desCurve, refCurve):
+        '''Plot items of the curves from ge.gmIdCurve at Des-L and Ref-L'''
+        # All Curve for Des-L
         ## Vgs Curve
-        self.corCurveIdDDes[cornerIndex] = pg.PlotDataItem( self.listVGS, listId, pen = self.cornerPen[cornerIndex], clear=True)
-        self.corCurveFtDDes[cornerIndex] = pg.PlotDataItem( self.listVGS, listFt, pen = self.cornerPen[cornerIndex], clear=True)
-        self.corCurveAvDDes[cornerIndex] = pg.PlotDataItem( self.listVGS, listAv, pen = self.cornerPen[cornerIndex], clear=True)
-        self.corCurveFomDDes[cornerIndex]= pg.PlotDataItem( self.listVGS, listFt * listGmOverId, pen = self.cornerPen[cornerIndex], clear=True)
+        self.corCurveIdDDes[cornerIndex] = pg.PlotDataItem( desCurve['VGS']['x'], desCurve['VGS']['Id'], pen = self.cornerPen[cornerIndex], clear=True)
+        self.corCurveFtDDes[cornerIndex] = pg.PlotDataItem( desCurve['VGS']['x'], desCurve['VGS']['Ft'], pen = self.cornerPen[cornerIndex], clear=True)
+        self.corCurveAvDDes[cornerIndex] = pg.PlotDataItem( desCurve['VGS']['x'], desCurve['VGS']['Av'], pen = self.cornerPen[cornerIndex], clear=True)
+        self.corCurveFomDDes[cornerIndex] = pg.PlotDataItem( desCurve['VGS']['x'], desCurve['VGS']['Fom'], pen = self.cornerPen[cornerIndex], clear=True)
         ## VstarCurve
-        listVstar = 2*np.reciprocal(listGmOverId)
-        csIdV = CubicSpline( listVstar, listId)
-        csFtV = CubicSpline( listVstar, listFt)
-        csAvV = CubicSpline( listVstar, listAv)
-        #pltVstar = np.arange( listVstar.min(), listVstar.max(), 0.001)
-        pltVstar = np.arange( self.minVstar, self.maxVstar, 0.0005)
-        pltIdV = csIdV(pltVstar)
-        pltFtV = csFtV(pltVstar)
-        pltAvV = csAvV(pltVstar)
-        self.corCurveIdVDes[cornerIndex] = pg.PlotDataItem( pltVstar, pltIdV, pen = self.cornerPen[cornerIndex], clear=True)
-        self.corCurveFtVDes[cornerIndex] = pg.PlotDataItem( pltVstar, pltFtV, pen = self.cornerPen[cornerIndex], clear=True)
-        self.corCurveAvVDes[cornerIndex] = pg.PlotDataItem( pltVstar, pltAvV, pen = self.cornerPen[cornerIndex], clear=True)
-        self.corCurveFomVDes[cornerIndex]= pg.PlotDataItem( pltVstar, 2.0 * pltFtV / pltVstar, pen = self.cornerPen[cornerIndex], clear=True)
+        self.corCurveIdVDes[cornerIndex] = pg.PlotDataItem( desCurve['Vstar']['x'], desCurve['Vstar']['Id'], pen = self.cornerPen[cornerIndex], clear=True)
+        self.corCurveFtVDes[cornerIndex] = pg.PlotDataItem( desCurve['Vstar']['x'], desCurve['Vstar']['Ft'], pen = self.cornerPen[cornerIndex], clear=True)
+        self.corCurveAvVDes[cornerIndex] = pg.PlotDataItem( desCurve['Vstar']['x'], desCurve['Vstar']['Av'], pen = self.cornerPen[cornerIndex], clear=True)
+        self.corCurveFomVDes[cornerIndex] = pg.PlotDataItem( desCurve['Vstar']['x'], desCurve['Vstar']['Fom'], pen = self.cornerPen[cornerIndex], clear=True)
         ## GmOverId Curve
-        listGmId = np.flip(listGmOverId, 0)
-        listIdG = np.flip(listId, 0)
-        listFtG = np.flip(listFt, 0)
-        listAvG = np.flip(listAv, 0)
-        csIdG = CubicSpline( listGmId, listIdG)
-        csFtG = CubicSpline( listGmId, listFtG)
-        csAvG = CubicSpline( listGmId, listAvG)
-        pltGmId = np.arange( self.minGmId, self.maxGmId, 0.01)
-        pltIdG = csIdG(pltGmId)
-        pltFtG = csFtG(pltGmId)
-        pltAvG = csAvG(pltGmId)
-        self.corCurveIdGDes[cornerIndex] = pg.PlotDataItem( pltGmId, pltIdG, pen = self.cornerPen[cornerIndex], clear=True)
-        self.corCurveFtGDes[cornerIndex] = pg.PlotDataItem( pltGmId, pltFtG, pen = self.cornerPen[cornerIndex], clear=True)
-        self.corCurveAvGDes[cornerIndex] = pg.PlotDataItem( pltGmId, pltAvG, pen = self.cornerPen[cornerIndex], clear=True)
-        self.corCurveFomGDes[cornerIndex]= pg.PlotDataItem( pltGmId, pltGmId * pltFtG, pen = self.cornerPen[cornerIndex], clear=True)
+        self.corCurveIdGDes[cornerIndex] = pg.PlotDataItem( desCurve['GmId']['x'], desCurve['GmId']['Id'], pen = self.cornerPen[cornerIndex], clear=True)
+        self.corCurveFtGDes[cornerIndex] = pg.PlotDataItem( desCurve['GmId']['x'], desCurve['GmId']['Ft'], pen = self.cornerPen[cornerIndex], clear=True)
+        self.corCurveAvGDes[cornerIndex] = pg.PlotDataItem( desCurve['GmId']['x'], desCurve['GmId']['Av'], pen = self.cornerPen[cornerIndex], clear=True)
+        self.corCurveFomGDes[cornerIndex] = pg.PlotDataItem( desCurve['GmId']['x'], desCurve['GmId']['Fom'], pen = self.cornerPen[cornerIndex], clear=True)
         ## Id Curve
-        listIdI = np.log10(listId)
-        csGmI = CubicSpline( listIdI, listGmOverId)
-        csFtI = CubicSpline( listIdI, listFt)
-        csAvI = CubicSpline( listIdI, listAv)
-        pltIdI = np.arange( listIdI.min(), listIdI.max(), 0.05)
-        pltGmI = csGmI(pltIdI)
-        pltFtI = csFtI(pltIdI)
-        pltAvI = csAvI(pltIdI)
-        self.corCurveGmIDes[cornerIndex] = pg.PlotDataItem( pltIdI, pltGmI, pen = self.cornerPen[cornerIndex], clear=True)
-        self.corCurveFtIDes[cornerIndex] = pg.PlotDataItem( pltIdI, pltFtI, pen = self.cornerPen[cornerIndex], clear=True)
-        self.corCurveAvIDes[cornerIndex] = pg.PlotDataItem( pltIdI, pltAvI, pen = self.cornerPen[cornerIndex], clear=True)
-        self.corCurveFomIDes[cornerIndex] = pg.PlotDataItem( pltIdI, pltFtI*pltGmI, pen = self.cornerPen[cornerIndex], clear=True)
+        self.corCurveGmIDes[cornerIndex] = pg.PlotDataItem( desCurve['Id']['x'], desCurve['Id']['GmId'], pen = self.cornerPen[cornerIndex], clear=True)
+        self.corCurveFtIDes[cornerIndex] = pg.PlotDataItem( desCurve['Id']['x'], desCurve['Id']['Ft'], pen = self.cornerPen[cornerIndex], clear=True)
+        self.corCurveAvIDes[cornerIndex] = pg.PlotDataItem( desCurve['Id']['x'], desCurve['Id']['Av'], pen = self.cornerPen[cornerIndex], clear=True)
+        self.corCurveFomIDes[cornerIndex] = pg.PlotDataItem( desCurve['Id']['x'], desCurve['Id']['Fom'], pen = self.cornerPen[cornerIndex], clear=True)
         # All Curve for Ref-L
-        listId = lp.lookupfz(self.mosCorner[cornerIndex], self.mosModel, 'ID', VDS=self.VDS, VSB=self.VSB, L=self.Lref, VGS=self.listVGS)
-        listGmOverId = lp.lookupfz(self.mosCorner[cornerIndex], self.mosModel, 'GMOVERID', VDS=self.VDS, VSB=self.VSB, L=self.Lref, VGS=self.listVGS)
-        listFt = lp.lookupfz(self.mosCorner[cornerIndex], self.mosModel, 'FUG', VDS=self.VDS, VSB=self.VSB, L=self.Lref, VGS=self.listVGS)
-        listAv = lp.lookupfz(self.mosCorner[cornerIndex], self.mosModel, 'SELF_GAIN', VDS=self.VDS, VSB=self.VSB, L=self.Lref, VGS=self.listVGS)
         ## Vgs Curve
-        self.corCurveIdDRef[cornerIndex] = pg.PlotDataItem( self.listVGS, listId, pen = self.refPen, clear=True)
-        self.corCurveFtDRef[cornerIndex] = pg.PlotDataItem( self.listVGS, listFt, pen = self.refPen, clear=True)
-        self.corCurveAvDRef[cornerIndex] = pg.PlotDataItem( self.listVGS, listAv, pen = self.refPen, clear=True)
-        self.corCurveFomDRef[cornerIndex]= pg.PlotDataItem( self.listVGS, listFt * listGmOverId, pen = self.refPen, clear=True)
+        self.corCurveIdDRef[cornerIndex] = pg.PlotDataItem( refCurve['VGS']['x'], refCurve['VGS']['Id'], pen = self.refPen, clear=True)
+        self.corCurveFtDRef[cornerIndex] = pg.PlotDataItem( refCurve['VGS']['x'], refCurve['VGS']['Ft'], pen = self.refPen, clear=True)
+        self.corCurveAvDRef[cornerIndex] = pg.PlotDataItem( refCurve['VGS']['x'], refCurve['VGS']['Av'], pen = self.refPen, clear=True)
+        self.corCurveFomDRef[cornerIndex] = pg.PlotDataItem( refCurve['VGS']['x'], refCurve['VGS']['Fom'], pen = self.refPen, clear=True)
         ## VstarCurve
-        listVstar = 2*np.reciprocal(listGmOverId)
-        csIdV = CubicSpline( listVstar, listId)
-        csFtV = CubicSpline( listVstar, listFt)
-        csAvV = CubicSpline( listVstar, listAv)
-        pltIdV = csIdV(pltVstar)
-        pltFtV = csFtV(pltVstar)
-        pltAvV = csAvV(pltVstar)
-        self.corCurveIdVRef[cornerIndex] = pg.PlotDataItem( pltVstar, pltIdV, pen = self.refPen, clear=True)
-        self.corCurveFtVRef[cornerIndex] = pg.PlotDataItem( pltVstar, pltFtV, pen = self.refPen, clear=True)
-        self.corCurveAvVRef[cornerIndex] = pg.PlotDataItem( pltVstar, pltAvV, pen = self.refPen, clear=True)
-        self.corCurveFomVRef[cornerIndex]= pg.PlotDataItem( pltVstar, 2.0 * pltFtV / pltVstar, pen = self.refPen, clear=True)
-        ## GmOverID Curve
-        listGmId = np.flip(listGmOverId, 0)
-        listIdG = np.flip(listId, 0)
-        listFtG = np.flip(listFt, 0)
-        listAvG = np.flip(listAv, 0)
-        csIdG = CubicSpline( listGmId, listIdG)
-        csFtG = CubicSpline( listGmId, listFtG)
-        csAvG = CubicSpline( listGmId, listAvG)
-        pltIdG = csIdG(pltGmId)
-        pltFtG = csFtG(pltGmId)
-        pltAvG = csAvG(pltGmId)
-        self.corCurveIdGRef[cornerIndex] = pg.PlotDataItem( pltGmId, pltIdG, pen = self.refPen, clear=True)
-        self.corCurveFtGRef[cornerIndex] = pg.PlotDataItem( pltGmId, pltFtG, pen = self.refPen, clear=True)
-        self.corCurveAvGRef[cornerIndex] = pg.PlotDataItem( pltGmId, pltAvG, pen = self.refPen, clear=True)
-        self.corCurveFomGRef[cornerIndex]= pg.PlotDataItem( pltGmId, pltGmId * pltFtG, pen = self.refPen, clear=True)
+        self.corCurveIdVRef[cornerIndex] = pg.PlotDataItem( refCurve['Vstar']['x'], refCurve['Vstar']['Id'], pen = self.refPen, clear=True)
+        self.corCurveFtVRef[cornerIndex] = pg.PlotDataItem( refCurve['Vstar']['x'], refCurve['Vstar']['Ft'], pen = self.refPen, clear=True)
+        self.corCurveAvVRef[cornerIndex] = pg.PlotDataItem( refCurve['Vstar']['x'], refCurve['Vstar']['Av'], pen = self.refPen, clear=True)
+        self.corCurveFomVRef[cornerIndex] = pg.PlotDataItem( refCurve['Vstar']['x'], refCurve['Vstar']['Fom'], pen = self.refPen, clear=True)
+        ## GmOverId Curve
+        self.corCurveIdGRef[cornerIndex] = pg.PlotDataItem( refCurve['GmId']['x'], refCurve['GmId']['Id'], pen = self.refPen, clear=True)
+        self.corCurveFtGRef[cornerIndex] = pg.PlotDataItem( refCurve['GmId']['x'], refCurve['GmId']['Ft'], pen = self.refPen, clear=True)
+        self.corCurveAvGRef[cornerIndex] = pg.PlotDataItem( refCurve['GmId']['x'], refCurve['GmId']['Av'], pen = self.refPen, clear=True)
+        self.corCurveFomGRef[cornerIndex] = pg.PlotDataItem( refCurve['GmId']['x'], refCurve['GmId']['Fom'], pen = self.refPen, clear=True)
         ## Id Curve
-        listIdI = np.log10(listId)
-        csGmI = CubicSpline( listIdI, listGmOverId)
-        csFtI = CubicSpline( listIdI, listFt)
-        csAvI = CubicSpline( listIdI, listAv)
-        pltIdI = np.arange( listIdI.min(), listIdI.max(), 0.05)
-        pltGmI = csGmI(pltIdI)
-        pltFtI = csFtI(pltIdI)
-        pltAvI = csAvI(pltIdI)
-        self.corCurveGmIRef[cornerIndex] = pg.PlotDataItem( pltIdI, pltGmI, pen = self.refPen, clear=True)
-        self.corCurveFtIRef[cornerIndex] = pg.PlotDataItem( pltIdI, pltFtI, pen = self.refPen, clear=True)
-        self.corCurveAvIRef[cornerIndex] = pg.PlotDataItem( pltIdI, pltAvI, pen = self.refPen, clear=True)
-        self.corCurveFomIRef[cornerIndex]= pg.PlotDataItem(pltIdI, pltFtI*pltGmI, pen = self.refPen, clear=True)
+        self.corCurveGmIRef[cornerIndex] = pg.PlotDataItem( refCurve['Id']['x'], refCurve['Id']['GmId'], pen = self.refPen, clear=True)
+        self.corCurveFtIRef[cornerIndex] = pg.PlotDataItem( refCurve['Id']['x'], refCurve['Id']['Ft'], pen = self.refPen, clear=True)
+        self.corCurveAvIRef[cornerIndex] = pg.PlotDataItem( refCurve['Id']['x'], refCurve['Id']['Av'], pen = self.refPen, clear=True)
+        self.corCurveFomIRef[cornerIndex] = pg.PlotDataItem( refCurve['Id']['x'], refCurve['Id']['Fom'], pen = self.refPen, clear=True)
 
     def visibleRef(self, curveState):
         ''' TurnOff the Ref Curve'''
@@ -1559,16 +1752,19 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
         self.corCurveAvIDes[curveIndex].setVisible(curveState)
         self.corCurveFomIDes[curveIndex].setVisible(curveState)
 
-    def visibleLCurve(self, invIndex, curveState):
-        if invIndex == 0:
-            self.curveAvW1Corner[self.tgtCorner].setVisible(curveState)
-            self.curveFtW1Corner[self.tgtCorner].setVisible(curveState)
-        else:
-            self.curveAvS0Corner[self.tgtCorner].setVisible(curveState)
-            self.curveFtS0Corner[self.tgtCorner].setVisible(curveState)
+    def visibleLCurve(self):
+        '''Show the L curves of the checked inversion regions (const.INVL) for the design corner only'''
+        invState = [self.ui.checkBoxLWI.isChecked(), self.ui.checkBoxLMI.isChecked(), self.ui.checkBoxLSI.isChecked()]
+        for i in range(len(self.listCorner)):
+            for level in range(len(const.GMIDL)):
+                if self.lReady[level][i] == 1:
+                    curveState = (i == self.tgtCorner) and invState[const.INVL[level]]
+                    self.curveAvLCorner[level][i].setVisible(curveState)
+                    self.curveFtLCorner[level][i].setVisible(curveState)
 
+    @gp.profiledSlot
     def topMouseMovedVgs(self, evt):
-        mousePoint = self.ui.topLPlotVgs.plotItem.vb.mapSceneToView(evt)
+        mousePoint = self.ui.topLPlotVgs.plotItem.vb.mapSceneToView(evt[0])
         self.topLVLineVgs.setPos(mousePoint.x())
         self.topRVLineVgs.setPos(mousePoint.x())
         self.botLVLineVgs.setPos(mousePoint.x())
@@ -1576,30 +1772,17 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
         if (self.curveReady == 1):
             index = np.searchsorted( self.listVGS, mousePoint.x(), side="left")
             if index > 0 and index < len(self.listVGS):
-                self.ui.labelId.setText(self.sciPrint(self.listId[index], 'A'))
-                self.ui.labelFt.setText(self.sciPrint(self.listFt[index], 'Hz'))
-                self.ui.labelVgs.setText(self.sciPrint(self.listVGS[index], 'V'))
-                self.ui.labelVdsat.setText(self.sciPrint(self.listVdsat[index], 'V'))
-                self.ui.labelGain.setText(self.sciPrint(self.listAv[index], 'V/V'))
-                self.ui.labelFOM.setText(self.sciPrint((self.listFt[index]*self.listGmId[index]),'Hz/V'))
-                # TODO Fix the Error
-                self.ui.labelVstar.setText(self.sciPrint(2.0/self.listGmId[index], 'V'))
-                self.ui.labelGmId.setText(self.sciPrint(self.listGmId[index], '1/V'))
-                #self.ui.labelGmId.setText('---')
-                #self.ui.labelVstar.setText('---')
+                if self.readoutSame(self.listId, index):
+                    return
+                self.setReadout([self.listId[index], self.listGmId[index], 2.0/self.listGmId[index], self.listFt[index],
+                                 self.listVGS[index], self.listVdsat[index], self.listAv[index], self.listFt[index]*self.listGmId[index]])
             else:
-                self.ui.labelId.setText('---')
-                self.ui.labelGmId.setText('---')
-                self.ui.labelFt.setText('---')
-                self.ui.labelVgs.setText('---')
-                self.ui.labelVdsat.setText('---')
-                self.ui.labelFOM.setText('---')
-                self.ui.labelVstar.setText('---')
-                self.ui.labelGain.setText('---')
+                self.clearReadout()
 
+    @gp.profiledSlot
     def topMouseMovedVstar(self, evt):
         '''Read out the number at the point'''
-        mousePoint = self.ui.topLPlotVstar.plotItem.vb.mapSceneToView(evt)
+        mousePoint = self.ui.topLPlotVstar.plotItem.vb.mapSceneToView(evt[0])
         self.topLVLineVstar.setPos(mousePoint.x())
         self.topRVLineVstar.setPos(mousePoint.x())
         self.botLVLineVstar.setPos(mousePoint.x())
@@ -1607,27 +1790,17 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
         if (self.curveReady == 1):
             index = np.searchsorted( self.pltVstar, mousePoint.x(), side="left")
             if index > 0 and index < len(self.pltVstar):
-                self.ui.labelId.setText(self.sciPrint(self.pltIdV[index], 'A'))
-                self.ui.labelVstar.setText(self.sciPrint(self.pltVstar[index], 'V'))
-                self.ui.labelGmId.setText(self.sciPrint((2.0/self.pltVstar[index]), '1/V'))
-                self.ui.labelFt.setText(self.sciPrint(self.pltFtV[index], 'Hz'))
-                self.ui.labelVgs.setText(self.sciPrint(self.pltVgV[index], 'V'))
-                self.ui.labelVdsat.setText(self.sciPrint(self.pltVdsatV[index], 'V'))
-                self.ui.labelGain.setText(self.sciPrint(self.pltAvV[index], 'V/V'))
-                self.ui.labelFOM.setText(self.sciPrint((2.0*self.pltFtV[index]/self.pltVstar[index]),'Hz/V'))
+                if self.readoutSame(self.pltIdV, index):
+                    return
+                self.setReadout([self.pltIdV[index], 2.0/self.pltVstar[index], self.pltVstar[index], self.pltFtV[index],
+                                 self.pltVgV[index], self.pltVdsatV[index], self.pltAvV[index], 2.0*self.pltFtV[index]/self.pltVstar[index]])
             else:
-                self.ui.labelId.setText('---')
-                self.ui.labelGmId.setText('---')
-                self.ui.labelFt.setText('---')
-                self.ui.labelVgs.setText('---')
-                self.ui.labelVdsat.setText('---')
-                self.ui.labelFOM.setText('---')
-                self.ui.labelVstar.setText('---')
-                self.ui.labelGain.setText('---')
+                self.clearReadout()
 
+    @gp.profiledSlot
     def topMouseMovedGmId(self, evt):
         '''Read out the number at the point'''
-        mousePointG = self.ui.topLPlotGmId.plotItem.vb.mapSceneToView(evt)
+        mousePointG = self.ui.topLPlotGmId.plotItem.vb.mapSceneToView(evt[0])
         self.topLVLineGmId.setPos(mousePointG.x())
         self.topRVLineGmId.setPos(mousePointG.x())
         self.botRVLineGmId.setPos(mousePointG.x())
@@ -1635,27 +1808,17 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
         if (self.curveReady == 1):
             index = np.searchsorted( self.pltGmId, mousePointG.x(), side="left")
             if index > 0 and index < len(self.pltGmId):
-                self.ui.labelId.setText(self.sciPrint(self.pltIdG[index], 'A'))
-                self.ui.labelVstar.setText(self.sciPrint((2.0/self.pltGmId[index]), 'V'))
-                self.ui.labelGmId.setText(self.sciPrint(self.pltGmId[index], '1/V'))
-                self.ui.labelFt.setText(self.sciPrint(self.pltFtG[index], 'Hz'))
-                self.ui.labelVgs.setText(self.sciPrint(self.pltVgG[index], 'V'))
-                self.ui.labelVdsat.setText(self.sciPrint(self.pltVdsatG[index], 'V'))
-                self.ui.labelGain.setText(self.sciPrint(self.pltAvG[index], 'V/V'))
-                self.ui.labelFOM.setText(self.sciPrint((self.pltFtG[index]*self.pltGmId[index]),'Hz/V'))
+                if self.readoutSame(self.pltIdG, index):
+                    return
+                self.setReadout([self.pltIdG[index], self.pltGmId[index], 2.0/self.pltGmId[index], self.pltFtG[index],
+                                 self.pltVgG[index], self.pltVdsatG[index], self.pltAvG[index], self.pltFtG[index]*self.pltGmId[index]])
             else:
-                self.ui.labelId.setText('---')
-                self.ui.labelGmId.setText('---')
-                self.ui.labelFt.setText('---')
-                self.ui.labelVgs.setText('---')
-                self.ui.labelVdsat.setText('---')
-                self.ui.labelFOM.setText('---')
-                self.ui.labelVstar.setText('---')
-                self.ui.labelGain.setText('---')
+                self.clearReadout()
 
+    @gp.profiledSlot
     def topMouseMovedId(self, evt):
         '''Read out the number at the point'''
-        mousePointI = self.ui.topLPlotId.plotItem.vb.mapSceneToView(evt)
+        mousePointI = self.ui.topLPlotId.plotItem.vb.mapSceneToView(evt[0])
         self.topLVLineId.setPos(mousePointI.x())
         self.topRVLineId.setPos(mousePointI.x())
         self.botRVLineId.setPos(mousePointI.x())
@@ -1663,52 +1826,84 @@ class gmIdGUIWindow(QtWidgets.QMainWindow):
         if (self.curveReady == 1):
             index = np.searchsorted( self.pltIdI, mousePointI.x(), side="left")
             if index > 0 and index < len(self.pltIdI):
-                self.ui.labelId.setText(self.sciPrint( (10**self.pltIdI[index]), 'A'))
-                self.ui.labelVstar.setText(self.sciPrint((2.0/self.pltGmI[index]), 'V'))
-                self.ui.labelGmId.setText(self.sciPrint(self.pltGmI[index], '1/V'))
-                self.ui.labelFt.setText(self.sciPrint(self.pltFtI[index], 'Hz'))
-                self.ui.labelVgs.setText(self.sciPrint(self.pltVgI[index], 'V'))
-                self.ui.labelVdsat.setText(self.sciPrint(self.pltVdsatI[index], 'V'))
-                self.ui.labelGain.setText(self.sciPrint(self.pltAvI[index], 'V/V'))
-                self.ui.labelFOM.setText(self.sciPrint((self.pltFtI[index]*self.pltGmI[index]),'Hz/V'))
+                if self.readoutSame(self.pltIdI, index):
+                    return
+                self.setReadout([10**self.pltIdI[index], self.pltGmI[index], 2.0/self.pltGmI[index], self.pltFtI[index],
+                                 self.pltVgI[index], self.pltVdsatI[index], self.pltAvI[index], self.pltFtI[index]*self.pltGmI[index]])
             else:
-                self.ui.labelId.setText('---')
-                self.ui.labelGmId.setText('---')
-                self.ui.labelFt.setText('---')
-                self.ui.labelVgs.setText('---')
-                self.ui.labelVdsat.setText('---')
-                self.ui.labelFOM.setText('---')
-                self.ui.labelVstar.setText('---')
-                self.ui.labelGain.setText('---')
+                self.clearReadout()
 
+    @gp.profiledSlot
     def topMouseMovedL(self, evt):
         '''Read out the number at the point'''
-        mousePointI = self.ui.topLPlotL.plotItem.vb.mapSceneToView(evt)
+        mousePointI = self.ui.topLPlotL.plotItem.vb.mapSceneToView(evt[0])
         if (self.optOpptReady == 1):
             index = np.searchsorted( self.optPltL, mousePointI.x(), side="left")
             if index >= 0 and index < len(self.optPltL):
+                if self.readoutSame(self.optPltL, index):
+                    return
                 self.topLVLineL.setPos(self.optPltL[index])
                 self.topRVLineL.setPos(self.optPltL[index])
                 self.botLVLineL.setPos(self.optPltL[index])
                 self.botRVLineL.setPos(self.optPltL[index])
-                self.ui.labelId.setText('---')
-                self.ui.labelGmId.setText(self.sciPrint((2.0/self.optPltVstar[index]), '1/V'))
-                self.ui.labelFt.setText(self.sciPrint(self.optPltFt[index], 'Hz'))
-                self.ui.labelVgs.setText(self.sciPrint(self.optPltVgs[index], 'V'))
-                self.ui.labelVdsat.setText(self.sciPrint(self.optPltVdsat[index], 'V'))
-                self.ui.labelVstar.setText(self.sciPrint( self.optPltVstar[index], 'V'))
-                self.ui.labelFOM.setText('---')
-                self.ui.labelGain.setText(self.sciPrint(self.optPltAvo[index], 'V/V'))
+                self.setReadout([None, 2.0/self.optPltVstar[index], self.optPltVstar[index], self.optPltFt[index],
+                                 self.optPltVgs[index], self.optPltVdsat[index], self.optPltAvo[index], None])
+
+    @gp.profiledSlot
+    def mouseMovedPareto(self, plotIndex, evt):
+        '''Read out the front point nearest to the mouse on any of the Pareto plots'''
+        if self.frontReady == 0:
+            return
+        viewBox = self.frontPlots[plotIndex].plotItem.vb
+        mousePoint = viewBox.mapSceneToView(evt[0])
+        (xMin, xMax), (yMin, yMax) = viewBox.viewRange()
+        viewX, viewY = self.frontView[plotIndex]
+        index = int(np.argmin(((viewX - mousePoint.x())/(xMax - xMin))**2 + ((viewY - mousePoint.y())/(yMax - yMin))**2))
+        frontRes = self.frontRes
+        if self.readoutSame(frontRes['Id'], index):
+            return
+        for mark, (frontX, frontY) in zip(self.markFront, self.pltFront):
+            mark.setData([frontX[index]], [frontY[index]])
+        self.setReadout([frontRes['Id'][index], frontRes['GmId'][index], frontRes['Vstar'][index], frontRes['Ft'][index],
+                         frontRes['Vgs'][index], frontRes['Vdsat'][index], frontRes['Avo'][index], frontRes['Ft'][index]*frontRes['GmId'][index]])
+        self.ui.labelLog.setText('L = %s  W = %s  Cgg = %s' % (engPrint(frontRes['L'][index]*0.000001, 'm'),
+                                 engPrint(frontRes['W'][index]*0.000001, 'm'), engPrint(frontRes['Cgg'][index], 'F')))
+
+    def readoutSame(self, readSrc, index):
+        '''True if the readout already shows the point, else the point is kept as the shown one
+
+        readSrc is an array made anew with every curve, so a new curve under the mouse is read out again.
+        '''
+        if readSrc is self.readSrc and index == self.readIndex:
+            return True
+        self.readSrc = readSrc
+        self.readIndex = index
+        return False
+
+    def setReadout(self, readVals):
+        '''Show the values in the readout labels, None shows ---'''
+        shown = [i for i, readVal in enumerate(readVals) if readVal is not None]
+        readText = dict((i, engPrint(readVals[i], self.readUnits[i])) for i in shown)
+        for i, readLabel in enumerate(self.readLabels):
+            readLabel.setText(readText.get(i, '---'))
+
+    def clearReadout(self):
+        if self.readIndex is not None:
+            self.readSrc = None
+            self.readIndex = None
+            for readLabel in self.readLabels:
+                readLabel.setText('---')
 
     def sciPrint( self, rawNum, unit):
         '''Print the rawNum with autoscale'''
-        shiftNum = (decimal.Decimal(str(rawNum)) * decimal.Decimal('1E33')).normalize()
-        preNum, scaleNum= shiftNum.to_eng_string().split('E')
-        quanNum = decimal.Decimal(preNum).quantize(decimal.Decimal('.001'))
-        scaleChar = const.UNIT_PREFIX[int(scaleNum)//3]
-        return str(quanNum) + " " + scaleChar + unit
+        return engPrint(rawNum, unit)
 
     def closeEvent( self, event):
+        self.jobRunner.cancelAll()
+        self.threadpool.waitForDone()
+        # Stats of the session if the profiler was used
+        if gp.profiler.records:
+            print (gp.profiler.report(), file=sys.stderr)
         event.accept()
 
 # Part 3 GUI Excute
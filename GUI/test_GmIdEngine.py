@@ -0,0 +1,119 @@
+# Tests of the headless sizing engine against scipy and brute force references
+# Usage : python -m pytest -q test_GmIdEngine.py
+
+import numpy as np
+import pytest
+from scipy.interpolate import CubicSpline, PchipInterpolator
+# import library for mos lookup and sizing
+import LupMos as lp
+import GmIdEngine as ge
+
+def nonDominated(costs):
+    '''Brute force : the rows no other row beats in all the objectives'''
+    beaten = np.all(costs[None, :, :] <= costs[:, None, :], axis=-1) & np.any(costs[None, :, :] < costs[:, None, :], axis=-1)
+    return np.nonzero(~beaten.any(axis=1))[0]
+
+def designCandidates(mosTab, sizeMode, target, VSB, maxVDS, listL):
+    '''Every point of the GmIdTable at VSB sized to the target by hand'''
+    gmIdTab = mosTab.gmIdTab
+    mosW = ge.devWidth(mosTab)
+    vsbInd = int(np.argmin(np.abs(-gmIdTab.vsbf - VSB)))
+    VDS, GmId, L = np.meshgrid(gmIdTab.vdsf, gmIdTab.vgsf, gmIdTab.lf, indexing='ij')
+    candDat = dict((varName, np.asarray(gmIdTab[varName])[vsbInd]) for varName in ['GM', 'ID', 'FUG', 'SELF_GAIN', 'VDSAT'])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        W = {ge.SIZE_GM : target / candDat['GM'] * mosW, ge.SIZE_ID : target / candDat['ID'] * mosW, ge.SIZE_AREA : target / L}[sizeMode]
+        candDat['W'] = W
+        candDat['Id'] = target + 0.0 * W if sizeMode == ge.SIZE_ID else W * candDat['ID'] / mosW
+        candDat['Gm'] = target + 0.0 * W if sizeMode == ge.SIZE_GM else W * candDat['GM'] / mosW
+        candDat['Area'] = target + 0.0 * W if sizeMode == ge.SIZE_AREA else W * L
+        candDat['ok'] = ((VDS > 0) & (VDS <= maxVDS + 1e-12) & np.isin(L, listL) & np.isfinite(W) & (W > 0)
+                         & (candDat['VDSAT'] <= VDS))
+    candDat.update(VDS=VDS, GmId=GmId, L=L)
+    return candDat
+
+def frontPoints(designRes, index=None):
+    '''(L, VDS, GmId) of the front rounded for set comparison'''
+    columns = [designRes[key] if index is None else designRes[key][index] for key in ['L', 'VDS', 'GmId']]
+    return set(zip(*[np.round(column, 9) for column in columns]))
+
+def testOptOpMosIterMatchesSweep(mosTabs):
+    mosTab = mosTabs[0]
+    listL = np.linspace(mosTab.lf[0], mosTab.lf[-1], 23)
+    sweepRes = ge.optOpMos(mosTab, ge.OPT_VSTAR, 0.2, listL, 0.9, 0.0)
+    for steps in [ge.OPT_STEPS, listL.size]:
+        optChunks = []
+        doneSeq = []
+        for optChunk, doneL in ge.optOpMosIter(mosTab, ge.OPT_VSTAR, 0.2, listL, 0.9, 0.0, steps=steps):
+            optChunks.append(optChunk)
+            doneSeq.append(doneL)
+        assert len(optChunks) <= steps and doneSeq[-1] == listL.size and doneSeq == sorted(doneSeq)
+        iterRes = ge.joinOptOp(optChunks)
+        assert sorted(iterRes) == sorted(ge.OPT_OP_KEYS)
+        for key in ge.OPT_OP_KEYS:
+            np.testing.assert_array_equal(iterRes[key], sweepRes[key])
+    assert all(ge.joinOptOp([])[key].size == 0 for key in ge.OPT_OP_KEYS)
+
+def testOptDesignMatchesBruteForce(mosTabs):
+    mosTab = mosTabs[0]
+    # A few planes keep the brute force small
+    listL = mosTab.lf[1:3]
+    # The quantity fixed by the target is traded against Gm
+    frontCosts = {ge.SIZE_GM : ('Id', 'Area'), ge.SIZE_ID : ('Area', 'Gm'), ge.SIZE_AREA : ('Id', 'Gm')}
+    for sizeMode, target, minGm, minFt, minAv in [(ge.SIZE_GM, 1e-3, None, None, None), (ge.SIZE_GM, 1e-3, None, 1e9, 30.0),
+                                                 (ge.SIZE_ID, 1e-4, 5e-4, None, None), (ge.SIZE_AREA, 2.0, 5e-4, 1e9, None)]:
+        designRes = ge.optDesign(mosTab, sizeMode, target, 0.0, minGm=minGm, minFt=minFt, minAv=minAv, maxVDS=0.6, listL=listL)
+        candDat = designCandidates(mosTab, sizeMode, target, 0.0, 0.6, listL)
+        feasible = candDat['ok']
+        with np.errstate(invalid='ignore'):
+            for varName, minVal in [('Gm', minGm), ('FUG', minFt), ('SELF_GAIN', minAv)]:
+                if minVal is not None:
+                    feasible &= candDat[varName] >= minVal
+        assert designRes['Feasible'] == np.count_nonzero(feasible)
+        cost0, cost1 = frontCosts[sizeMode]
+        costs = np.stack((candDat[cost0][feasible], (1 if cost1 != 'Gm' else -1) * candDat[cost1][feasible]), axis=-1)
+        refFront = nonDominated(costs)
+        assert frontPoints(designRes) == frontPoints(dict((key, candDat[key][feasible]) for key in ['L', 'VDS', 'GmId']), refFront)
+        assert np.all(np.diff(designRes[cost0]) > 0)
+        fixedName = {ge.SIZE_GM : 'Gm', ge.SIZE_ID : 'Id', ge.SIZE_AREA : 'Area'}[sizeMode]
+        np.testing.assert_array_equal(designRes[fixedName], target)
+    with pytest.raises(ValueError):
+        ge.optDesign(mosTab, 3, 1e-3, 0.0)
+
+def testSkylineMatchesBruteForce():
+    rng = np.random.default_rng(5)
+    for objectives in [2, 3, 4]:
+        costs = rng.normal(size=(1500, objectives))
+        # Correlated objectives like power and area leave a thin front
+        costs[:, 0] += costs[:, 1]
+        front = ge.skyline(costs, block=64, group=8)
+        assert sorted(front.tolist()) == nonDominated(costs).tolist()
+
+def testGateLCurvesMatchSearch(mosTabs):
+    listL = np.linspace(mosTabs[0].lf[0], mosTabs[0].lf[-1], 7)
+    listGmId = [5.0, 10.0, 16.0, 40.0]
+    for VDS, VSB in [(0.9, 0.0), (0.83, -0.12)]:
+        gateCurves = ge.gateLCurves(mosTabs, listL, VDS, VSB, listGmId)
+        for mosTab, gateCurve in zip(mosTabs, gateCurves):
+            vgs, state = ge.searchVGS(mosTab, 'GMOVERID', np.array(listGmId)[:, None], listL, VDS, VSB)
+            np.testing.assert_array_equal(gateCurve['state'], state)
+            np.testing.assert_allclose(gateCurve['VGS'], vgs, rtol=0, atol=1e-12)
+            found = (state == 1)
+            gateOp = lp.lookupMany(mosTab, ['SELF_GAIN', 'FUG'], L=listL, VGS=vgs, VDS=VDS, VSB=VSB)
+            np.testing.assert_allclose(gateCurve['Av'][found], gateOp['SELF_GAIN'][found], rtol=1e-12)
+            np.testing.assert_allclose(gateCurve['Ft'][found], gateOp['FUG'][found], rtol=1e-12)
+            assert np.all(np.isnan(gateCurve['Av'][~found]))
+
+def testSplinesMatchScipy():
+    rng = np.random.default_rng(4)
+    x = np.cumsum(rng.uniform(0.1, 1.0, (3, 12)), axis=-1)
+    y = np.stack((np.sin(x), np.cumsum(rng.uniform(0.0, 1.0, x.shape), axis=-1)), axis=-1)
+    # Inside and past both ends
+    xNew = np.linspace(x.min() - 0.5, x.max() + 0.5, 200)
+    for kind, reference in [(ge.SPLINE_CUBIC, CubicSpline), (ge.SPLINE_PCHIP, PchipInterpolator)]:
+        curveSpline = ge.CurveSpline(x, [y[..., 0], y[..., 1]], ['a', 'b'], kind)
+        values = curveSpline(xNew)
+        for row in range(x.shape[0]):
+            for i, name in enumerate(['a', 'b']):
+                np.testing.assert_allclose(values[name][row], reference(x[row], y[row, :, i])(xNew), rtol=1e-10, atol=1e-10)
+        rowValues = curveSpline.row(1)(xNew)
+        np.testing.assert_array_equal(rowValues['a'], values['a'][1])
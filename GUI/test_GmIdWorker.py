@@ -0,0 +1,34 @@
+# Tests of the background jobs of the GUI, run in the calling thread
+# Usage : python -m pytest -q test_GmIdWorker.py
+
+import numpy as np
+import pytest
+# import library for mos sizing and the jobs
+import GmIdEngine as ge
+from GmIdWorker import JobCtl, JobCancelled, WorkerSignals, optOpJob
+
+def testOptOpJobChunks(mosTabs):
+    mosTab = mosTabs[0]
+    listL = np.linspace(mosTab.lf[0], mosTab.lf[-1], 95)
+    signals = WorkerSignals()
+    partialRes = []
+    signals.partial.connect(partialRes.append)
+    jobCtl = JobCtl(signals)
+    optRes = optOpJob(jobCtl, mosTab, ge.OPT_VSTAR, 0.2, listL, 0.9, 0.0)
+    sweepRes = ge.optOpMos(mosTab, ge.OPT_VSTAR, 0.2, listL, 0.9, 0.0)
+    for key in ge.OPT_OP_KEYS:
+        np.testing.assert_array_equal(optRes[key], sweepRes[key])
+    # One partial result per chunk but the last, each a prefix of the sweep
+    assert len(partialRes) == ge.OPT_STEPS - 1
+    for someRes in partialRes:
+        np.testing.assert_array_equal(someRes['L'], sweepRes['L'][:someRes['L'].size])
+
+def testOptOpJobCancel(mosTabs):
+    mosTab = mosTabs[0]
+    signals = WorkerSignals()
+    jobCtl = JobCtl(signals)
+    # Cancelled while the first chunk is solved : stops before sending it
+    signals.partial.connect(lambda someRes: pytest.fail('partial result after cancel'))
+    jobCtl.cancel()
+    with pytest.raises(JobCancelled):
+        optOpJob(jobCtl, mosTab, ge.OPT_VSTAR, 0.2, np.linspace(mosTab.lf[0], mosTab.lf[-1], 95), 0.9, 0.0)
@@ -0,0 +1,229 @@
+# Tests of the lookups of LupMos against scipy and brute force references
+# Usage : python -m pytest -q test_LupMos.py
+
+import os
+import numpy as np
+import pytest
+from scipy.interpolate import interpn
+# import library for mos lookup and sizing
+import LupMos as lp
+import benchGmId as bg
+
+def interpnRef(mosTab, outVar, L, VGS, VDS, VSB):
+    '''The lookup as scipy interpn gives it'''
+    xi = np.stack(np.broadcast_arrays(VSB, VDS, VGS, L), axis=-1)
+    return interpn(mosTab.points, np.asarray(mosTab[outVar]), xi)
+
+def searchRef(mosTab, GmId, L, VDS, VSB):
+    '''The VGS search of the first GUI : scan down from the top VGS one grid point at a time'''
+    vgsGrid = mosTab.vgsf
+    gmId = interpnRef(mosTab, 'GMOVERID', L, vgsGrid, VDS, VSB)
+    if gmId[-1] >= GmId:
+        return vgsGrid[-1], 0
+    for upper in range(vgsGrid.size - 1, 0, -1):
+        if gmId[upper - 1] >= GmId:
+            frac = (GmId - gmId[upper]) / (gmId[upper - 1] - gmId[upper])
+            return vgsGrid[upper] + frac * (vgsGrid[upper - 1] - vgsGrid[upper]), 1
+    return vgsGrid[0], 2
+
+def testLookupVGSStates(mosTabs):
+    mosTab = mosTabs[0]
+    L = np.array([mosTab.lf[0], 0.41, mosTab.lf[-1]])
+    GmId = np.array([0.5, 5.0, 12.0, 20.0, 60.0])[:, None]
+    vgs, state = lp.lookupVGS(mosTab, 'GMOVERID', GmId, falling=True, L=L, VDS=0.9, VSB=-0.05)
+    assert set(np.unique(state)) == {0, 1, 2}
+    for i in range(GmId.shape[0]):
+        for j in range(L.size):
+            refVgs, refState = searchRef(mosTab, GmId[i, 0], L[j], 0.9, -0.05)
+            assert state[i, j] == refState
+            assert vgs[i, j] == pytest.approx(refVgs, abs=1e-12)
+
+def testCacheStamp(tmp_path):
+    matFile = str(tmp_path / 'stamp-nch-tt.mat')
+    bg.writeTable(matFile, nL=3, step=0.1)
+    cacheDir = matFile + lp.CACHE_SUFFIX
+    firstTab = lp.loadTable(matFile)
+    assert isinstance(firstTab.mosDat['ID'], np.memmap)
+    builtTime = os.stat(os.path.join(cacheDir, lp.CACHE_META)).st_mtime_ns
+    # Unchanged mat file : the cache is reused
+    lp.loadTable(matFile)
+    assert os.stat(os.path.join(cacheDir, lp.CACHE_META)).st_mtime_ns == builtTime
+    # New content : the stamp no longer matches and the cache is rebuilt from it
+    bg.writeTable(matFile, nL=4, step=0.1)
+    newTab = lp.loadTable(matFile)
+    assert newTab.lf.size == 4
+    assert lp.readCacheMeta(cacheDir)['size'] == os.path.getsize(matFile)
+    np.testing.assert_array_equal(newTab['ID'], lp.loadTable(matFile, useCache=False)['ID'])
+
+def testLookupCache(mosTabs):
+    lookupCache = lp.LookupCache(maxSize=2)
+    for key in 'abc':
+        lookupCache.put(key, np.zeros(3))
+    lookupCache.get('b')
+    lookupCache.put('d', np.zeros(3))
+    # Least recently used first
+    assert lookupCache.get('a') is None and lookupCache.get('c') is None and lookupCache.get('b') is not None
+    assert lp.memoKey([-0.0, 1.0]) == lp.memoKey([0.0, 1.0])
+    # A repeated lookup is a hit with the same values
+    firstRes = lp.lookupMany(mosTabs[0], ['ID'], L=0.37, VGS=mosTabs[0].vgsf, VDS=0.9, VSB=0.0)
+    againRes = lp.lookupMany(mosTabs[0], ['ID'], L=0.37, VGS=mosTabs[0].vgsf, VDS=0.9, VSB=0.0)
+    assert lp.lookupCache.stats()['hits'] == 1
+    np.testing.assert_array_equal(againRes['ID'], firstRes['ID'])
+    with pytest.raises(ValueError):
+        againRes['ID'][0] = 1.0
+
+def testBiasSliceMatchesInterpn(mosTabs):
+    mosTab = mosTabs[0]
+    VGS = np.linspace(0.2, 1.5, 27)
+    biasSlice = mosTab.biasSlice(['ID', 'SELF_GAIN'], 0.37, VGS)
+    for VDS, VSB in [(0.73, -0.11), (mosTab.vdsf[8], 0.0)]:
+        sliceRes = biasSlice.lookup(VDS, VSB)
+        for outVar in ['ID', 'SELF_GAIN']:
+            np.testing.assert_allclose(sliceRes[outVar], interpnRef(mosTab, outVar, 0.37, VGS, VDS, VSB), rtol=1e-12)
+
+def testGmIdTableMatchesLookupVGS(matFiles, mosTabs):
+    mosTab = mosTabs[0]
+    gmIdTab = lp.loadGmIdTable(matFiles[0], mosTab)
+    # On the grid points of the GmIdTable only the VGS search interpolates
+    vsbInd, vdsInd, lInd = 1, 18, 2
+    GmId = gmIdTab.vgsf
+    vgs, state = lp.lookupVGS(mosTab, 'GMOVERID', GmId, falling=True, L=mosTab.lf[lInd], VDS=mosTab.vdsf[vdsInd], VSB=-mosTab.vsbf[vsbInd])
+    gmIdVgs = np.asarray(gmIdTab['VGS'])[vsbInd, vdsInd, :, lInd]
+    found = (state == 1)
+    assert np.count_nonzero(found) > 10
+    np.testing.assert_allclose(gmIdVgs[found], vgs[found], rtol=0, atol=1e-12)
+    gmIdId = np.asarray(gmIdTab['ID'])[vsbInd, vdsInd, :, lInd]
+    np.testing.assert_allclose(gmIdId[found], interpnRef(mosTab, 'ID', mosTab.lf[lInd], vgs[found], mosTab.vdsf[vdsInd], -mosTab.vsbf[vsbInd]), rtol=1e-9)
+
+def testGmIdTableStamp(matFiles, mosTabs):
+    # The step is part of the stamp, another step builds another table
+    gmIdTab = lp.loadGmIdTable(matFiles[0], mosTabs[0], step=0.2)
+    assert gmIdTab.vgsf[1] - gmIdTab.vgsf[0] == pytest.approx(0.2)
+    assert lp.readCacheMeta(matFiles[0] + lp.GMID_SUFFIX)['step'] == 0.2
+    gmIdTab = lp.loadGmIdTable(matFiles[0], mosTabs[0])
+    assert gmIdTab.vgsf[1] - gmIdTab.vgsf[0] == pytest.approx(lp.GMID_STEP)
+
+def testCornerTableMatchesTables(mosTabs, tmp_path):
+    cornerTab = lp.CornerTable(mosTabs)
+    L, VGS, VDS, VSB = bg.randomBias(mosTabs[0], np.random.default_rng(3), (40, 1))
+    for args in [(L, VGS, VDS, VSB), (mosTabs[0].lf[:, None], mosTabs[0].vgsf, mosTabs[0].vdsf[4], 0.0)]:
+        cornerRes = cornerTab.lookupMany(['ID', 'FUG'], *args)
+        for i, mosTab in enumerate(mosTabs):
+            tabRes = mosTab.lookupMany(['ID', 'FUG'], *args)
+            for outVar in ['ID', 'FUG']:
+                np.testing.assert_array_equal(cornerRes[outVar][i], tabRes[outVar])
+    otherTab = lp.loadTable(bg.writeTable(str(tmp_path / 'other-nch-tt.mat'), nL=3))
+    with pytest.raises(ValueError):
+        lp.CornerTable([mosTabs[0], otherTab])
+
+def testLookupMatchesInterpn(mosTabs):
+    mosTab = mosTabs[0]
+    assert all(invStep is not None for invStep in mosTab.invSteps)
+    L, VGS, VDS, VSB = bg.randomBias(mosTab, np.random.default_rng(1), 500)
+    # Off the grid, including the upper end of every axis
+    for args in [(L, VGS, VDS, VSB), (L[:20, None], VGS[:30], VDS[0], VSB[0]),
+                 (mosTab.lf[-1], mosTab.vgsf[-1], mosTab.vdsf[-1], -mosTab.vsbf[0])]:
+        result = mosTab.lookupMany(['ID', 'GMOVERID'], *args)
+        for outVar in ['ID', 'GMOVERID']:
+            np.testing.assert_allclose(result[outVar], interpnRef(mosTab, outVar, *args), rtol=1e-12, atol=0)
+    with pytest.raises(ValueError):
+        mosTab.lookupMany(['ID'], mosTab.lf[-1] + 0.01, 0.5, 0.5, 0.0)
+
+def testLookupNonUniformL(mosTabs):
+    keepL = [0, 1, 3, 5]
+    tabDat = dict((varName, np.asarray(mosTabs[0][varName])) for varName in mosTabs[0].keys())
+    for varName, varDat in tabDat.items():
+        if varDat.ndim == 4:
+            tabDat[varName] = varDat[..., keepL]
+    tabDat['L'] = tabDat['L'][:, keepL]
+    mosTab = lp.MosTable(tabDat)
+    assert mosTab.invSteps[3] is None
+    L, VGS, VDS, VSB = bg.randomBias(mosTab, np.random.default_rng(2), 300)
+    np.testing.assert_allclose(mosTab.lookupMany(['ID'], L, VGS, VDS, VSB)['ID'], interpnRef(mosTab, 'ID', L, VGS, VDS, VSB), rtol=1e-12)
+
+def testLookupNanGivesNan(mosTabs):
+    mosTab = mosTabs[0]
+    VGS = np.array([0.4, np.nan, mosTab.vgsf[7]])
+    # Off the grid and on it, on a uniform and a searched axis
+    nonUniform = lp.MosTable(dict((varName, np.asarray(mosTab[varName])) for varName in mosTab.keys()))
+    nonUniform.invSteps = [None] * 4
+    for nanTab in [mosTab, nonUniform]:
+        for args in [(0.37, VGS, 0.55, -0.1), (mosTab.lf[2], VGS, mosTab.vdsf[10], -mosTab.vsbf[1]), (np.nan, 0.5, 0.5, 0.0)]:
+            result = nanTab.lookupMany(['ID'], *args)['ID']
+            argArrays = np.broadcast_arrays(*args)
+            refNan = np.isnan(argArrays[0]) | np.isnan(argArrays[1])
+            assert np.array_equal(np.isnan(result), refNan)
+            np.testing.assert_allclose(result[~refNan], interpnRef(mosTab, 'ID', *[argArray[~refNan] for argArray in argArrays]), rtol=1e-12)
+    biasSlice = mosTab.biasSlice(['ID'], 0.37, VGS)
+    assert np.array_equal(np.isnan(biasSlice.lookup(0.55, -0.1)['ID']), [False, True, False])
+    assert np.all(np.isnan(biasSlice.lookup(np.nan, -0.1)['ID']))
+    with pytest.raises(ValueError):
+        mosTab.lookupMany(['ID'], 0.37, np.array([np.nan, np.inf]), 0.5, 0.0)
+
+def testGridLookupReturnsSamples(mosTabs):
+    mosTab = mosTabs[0]
+    L, VGS, VDS, VSB = bg.randomBias(mosTab, np.random.default_rng(4), 20)
+    # One axis stepping over the grid is read as a view, the other grid queries are gathered
+    for args in [(mosTab.lf[2], mosTab.vgsf, mosTab.vdsf[10], -mosTab.vsbf[1]),
+                 (mosTab.lf[2], mosTab.vgsf[[3, 1, 7]], mosTab.vdsf[10], -mosTab.vsbf[1]),
+                 (mosTab.lf[:, None], mosTab.vgsf, mosTab.vdsf[18], -mosTab.vsbf[3]),
+                 (L[:, None], mosTab.vgsf[::3], mosTab.vdsf[5], 0.0)]:
+        result = mosTab.lookupMany(['ID', 'GMOVERID'], *args)
+        for outVar in ['ID', 'GMOVERID']:
+            np.testing.assert_allclose(result[outVar], interpnRef(mosTab, outVar, *args), rtol=1e-12, atol=0)
+    viewRes = mosTab.lookupMany(['ID'], mosTab.lf[2], mosTab.vgsf, mosTab.vdsf[10], -mosTab.vsbf[1])['ID']
+    np.testing.assert_array_equal(viewRes, mosTab['ID'][1, 10, :, 2])
+    assert not viewRes.flags.writeable
+    # A sample next to the NaN region of the GmIdTable is returned as stored
+    gmIdTab = mosTab.gmIdTab
+    gmIdVgs = np.asarray(gmIdTab['VGS'])[0, 18, :, 2]
+    edge = np.nonzero(np.isfinite(gmIdVgs[:-1]) & np.isnan(gmIdVgs[1:]))[0]
+    assert edge.size > 0
+    gmIdRes = gmIdTab.lookupGmId(['VGS'], mosTab.lf[2], gmIdTab.vgsf[edge], mosTab.vdsf[18], -gmIdTab.vsbf[0])
+    np.testing.assert_array_equal(gmIdRes['VGS'], gmIdVgs[edge])
+
+def testLookupCacheBytes(mosTabs):
+    lookupCache = lp.LookupCache(maxSize=10, maxBytes=2000)
+    lookupCache.put('a', np.zeros(150))
+    lookupCache.put('b', np.zeros(150))
+    # 'a' is evicted by bytes, not by count
+    assert lookupCache.get('a') is None and lookupCache.get('b') is not None
+    assert lookupCache.stats()['bytes'] <= 2000
+    # Larger than the whole cache : not kept
+    lookupCache.put('c', np.zeros(1000))
+    assert lookupCache.get('c') is None
+    # Large inputs are keyed by a digest of their rounded values
+    bigKey = lp.memoKey(np.arange(1000.0))
+    assert len(bigKey[1]) == 16 and bigKey == lp.memoKey(np.arange(1000.0) + 1e-12)
+    assert bigKey != lp.memoKey(np.arange(1000.0) + 1e-6)
+    # Batches above MEMO_POINTS are not cached
+    L, VGS, VDS, VSB = bg.randomBias(mosTabs[0], np.random.default_rng(6), lp.MEMO_POINTS + 1)
+    mosTabs[0].lookupMany(['ID'], L, VGS, VDS, VSB)
+    assert lp.lookupCache.stats()['size'] == 0
+
+def testCornerTablePaths(mosTabs):
+    cornerTab = lp.CornerTable(mosTabs)
+    # Variables by name and their stack have the corners in front, the grid is shared
+    np.testing.assert_array_equal(cornerTab['ID'][1], mosTabs[1]['ID'])
+    np.testing.assert_array_equal(cornerTab['L'], mosTabs[0]['L'])
+    np.testing.assert_array_equal(cornerTab.stack(['ID', 'GM'])[1, 0], mosTabs[0]['GM'])
+    # Batches above GATHER_POINTS are summed vertex by vertex
+    L, VGS, VDS, VSB = bg.randomBias(mosTabs[0], np.random.default_rng(7), lp.GATHER_POINTS // 4)
+    cornerRes = cornerTab.lookupMany(['ID'], L, VGS, VDS, VSB)
+    # VGS search of every corner at once
+    GmId = np.array([2.0, 8.0, 15.0, 40.0])[:, None]
+    listL = mosTabs[0].lf[1:4]
+    cornerVgs, cornerState = lp.lookupVGS(cornerTab, 'GMOVERID', GmId, falling=True, L=listL, VDS=0.85, VSB=-0.1)
+    # Bias slices on and off the bias grid
+    sliceVGS = np.linspace(0.2, 1.5, 27)
+    cornerSlice = cornerTab.biasSlice(['ID', 'FUG'], 0.37, sliceVGS)
+    for i, mosTab in enumerate(mosTabs):
+        np.testing.assert_array_equal(cornerRes['ID'][i], mosTab.lookupMany(['ID'], L, VGS, VDS, VSB)['ID'])
+        vgs, state = lp.lookupVGS(mosTab, 'GMOVERID', GmId, falling=True, L=listL, VDS=0.85, VSB=-0.1)
+        np.testing.assert_array_equal(cornerState[i], state)
+        np.testing.assert_array_equal(cornerVgs[i], vgs)
+        for biasVDS, biasVSB in [(0.73, -0.11), (mosTab.vdsf[8], 0.0)]:
+            sliceRes = cornerSlice.lookup(biasVDS, biasVSB)
+            tabRes = mosTab.biasSlice(['ID', 'FUG'], 0.37, sliceVGS).lookup(biasVDS, biasVSB)
+            for outVar in ['ID', 'FUG']:
+                np.testing.assert_array_equal(sliceRes[outVar][i], tabRes[outVar])
@@ -0,0 +1,140 @@
+# Tests of the dataset of mat files on synthetic tables of benchGmId at several temperatures
+# Usage : python -m pytest -q test_MosDataset.py
+
+import numpy as np
+import pytest
+# import library for mos lookup and the dataset
+import LupMos as lp
+import MosDataset as md
+import benchGmId as bg
+from conftest import TEST_NL, TEST_STEP
+
+# (corner, dVth, temp in K), ss has no table at the last temperature
+DATASET_TABLES = [('tt', 0.0, 300.0), ('ss', 0.03, 300.0), ('tt', 0.0, 350.0), ('ss', 0.03, 350.0), ('tt', 0.0, 400.0)]
+
+@pytest.fixture(scope='module')
+def dataSet(tmp_path_factory):
+    tableDir = tmp_path_factory.mktemp('dataset')
+    for corner, dVth, temp in DATASET_TABLES:
+        bg.writeTable(str(tableDir / ('test-nch-%s-%d.mat' % (corner, temp))), nL=TEST_NL, step=TEST_STEP, temp=temp, corner=corner, dVth=dVth)
+    return md.MosDataset(str(tableDir))
+
+def cornerLookup(dataSet, temp, L, VGS, VDS, VSB):
+    '''Lookup of the tt and ss tables of the temperature in C'''
+    cornerTab = lp.CornerTable([lp.loadTable(dataSet.find('test', 'nch', corner, temp)) for corner in ['tt', 'ss']])
+    return cornerTab.lookupMany(['ID', 'GM'], L=L, VGS=VGS, VDS=VDS, VSB=VSB)
+
+def testDatasetKeys(dataSet):
+    assert dataSet.corners('test', 'nch') == ['ss', 'tt']
+    assert dataSet.corners('test', 'nch', 127.0) == ['tt']
+    assert dataSet.temps('test', 'nch') == [27.0, 77.0, 127.0]
+    assert dataSet.temps('test', 'nch', 'ss') == [27.0, 77.0]
+
+def testDatasetViewTemps(dataSet):
+    dataView = dataSet.view('test', 'nch', ['tt', 'ss'], [27.0, 77.0])
+    L, VGS, VDS, VSB = 0.3, np.linspace(0.3, 1.2, 7), 0.8, -0.1
+    lowRes = cornerLookup(dataSet, 27.0, L, VGS, VDS, VSB)
+    highRes = cornerLookup(dataSet, 77.0, L, VGS, VDS, VSB)
+    # On a table
+    for temp, tableRes in [(27.0, lowRes), (77.0, highRes)]:
+        viewRes = dataView.lookupMany(['ID', 'GM'], L, VGS, VDS, VSB, temp=temp)
+        for outVar in ['ID', 'GM']:
+            assert viewRes[outVar].shape == (2, VGS.size)
+            np.testing.assert_array_equal(viewRes[outVar], tableRes[outVar])
+    # Between the tables
+    viewRes = dataView.lookupMany(['ID', 'GM'], L, VGS, VDS, VSB, temp=42.0)
+    for outVar in ['ID', 'GM']:
+        np.testing.assert_allclose(viewRes[outVar], lowRes[outVar] + 0.3 * (highRes[outVar] - lowRes[outVar]), rtol=1e-12)
+        assert not np.allclose(viewRes[outVar], lowRes[outVar])
+    # Out of the tables, or no temperature with several of them
+    for temp in [26.9, 77.1, None]:
+        with pytest.raises(ValueError):
+            dataView.lookupMany(['ID'], L, VGS, VDS, VSB, temp=temp)
+
+def testDatasetViewMissing(dataSet):
+    # ss has no table at 127 C
+    with pytest.raises(ValueError, match='ss'):
+        dataSet.view('test', 'nch')
+    with pytest.raises(ValueError):
+        dataSet.view('test', 'nch', ['tt', 'ff'], [27.0])
+    # A single temperature is used without naming it
+    dataView = dataSet.view('test', 'nch', ['tt'], [127.0])
+    viewRes = dataView.lookupMany(['ID'], 0.3, 0.9, 0.8, 0.0)
+    refRes = lp.lookupMany(lp.loadTable(dataSet.find('test', 'nch', 'tt', 127.0)), ['ID'], L=0.3, VGS=0.9, VDS=0.8, VSB=0.0)
+    np.testing.assert_array_equal(viewRes['ID'], np.asarray(refRes['ID'])[None])
+
+@pytest.fixture
+def indexDir(tmp_path):
+    '''Two tables of their own, the index tests change them'''
+    for corner, dVth in [('tt', 0.0), ('ss', 0.03)]:
+        bg.writeTable(str(tmp_path / ('test-nch-%s.mat' % corner)), nL=TEST_NL, step=TEST_STEP, corner=corner, dVth=dVth)
+    return tmp_path
+
+def countReads(monkeypatch):
+    '''Names of the mat files opened by readInfo'''
+    readNames = []
+    readInfo = md.readInfo
+    def countedRead(matFilePath):
+        readNames.append(md.os.path.basename(matFilePath))
+        return readInfo(matFilePath)
+    monkeypatch.setattr(md, 'readInfo', countedRead)
+    return readNames
+
+def testScanKeepsUnchanged(indexDir, monkeypatch):
+    readNames = countReads(monkeypatch)
+    firstSet = md.MosDataset(str(indexDir))
+    assert sorted(readNames) == ['test-nch-ss.mat', 'test-nch-tt.mat']
+    indexPath = str(indexDir / md.INDEX_FILE)
+    assert md.readIndex(indexPath) == firstSet.fileInfo
+    indexStamp = lp.matStamp(indexPath)
+    del readNames[:]
+    nextSet = md.MosDataset(str(indexDir))
+    assert readNames == [] and nextSet.files == firstSet.files
+    # Nothing changed, the index is not written again
+    assert lp.matStamp(indexPath) == indexStamp
+
+def testScanRefreshesChanged(indexDir, monkeypatch):
+    readNames = countReads(monkeypatch)
+    md.MosDataset(str(indexDir))
+    ttPath = str(indexDir / 'test-nch-tt.mat')
+    # Touched
+    del readNames[:]
+    ttStat = md.os.stat(ttPath)
+    md.os.utime(ttPath, ns=(ttStat.st_atime_ns, ttStat.st_mtime_ns + 10 ** 9))
+    dataSet = md.MosDataset(str(indexDir))
+    assert readNames == ['test-nch-tt.mat']
+    assert dataSet.fileInfo['test-nch-tt.mat']['mtime'] == ttStat.st_mtime_ns + 10 ** 9
+    assert md.readIndex(str(indexDir / md.INDEX_FILE)) == dataSet.fileInfo
+    # Rewritten with another corner and temperature
+    del readNames[:]
+    bg.writeTable(ttPath, nL=TEST_NL, step=TEST_STEP, temp=350.0, corner='ff')
+    dataSet = md.MosDataset(str(indexDir))
+    assert readNames == ['test-nch-tt.mat']
+    assert dataSet.find('test', 'nch', 'ff', 77.0) == ttPath and dataSet.find('test', 'nch', 'tt', 27.0) is None
+    assert md.readIndex(str(indexDir / md.INDEX_FILE))['test-nch-tt.mat']['corner'] == 'ff'
+
+def testScanDropsDeleted(indexDir, monkeypatch):
+    md.MosDataset(str(indexDir))
+    md.os.remove(str(indexDir / 'test-nch-ss.mat'))
+    readNames = countReads(monkeypatch)
+    dataSet = md.MosDataset(str(indexDir))
+    assert readNames == [] and dataSet.corners('test', 'nch') == ['tt']
+    assert sorted(md.readIndex(str(indexDir / md.INDEX_FILE))) == ['test-nch-tt.mat']
+
+def testScanReadOnly(indexDir, monkeypatch, capsys):
+    # The write of a read-only directory fails at the replace, even for root
+    def deniedReplace(srcPath, dstPath):
+        raise PermissionError(13, 'Permission denied', dstPath)
+    monkeypatch.setattr(md.os, 'replace', deniedReplace)
+    dataSet = md.MosDataset(str(indexDir))
+    assert dataSet.corners('test', 'nch') == ['ss', 'tt']
+    assert 'Index not saved' in capsys.readouterr().err
+    assert sorted(md.os.listdir(str(indexDir))) == ['test-nch-ss.mat', 'test-nch-tt.mat']
+
+def testReadIndexOtherVersion(indexDir):
+    indexPath = str(indexDir / md.INDEX_FILE)
+    assert md.readIndex(indexPath) == {}
+    for indexText in ['{"version" : 0, "files" : {"a.mat" : {}}}', '[1, 2]', '{"version"']:
+        with open(indexPath, 'w') as indexFile:
+            indexFile.write(indexText)
+        assert md.readIndex(indexPath) == {}
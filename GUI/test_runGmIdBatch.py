@@ -0,0 +1,54 @@
+# Tests of the batch sizing CLI against ge.synMos
+# Usage : python -m pytest -q test_runGmIdBatch.py
+
+import csv
+import json
+import numpy as np
+# import library for mos sizing
+import GmIdEngine as ge
+import runGmIdBatch as rb
+
+def specRows(matFiles):
+    '''Rows over both corners with Gm and Id targets'''
+    return [
+        {'file' : matFiles[0], 'L' : 0.34, 'gmid' : 12.0, 'gm' : 1e-3, 'vds' : 0.9, 'vsb' : 0.1},
+        {'file' : matFiles[1], 'L' : 0.5, 'vstar' : 0.25, 'id' : 2e-5, 'vds' : 0.6, 'vsb' : 0.0, 'mult' : 2, 'fin' : 2},
+        {'file' : matFiles[0], 'L' : 0.2, 'gmid' : 8.0, 'gm' : 5e-4, 'vds' : 0.5, 'vsb' : 0.0, 'fin' : 4}]
+
+def checkSized(sizedRows, specRows):
+    '''Every row as ge.synMos sizes it on the table without GmIdTable'''
+    mosTabs = dict((matFile, ge.loadTable(matFile)) for matFile in set(specRow['file'] for specRow in specRows))
+    for sizedRow, specRow in zip(sizedRows, specRows):
+        assert sizedRow['Error'] == ''
+        mosTab = mosTabs[specRow['file']]
+        gmId = specRow['gmid'] if 'gmid' in specRow else 2.0 / specRow['vstar']
+        synRes = ge.synMos(mosTab, specRow['L'], specRow['vds'], -specRow['vsb'], gmId, Gm=specRow.get('gm'), Id=specRow.get('id'),
+                           multi=specRow.get('mult', 1), fin=specRow.get('fin', 1))
+        for col in rb.OUT_COLS:
+            assert float(sizedRow[col]) == float(synRes[col])
+
+def testBatchCsv(matFiles, tmp_path):
+    rows = specRows(matFiles)
+    colNames = ['file', 'L', 'gmid', 'vstar', 'gm', 'id', 'vds', 'vsb', 'mult', 'fin']
+    with open(str(tmp_path / 'spec.csv'), 'w', newline='') as specFile:
+        writer = csv.DictWriter(specFile, fieldnames=colNames)
+        writer.writeheader()
+        writer.writerows(rows)
+    assert rb.main([str(tmp_path / 'spec.csv'), '-o', str(tmp_path / 'sized.csv'), '-j', '1']) == 0
+    with open(str(tmp_path / 'sized.csv'), 'r') as sizedFile:
+        sizedRows = list(csv.DictReader(sizedFile))
+    checkSized(sizedRows, rows)
+
+def testBatchJsonParallel(matFiles, tmp_path):
+    rows = specRows(matFiles) * 3
+    # A row without a file is reported in its Error column, the others are still sized
+    badRow = dict(rows[0])
+    del badRow['file']
+    with open(str(tmp_path / 'spec.json'), 'w') as specFile:
+        json.dump(rows[:4] + [badRow] + rows[4:], specFile)
+    assert rb.main([str(tmp_path / 'spec.json'), '-o', str(tmp_path / 'sized.json'), '-j', '2']) == 1
+    with open(str(tmp_path / 'sized.json'), 'r') as sizedFile:
+        sizedRows = json.load(sizedFile)
+    assert len(sizedRows) == len(rows) + 1
+    assert sizedRows[4]['Error'].startswith('KeyError') and sizedRows[4]['W'] == ''
+    checkSized(sizedRows[:4] + sizedRows[5:], rows)
@@ -0,0 +1,17 @@
+# Tests of the helpers of the sizing GUI, no window is opened
+# Usage : python -m pytest -q test_runGmIdSizing.py
+
+import const
+from runGmIdSizing import cornerSlots
+
+def testCornerSlotsUsual():
+    assert cornerSlots(['ss', 'tt'], 'tt') == ['tt', '--', 'ss', '--', '--']
+    assert cornerSlots(list(const.CORNERS), 'sf') == const.CORNERS
+    # The case of the file is kept
+    assert cornerSlots(['FF', 'TT'], 'FF') == ['TT', 'FF', '--', '--', '--']
+
+def testCornerSlotsOther():
+    assert cornerSlots(['NOM', 'SS', 'tt'], 'NOM') == ['tt', 'NOM', 'SS', '--', '--']
+    # The selected corner always has a slot, the last others are dropped
+    slotNames = cornerSlots(['a', 'b', 'c', 'd', 'e', 'f', 'tt'], 'f')
+    assert slotNames == ['tt', 'f', 'a', 'b', 'c']